@@ -0,0 +1,175 @@
+"""Token-bucket rate limiting and concurrency-based load shedding."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed before it reaches the service."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(f"request rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class AdmissionDecision:
+    allowed: bool
+    reason: str = ""
+    retry_after: float = 0.0
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class BucketTable:
+    """Per-key token buckets kept in an LRU table of at most ``max_keys`` entries.
+
+    Evicting the least recently seen key simply forgets its bucket, which
+    refills it; keys under attack stay hot and therefore stay limited.
+    """
+
+    def __init__(self, *, rate: float, burst: float, max_keys: int = 100_000) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: str, now: float) -> float:
+        """Consume one token; return 0 on success or the seconds until one is available."""
+        wait = self.wait(key, now)
+        if not wait:
+            self._buckets[key].tokens -= 1
+        return wait
+
+    def wait(self, key: str, now: float) -> float:
+        """Seconds until ``key`` has a token, 0 if it has one now; nothing is consumed."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.burst, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        if bucket.tokens >= 1:
+            return 0.0
+        return (1 - bucket.tokens) / self.rate
+
+
+class ConcurrencyLimiter:
+    """Non-blocking cap on in-flight calls; excess calls are shed, not queued."""
+
+    def __init__(self, max_in_flight: int) -> None:
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be greater than zero")
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class AdmissionController:
+    """Gatekeeper for the registration path.
+
+    Checks, in order of cost, the participant bucket, the event bucket and a
+    global concurrency slot, so abusive clients are turned away before any
+    service validation or locking happens. Tokens are only spent once every
+    check has passed, so a rejected attempt costs the caller nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        participant_rate: float = 1.0,
+        participant_burst: float = 5,
+        event_rate: float = 200.0,
+        event_burst: float = 400,
+        max_in_flight: int = 64,
+        max_tracked_keys: int = 100_000,
+        shed_retry_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.participants = BucketTable(rate=participant_rate, burst=participant_burst, max_keys=max_tracked_keys)
+        self.events = BucketTable(rate=event_rate, burst=event_burst, max_keys=max_tracked_keys)
+        self.concurrency = ConcurrencyLimiter(max_in_flight)
+        self.shed_retry_after = shed_retry_after
+        self.clock = clock
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"participant_rate": 0, "event_rate": 0, "overloaded": 0}
+        self._lock = threading.Lock()
+
+    def check(self, *, participant_id: str, event_id: str) -> AdmissionDecision:
+        """Rate-limit one attempt; on success the caller must ``concurrency.release()``."""
+        with self._lock:
+            now = self.clock()
+            wait = self.participants.wait(participant_id, now)
+            if wait:
+                return self._reject("participant_rate", wait)
+            wait = self.events.wait(event_id, now)
+            if wait:
+                return self._reject("event_rate", wait)
+            if not self.concurrency.try_acquire():
+                return self._reject("overloaded", self.shed_retry_after)
+            self.participants.take(participant_id, now)
+            self.events.take(event_id, now)
+            self.admitted += 1
+        return AdmissionDecision(allowed=True)
+
+    @contextmanager
+    def admit(self, *, participant_id: str, event_id: str) -> Iterator[None]:
+        decision = self.check(participant_id=participant_id, event_id=event_id)
+        if not decision.allowed:
+            raise AdmissionRejected(decision.reason, decision.retry_after)
+        try:
+            yield
+        finally:
+            self.concurrency.release()
+
+    def call(self, func: Callable[..., T], *, participant_id: str, event_id: str) -> T:
+        with self.admit(participant_id=participant_id, event_id=event_id):
+            return func(event_id=event_id, participant_id=participant_id)
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionDecision:
+        self.rejected[reason] += 1
+        return AdmissionDecision(allowed=False, reason=reason, retry_after=retry_after)
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionDecision",
+    "AdmissionRejected",
+    "BucketTable",
+    "ConcurrencyLimiter",
+]
@@ -0,0 +1,370 @@
+"""Community-activity rollups with HyperLogLog distinct-participant counts."""
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from hashlib import blake2b
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .models import Feedback, MatchRecord, Registration
+from .service import ConnectHubService
+
+UTC = timezone.utc
+DEFAULT_PRECISION = 12
+# a packed sparse entry is four bytes, so it stops paying off at a quarter of the registers
+SPARSE_RATIO = 4
+_RANK_BITS = 6
+_RANK_MASK = (1 << _RANK_BITS) - 1
+ALL = "all"
+
+
+def _hash64(value: str) -> int:
+    # stable across processes, unlike hash(), so sketches from shards can be merged
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _register_for(hashed: int, precision: int) -> Tuple[int, int]:
+    # the top bits pick the register, the rest give the rank of the first set bit
+    bits = 64 - precision
+    return hashed >> bits, bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+
+
+@lru_cache(maxsize=None)
+def _lane_mask(size: int) -> int:
+    return int.from_bytes(b"\x80" * size, "big")
+
+
+def _register_max(left: bytearray, right: bytearray) -> bytearray:
+    """Byte-wise max of two register arrays using whole-array integer arithmetic.
+
+    Ranks are below 128, so ``(a | 0x80) - b`` never borrows across bytes and
+    its high bit says whether ``a >= b`` in that byte.
+    """
+    high = _lane_mask(len(left))
+    a = int.from_bytes(left, "big")
+    b = int.from_bytes(right, "big")
+    keep = (((a | high) - b) & high) >> 7
+    keep *= 0xFF
+    return bytearray(((a & keep) | (b & ~keep)).to_bytes(len(left), "big"))
+
+
+class HyperLogLog:
+    """Distinct-count sketch with ``2 ** precision`` registers (~1.04 / sqrt(m) error).
+
+    Registers start as a sorted ``array`` of packed ``index << 6 | rank``
+    entries, four bytes per touched register, and switch to a dense
+    ``bytearray`` once that would be the larger of the two, so the many small
+    per-event, per-day cells cost a few dozen bytes.
+    """
+
+    __slots__ = ("precision", "_sparse", "_dense")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._sparse: Optional[array] = array("I")
+        self._dense: Optional[bytearray] = None
+
+    def add(self, value: str) -> None:
+        self.add_hash(_hash64(value))
+
+    def add_hash(self, hashed: int) -> None:
+        self.add_register(*_register_for(hashed, self.precision))
+
+    def add_register(self, index: int, rank: int) -> None:
+        """Raise one register to ``rank``; lets callers hash once for many sketches."""
+        dense = self._dense
+        if dense is not None:
+            if rank > dense[index]:
+                dense[index] = rank
+            return
+        sparse = self._sparse
+        entry = index << _RANK_BITS
+        slot = bisect_left(sparse, entry)  # type: ignore[arg-type]
+        if slot < len(sparse) and sparse[slot] >> _RANK_BITS == index:  # type: ignore[arg-type,index]
+            if rank > sparse[slot] & _RANK_MASK:  # type: ignore[index]
+                sparse[slot] = entry | rank  # type: ignore[index]
+            return
+        sparse.insert(slot, entry | rank)  # type: ignore[union-attr]
+        if len(sparse) > (1 << self.precision) // SPARSE_RATIO:  # type: ignore[arg-type]
+            self._densify()
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        if other._dense is None:
+            dense = self._dense
+            if dense is None:
+                for entry in other._sparse:  # type: ignore[union-attr]
+                    self.add_register(entry >> _RANK_BITS, entry & _RANK_MASK)
+                return
+            for entry in other._sparse:  # type: ignore[union-attr]
+                index, rank = entry >> _RANK_BITS, entry & _RANK_MASK
+                if rank > dense[index]:
+                    dense[index] = rank
+            return
+        if self._dense is None:
+            self._densify()
+        self._dense = _register_max(self._dense, other._dense)  # type: ignore[arg-type]
+
+    def count(self) -> int:
+        size = 1 << self.precision
+        if self._dense is None:
+            ranks = [entry & _RANK_MASK for entry in self._sparse]  # type: ignore[union-attr]
+            zeros = size - len(ranks)
+        else:
+            ranks = [rank for rank in self._dense if rank]
+            zeros = size - len(ranks)
+        harmonic = zeros + sum(2.0 ** -rank for rank in ranks)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / harmonic
+        if estimate <= 2.5 * size and zeros:
+            # linear counting is far more accurate while many registers are empty
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def copy(self) -> "HyperLogLog":
+        clone = HyperLogLog(self.precision)
+        clone._sparse = None if self._sparse is None else array("I", self._sparse)
+        clone._dense = None if self._dense is None else bytearray(self._dense)
+        return clone
+
+    def _densify(self) -> None:
+        dense = bytearray(1 << self.precision)
+        for entry in self._sparse:  # type: ignore[union-attr]
+            dense[entry >> _RANK_BITS] = entry & _RANK_MASK
+        self._dense = dense
+        self._sparse = None
+
+
+@dataclass(slots=True)
+class _Cell:
+    registrations: int = 0
+    cancellations: int = 0
+    feedback: int = 0
+    score_sum: int = 0
+    matches_created: int = 0
+    matches_approved: int = 0
+    participants: Optional[HyperLogLog] = None
+    exact: Optional[Set[str]] = None
+
+
+@dataclass(slots=True)
+class ActivityReport:
+    """Activity in ``[start, end)`` for one scope ("all", "category:<name>" or "event:<id>")."""
+
+    scope: str
+    start: date
+    end: date
+    registrations: int = 0
+    cancellations: int = 0
+    unique_participants: int = 0
+    feedback: int = 0
+    average_score: Optional[float] = None
+    matches_created: int = 0
+    matches_approved: int = 0
+    exact: bool = False
+    buckets: int = field(default=0, repr=False)
+
+
+class ActivityAnalytics:
+    """Day and month rollups per scope, fed by the service change stream.
+
+    A report for any range of whole days merges at most a handful of month
+    cells plus the leftover day cells, so its cost does not depend on how
+    many registrations happened. Counts are of activity: a participant who
+    registers, cancels and registers again counts as two registrations, and
+    distinct participants are everyone active in the window. With
+    ``exact=True`` every cell also keeps the participant ids themselves, for
+    audits; memory then grows with the data.
+    """
+
+    def __init__(self, service: ConnectHubService, *, precision: int = DEFAULT_PRECISION, exact: bool = False) -> None:
+        self.service = service
+        self.precision = precision
+        self.exact = exact
+        # (scope, "d" | "m", ordinal) -> cell; month ordinals are year * 12 + month - 1
+        self._cells: Dict[Tuple[str, str, int], _Cell] = {}
+        self._lock = threading.Lock()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    @classmethod
+    def attach(cls, service: ConnectHubService, **options: object) -> "ActivityAnalytics":
+        """Subscribe to ``service`` and fold in the registrations and feedback it already holds."""
+        analytics = cls(service, **options)  # type: ignore[arg-type]
+        with service._write_lock:
+            analytics._unsubscribe = service.subscribe(analytics.on_change)
+            for chunk in service._registrations.iter_chunks(10_000):
+                for record in chunk:
+                    analytics._registered(record, record.registered_at)
+                    if record.cancelled_at is not None:
+                        analytics._cancelled(record)
+            for feedback in service._feedback.values():
+                analytics._feedback(feedback)
+            for match in service._matches.values():
+                analytics._match_created(match)
+                if match.approved_at is not None:
+                    analytics._match_approved(match)
+        return analytics
+
+    def detach(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    # ------------------------------------------------------------------
+    # Change feed
+    # ------------------------------------------------------------------
+    def on_change(self, operation: str, record: object) -> None:
+        if operation == "registration.created":
+            self._registered(record, record.registered_at)  # type: ignore[attr-defined]
+        elif operation == "registration.updated":
+            if record.status == "cancelled":  # type: ignore[attr-defined]
+                self._cancelled(record)  # type: ignore[arg-type]
+            else:
+                self._registered(record, record.registered_at)  # type: ignore[attr-defined]
+        elif operation == "feedback.created":
+            self._feedback(record)  # type: ignore[arg-type]
+        elif operation == "match.created":
+            self._match_created(record)  # type: ignore[arg-type]
+        elif operation == "match.approved":
+            self._match_approved(record)  # type: ignore[arg-type]
+
+    def _registered(self, record: Registration, at: datetime) -> None:
+        index, rank = _register_for(_hash64(record.participant_id), self.precision)
+        with self._lock:
+            for cell in self._cells_for(record.event_id, at):
+                cell.registrations += 1
+                self._count_participant(cell, record.participant_id, index, rank)
+
+    def _cancelled(self, record: Registration) -> None:
+        with self._lock:
+            for cell in self._cells_for(record.event_id, record.cancelled_at):  # type: ignore[arg-type]
+                cell.cancellations += 1
+
+    def _feedback(self, feedback: Feedback) -> None:
+        index, rank = _register_for(_hash64(feedback.participant_id), self.precision)
+        with self._lock:
+            for cell in self._cells_for(feedback.event_id, feedback.submitted_at):
+                cell.feedback += 1
+                cell.score_sum += feedback.score
+                self._count_participant(cell, feedback.participant_id, index, rank)
+
+    def _match_created(self, match: MatchRecord) -> None:
+        with self._lock:
+            for cell in self._scope_cells([ALL], match.created_at):
+                cell.matches_created += 1
+
+    def _match_approved(self, match: MatchRecord) -> None:
+        with self._lock:
+            for cell in self._scope_cells([ALL], match.approved_at):  # type: ignore[arg-type]
+                cell.matches_approved += 1
+
+    def _count_participant(self, cell: _Cell, participant_id: str, index: int, rank: int) -> None:
+        if cell.participants is None:
+            cell.participants = HyperLogLog(self.precision)
+        cell.participants.add_register(index, rank)
+        if self.exact:
+            if cell.exact is None:
+                cell.exact = set()
+            cell.exact.add(participant_id)
+
+    def _cells_for(self, event_id: str, at: datetime) -> List[_Cell]:
+        scopes = [ALL, f"event:{event_id}"]
+        event = self.service._events.get(event_id)
+        if event is not None:
+            scopes.append(f"category:{event.category}")
+        return self._scope_cells(scopes, at)
+
+    def _scope_cells(self, scopes: List[str], at: datetime) -> List[_Cell]:
+        day = at.astimezone(UTC).date()
+        ordinal = day.toordinal()
+        month = day.year * 12 + day.month - 1
+        cells = self._cells
+        found: List[_Cell] = []
+        for key in [(scope, "d", ordinal) for scope in scopes] + [(scope, "m", month) for scope in scopes]:
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = _Cell()
+            found.append(cell)
+        return found
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+    def activity(
+        self,
+        *,
+        start: date,
+        end: date,
+        event_id: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> ActivityReport:
+        """Activity on the UTC days ``start <= day < end``, optionally for one event or category."""
+        if end <= start:
+            raise ValueError("end must be after start")
+        if event_id is not None and category is not None:
+            raise ValueError("report on an event or a category, not both")
+        if event_id is not None:
+            scope = f"event:{event_id}"
+        elif category is not None:
+            scope = f"category:{self.service.canonical_category(category)}"
+        else:
+            scope = ALL
+        report = ActivityReport(scope=scope, start=start, end=end, exact=self.exact)
+        participants = HyperLogLog(self.precision)
+        exact: Set[str] = set()
+        scores = 0
+        with self._lock:
+            for key in self._window_keys(scope, start, end):
+                cell = self._cells.get(key)
+                report.buckets += 1
+                if cell is None:
+                    continue
+                report.registrations += cell.registrations
+                report.cancellations += cell.cancellations
+                report.feedback += cell.feedback
+                report.matches_created += cell.matches_created
+                report.matches_approved += cell.matches_approved
+                scores += cell.score_sum
+                if cell.participants is not None:
+                    participants.merge(cell.participants)
+                if cell.exact:
+                    exact |= cell.exact
+        report.unique_participants = len(exact) if self.exact else participants.count()
+        if report.feedback:
+            report.average_score = round(scores / report.feedback, 3)
+        return report
+
+    def daily(self, *, start: date, end: date, **scope: Optional[str]) -> List[ActivityReport]:
+        """One report per day in ``[start, end)``."""
+        return [
+            self.activity(start=day, end=day + timedelta(days=1), **scope)  # type: ignore[arg-type]
+            for day in (start + timedelta(days=offset) for offset in range((end - start).days))
+        ]
+
+    @staticmethod
+    def _window_keys(scope: str, start: date, end: date) -> Iterator[Tuple[str, str, int]]:
+        # whole months come from month cells, the ragged edges from day cells
+        day = start
+        while day < end:
+            if day.day == 1:
+                following = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+                if following <= end:
+                    yield scope, "m", day.year * 12 + day.month - 1
+                    day = following
+                    continue
+            yield scope, "d", day.toordinal()
+            day += timedelta(days=1)
+
+
+__all__ = ["ActivityAnalytics", "ActivityReport", "HyperLogLog"]
@@ -0,0 +1,397 @@
+"""Online detection of abnormal registration activity in bounded memory."""
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import RegistrationAttempt
+from .service import ConnectHubService, utcnow
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_BUCKETS = 12
+DEFAULT_HALF_LIFE = 600.0
+MAX_TRACKED_KEYS = 10_000
+MAX_FLAGS = 200
+MAX_PENDING = 100_000
+
+# outcome -> (flag kind, subject field, attempts per window before flagging)
+FAILURE_RULES: Dict[str, Tuple[str, str, int]] = {
+    "duplicate": ("duplicate_attempts", "participant_id", 3),
+    "full": ("full_event_demand", "event_id", 10),
+    "finished": ("finished_event_attempts", "participant_id", 5),
+    "conflict": ("repeated_conflicts", "participant_id", 5),
+    "unknown_event": ("unknown_event_probing", "participant_id", 5),
+    "invalid": ("invalid_attempts", "participant_id", 5),
+}
+
+
+@dataclass(slots=True)
+class AnomalyFlag:
+    """One subject flagged for manual review; repeated hits update it in place."""
+
+    kind: str
+    subject: str
+    count: int
+    detail: str
+    first_seen: datetime
+    last_seen: datetime
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+# ----------------------------------------------------------------------
+# Counters
+# ----------------------------------------------------------------------
+class SlidingWindowCounter:
+    """Count over the last ``window`` seconds as a ring of ``buckets`` sub-counts.
+
+    Attempts that arrive with an older timestamp than the newest bucket are
+    counted in the newest bucket rather than rewinding the ring.
+    """
+
+    __slots__ = ("width", "_counts", "_epoch")
+
+    def __init__(self, window: float = DEFAULT_WINDOW, buckets: int = DEFAULT_BUCKETS) -> None:
+        self.width = window / buckets
+        self._counts = [0] * buckets
+        self._epoch: Optional[int] = None
+
+    def add(self, now: float, amount: int = 1) -> None:
+        self._advance(now)
+        self._counts[self._epoch % len(self._counts)] += amount  # type: ignore[operator]
+
+    def total(self, now: float) -> int:
+        self._advance(now)
+        return sum(self._counts)
+
+    def _advance(self, now: float) -> None:
+        epoch = int(now // self.width)
+        if self._epoch is None:
+            self._epoch = epoch
+            return
+        if epoch <= self._epoch:
+            return
+        size = len(self._counts)
+        for offset in range(1, min(epoch - self._epoch, size) + 1):
+            self._counts[(self._epoch + offset) % size] = 0
+        self._epoch = epoch
+
+
+class CountMinSketch:
+    """Approximate counts for unbounded key sets in ``width * depth`` counters.
+
+    Uses conservative update, so estimates never undercount and overcount by
+    at most ``e / width`` of the total with probability ``1 - e ** -depth``.
+    """
+
+    __slots__ = ("width", "_rows", "_salts")
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+        self._salts = [0x9E3779B97F4A7C15 * (row + 1) for row in range(depth)]
+
+    def add(self, key: str, amount: int = 1) -> int:
+        """Add ``amount`` to ``key`` and return its new estimate."""
+        cells = self._cells(key)
+        estimate = min(row[cell] for row, cell in cells) + amount
+        for row, cell in cells:
+            if row[cell] < estimate:
+                row[cell] = estimate
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in self._cells(key))
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = array("q", bytes(8 * self.width))
+
+    def _cells(self, key: str) -> List[Tuple[array, int]]:
+        width = self.width
+        return [(row, hash((salt, key)) % width) for row, salt in zip(self._rows, self._salts)]
+
+
+class WindowedCountMin:
+    """Count-min estimates over roughly the last ``window`` seconds.
+
+    Two sketches take turns: the current one and the one for the previous
+    window, whose counts fade out linearly as the current window fills.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, *, width: int = 2048, depth: int = 4) -> None:
+        self.window = window
+        self._current = CountMinSketch(width, depth)
+        self._previous = CountMinSketch(width, depth)
+        self._epoch: Optional[int] = None
+
+    def add(self, key: str, now: float) -> int:
+        weight = self._rotate(now)
+        return self._current.add(key) + int(self._previous.estimate(key) * weight)
+
+    def estimate(self, key: str, now: float) -> int:
+        weight = self._rotate(now)
+        return self._current.estimate(key) + int(self._previous.estimate(key) * weight)
+
+    def _rotate(self, now: float) -> float:
+        epoch = int(now // self.window)
+        if self._epoch is None:
+            self._epoch = epoch
+        elif epoch > self._epoch:
+            self._previous, self._current = self._current, self._previous
+            self._current.clear()
+            if epoch > self._epoch + 1:
+                self._previous.clear()
+            self._epoch = epoch
+        return 1.0 - (now / self.window - self._epoch)
+
+
+class _Rate:
+    __slots__ = ("bucket", "count", "baseline", "flagged")
+
+    def __init__(self, bucket: int) -> None:
+        self.bucket = bucket
+        self.count = 0
+        self.baseline = 0.0
+        self.flagged = False
+
+
+class RateBaselines:
+    """Per-key EWMA of attempts per bucket, for at most ``max_keys`` recently seen keys.
+
+    ``observe`` returns ``(count, baseline)`` the first time a key's count in
+    the current bucket reaches ``max(minimum, factor * baseline)``.
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket_width: float,
+        half_life: float = DEFAULT_HALF_LIFE,
+        factor: float = 4.0,
+        minimum: int = 20,
+        max_keys: int = MAX_TRACKED_KEYS,
+    ) -> None:
+        self.bucket_width = bucket_width
+        self.factor = factor
+        self.minimum = minimum
+        self.max_keys = max_keys
+        self._alpha = 1.0 - 0.5 ** (bucket_width / half_life)
+        self._states: "OrderedDict[str, _Rate]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def observe(self, key: str, now: float) -> Optional[Tuple[int, float]]:
+        bucket = int(now // self.bucket_width)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _Rate(bucket)
+            if len(self._states) > self.max_keys:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(key)
+            if bucket > state.bucket:
+                # fold the finished bucket in, then decay once per idle bucket
+                keep = 1.0 - self._alpha
+                folded = self._alpha * state.count + keep * state.baseline
+                state.baseline = folded * keep ** (bucket - state.bucket - 1)
+                state.bucket = bucket
+                state.count = 0
+                state.flagged = False
+        state.count += 1
+        if state.flagged or state.count < max(self.minimum, self.factor * state.baseline):
+            return None
+        state.flagged = True
+        return state.count, state.baseline
+
+    def baseline(self, key: str) -> float:
+        state = self._states.get(key)
+        return 0.0 if state is None else state.baseline
+
+
+# ----------------------------------------------------------------------
+# Detector
+# ----------------------------------------------------------------------
+class AnomalyDetector:
+    """Flags spikes, heavy hitters and repeated failures among registration attempts.
+
+    ``observe`` only appends to a bounded queue, so it is cheap enough to run
+    inside ``register_participant``; the queue is processed by ``drain``,
+    which every read calls first, or by a background thread after ``start``.
+    Attempts arriving while ``MAX_PENDING`` are already queued are dropped
+    and counted.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = DEFAULT_WINDOW,
+        buckets: int = DEFAULT_BUCKETS,
+        half_life: float = DEFAULT_HALF_LIFE,
+        spike_factor: float = 4.0,
+        spike_minimum: int = 20,
+        heavy_hitter_share: float = 0.2,
+        heavy_hitter_minimum: int = 50,
+        failure_rules: Optional[Dict[str, Tuple[str, str, int]]] = None,
+        max_keys: int = MAX_TRACKED_KEYS,
+        max_flags: int = MAX_FLAGS,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self.heavy_hitter_share = heavy_hitter_share
+        self.heavy_hitter_minimum = heavy_hitter_minimum
+        self.failure_rules = dict(FAILURE_RULES if failure_rules is None else failure_rules)
+        self.max_flags = max_flags
+        self.max_pending = max_pending
+        self.processed = 0
+        self.dropped = 0
+        self._attempts = SlidingWindowCounter(window, buckets)
+        self._failures = {outcome: SlidingWindowCounter(window, buckets) for outcome in self.failure_rules}
+        rate_options = {"half_life": half_life, "factor": spike_factor, "minimum": spike_minimum, "max_keys": max_keys}
+        self._event_rates = RateBaselines(bucket_width=window / buckets, **rate_options)  # type: ignore[arg-type]
+        self._participant_rates = RateBaselines(bucket_width=window / buckets, **rate_options)  # type: ignore[arg-type]
+        self._participant_counts = WindowedCountMin(window)
+        self._failure_counts = WindowedCountMin(window)
+        self._pending: Deque[RegistrationAttempt] = deque()
+        self._flags: "OrderedDict[Tuple[str, str], AnomalyFlag]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def attach(cls, service: ConnectHubService, **options: object) -> "AnomalyDetector":
+        detector = cls(**options)  # type: ignore[arg-type]
+        detector._unsubscribe = service.watch_attempts(detector.observe)
+        return detector
+
+    def detach(self) -> None:
+        self.stop()
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def observe(self, attempt: RegistrationAttempt) -> None:
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(attempt)
+
+    def drain(self) -> int:
+        """Process every queued attempt; returns how many were processed."""
+        processed = 0
+        with self._lock:
+            pending = self._pending
+            while pending:
+                self._process(pending.popleft())
+                processed += 1
+            self.processed += processed
+        return processed
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def flags(self, *, limit: Optional[int] = None) -> List[AnomalyFlag]:
+        """Open flags, most recently raised or updated first."""
+        self.drain()
+        with self._lock:
+            flags = list(reversed(self._flags.values()))
+        return flags if limit is None else flags[:limit]
+
+    def dismiss(self, kind: str, subject: str) -> bool:
+        """Close a flag after review; it is raised again if the activity continues."""
+        with self._lock:
+            return self._flags.pop((kind, subject), None) is not None
+
+    def stats(self, now: Optional[datetime] = None) -> Dict[str, object]:
+        self.drain()
+        with self._lock:
+            seconds = (now or utcnow()).timestamp()
+            return {
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "window_attempts": self._attempts.total(seconds),
+                "window_failures": {outcome: counter.total(seconds) for outcome, counter in self._failures.items()},
+                "tracked_events": len(self._event_rates),
+                "tracked_participants": len(self._participant_rates),
+                "open_flags": len(self._flags),
+            }
+
+    # ------------------------------------------------------------------
+    # Background draining
+    # ------------------------------------------------------------------
+    def start(self, *, poll_interval: float = 1.0) -> None:
+        if self._worker is not None:
+            return
+        self._stopped.clear()
+
+        def loop() -> None:
+            while not self._stopped.wait(poll_interval):
+                self.drain()
+
+        self._worker = threading.Thread(target=loop, name="connect-hub-anomalies", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    # ------------------------------------------------------------------
+    # Rules
+    # ------------------------------------------------------------------
+    def _process(self, attempt: RegistrationAttempt) -> None:
+        now = attempt.at.timestamp()
+        self._attempts.add(now)
+        for kind, rates, subject in (
+            ("event_spike", self._event_rates, attempt.event_id),
+            ("participant_burst", self._participant_rates, attempt.participant_id),
+        ):
+            spike = rates.observe(subject, now)
+            if spike is not None:
+                count, baseline = spike
+                detail = f"{count} attempts in one bucket vs baseline {baseline:.1f}"
+                self._flag(kind, subject, count, detail, attempt.at)
+
+        share = self._participant_counts.add(attempt.participant_id, now)
+        if share >= self.heavy_hitter_minimum and share >= self.heavy_hitter_share * self._attempts.total(now):
+            self._flag("heavy_hitter", attempt.participant_id, share, f"~{share} attempts in the window", attempt.at)
+
+        rule = self.failure_rules.get(attempt.outcome)
+        if rule is None:
+            return
+        self._failures[attempt.outcome].add(now)
+        kind, field_name, threshold = rule
+        subject = getattr(attempt, field_name)
+        failures = self._failure_counts.add(f"{attempt.outcome}\x00{subject}", now)
+        if failures >= threshold:
+            self._flag(kind, subject, failures, f"~{failures} {attempt.outcome} failures in the window", attempt.at)
+
+    def _flag(self, kind: str, subject: str, count: int, detail: str, at: datetime) -> None:
+        key = (kind, subject)
+        flag = self._flags.pop(key, None)
+        if flag is None:
+            flag = AnomalyFlag(kind=kind, subject=subject, count=count, detail=detail, first_seen=at, last_seen=at)
+        else:
+            flag.count = max(flag.count, count)
+            flag.detail = detail
+            flag.last_seen = at
+        self._flags[key] = flag
+        if len(self._flags) > self.max_flags:
+            self._flags.popitem(last=False)
+
+
+__all__ = [
+    "AnomalyDetector",
+    "AnomalyFlag",
+    "CountMinSketch",
+    "RateBaselines",
+    "SlidingWindowCounter",
+    "WindowedCountMin",
+]
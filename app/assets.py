@@ -0,0 +1,121 @@
+"""Content-hashed static assets served from memory with long-lived caching."""
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .compression import EncodedBody
+
+STATIC_DIR = Path(__file__).with_name("static")
+STATIC_PREFIX = "/static/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+MAX_CACHED_SIZE = 256 * 1024
+DIGEST_LENGTH = 12
+_CONTENT_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+
+class StaticAsset:
+    """One file under the static directory.
+
+    Files up to ``MAX_CACHED_SIZE`` keep their bytes and precompressed
+    variants in ``encoded``; larger ones keep only their digest and are
+    streamed from disk on every request.
+    """
+
+    __slots__ = ("name", "path", "content_type", "size", "digest", "encoded")
+
+    def __init__(self, name: str, path: Path) -> None:
+        self.name = name
+        self.path = path
+        self.content_type = (
+            _CONTENT_TYPES.get(path.suffix) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        )
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(64 * 1024), b""):
+                digest.update(chunk)
+        self.digest = digest.hexdigest()[:DIGEST_LENGTH]
+        self.size = path.stat().st_size
+        self.encoded: Optional[EncodedBody] = (
+            EncodedBody(path.read_bytes()) if self.size <= MAX_CACHED_SIZE else None
+        )
+
+    @property
+    def hashed_name(self) -> str:
+        stem, dot, suffix = self.name.rpartition(".")
+        return f"{stem}.{self.digest}.{suffix}" if dot else f"{self.name}.{self.digest}"
+
+    @property
+    def url(self) -> str:
+        return STATIC_PREFIX + self.hashed_name
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+class AssetRegistry:
+    """Loads files from ``directory`` on first use and resolves request paths.
+
+    ``/static/<stem>.<digest>.<ext>`` is served as immutable; the plain
+    ``/static/<name>`` path, or a stale digest, still works but must be
+    revalidated.
+    """
+
+    def __init__(self, directory: Union[str, Path] = STATIC_DIR) -> None:
+        self.directory = Path(directory)
+        self._assets: Dict[str, StaticAsset] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        asset = self._assets.get(name)
+        if asset is not None:
+            return asset
+        path = self.directory / name
+        if "/" in name or name.startswith(".") or not path.is_file():
+            return None
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is None:
+                asset = self._assets[name] = StaticAsset(name, path)
+        return asset
+
+    def url(self, name: str) -> str:
+        asset = self.get(name)
+        if asset is None:
+            raise KeyError(f"static asset {name} not found")
+        return asset.url
+
+    def resolve(self, request_path: str) -> tuple[Optional[StaticAsset], bool]:
+        """Map a request path to ``(asset, immutable)``; ``asset`` is ``None`` when unknown."""
+        if not request_path.startswith(STATIC_PREFIX):
+            return None, False
+        requested = request_path[len(STATIC_PREFIX):]
+        parts = requested.split(".")
+        asset = self.get(requested)
+        if asset is None and len(parts) >= 3:
+            # a stale digest still gets the current file, just not as immutable
+            asset = self.get(".".join(parts[:-2] + parts[-1:]))
+            if asset is not None:
+                return asset, asset.digest == parts[-2]
+        return asset, False
+
+
+assets = AssetRegistry()
+
+
+__all__ = [
+    "AssetRegistry",
+    "IMMUTABLE_CACHE_CONTROL",
+    "REVALIDATE_CACHE_CONTROL",
+    "STATIC_PREFIX",
+    "StaticAsset",
+    "assets",
+]
@@ -0,0 +1,73 @@
+"""Change-data-capture stream fed by ``ConnectHubService.subscribe``."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+from .service import ConnectHubService, utcnow
+
+
+class ChangeStreamGap(LookupError):
+    """Raised when a reader asks for changes that were already trimmed."""
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    sequence: int
+    operation: str
+    record: object
+    recorded_at: object
+
+
+class ChangeStream:
+    """Bounded, sequenced log of service mutations that readers can tail."""
+
+    def __init__(self, *, retention: int = 100_000) -> None:
+        if retention <= 0:
+            raise ValueError("retention must be greater than zero")
+        self._log: Deque[Change] = deque(maxlen=retention)
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    @classmethod
+    def attach(cls, service: ConnectHubService, *, retention: int = 100_000) -> "ChangeStream":
+        stream = cls(retention=retention)
+        stream._unsubscribe = service.subscribe(stream.publish)
+        return stream
+
+    def detach(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    def publish(self, operation: str, record: object) -> Change:
+        with self._condition:
+            self._sequence += 1
+            change = Change(self._sequence, operation, record, utcnow())
+            self._log.append(change)
+            self._condition.notify_all()
+        return change
+
+    def read(self, since: int, *, limit: Optional[int] = None, timeout: Optional[float] = 0) -> List[Change]:
+        """Return changes with ``sequence > since``, waiting up to ``timeout`` for new ones."""
+        with self._condition:
+            if timeout != 0 and self._sequence <= since:
+                self._condition.wait_for(lambda: self._sequence > since, timeout=timeout)
+            if self._sequence <= since:
+                return []
+            first = self._log[0].sequence
+            if since + 1 < first:
+                raise ChangeStreamGap(f"changes after {since} were trimmed; oldest is {first}")
+            start = since + 1 - first
+            stop = len(self._log) if limit is None else min(len(self._log), start + limit)
+            return [self._log[idx] for idx in range(start, stop)]
+
+
+__all__ = ["Change", "ChangeStream", "ChangeStreamGap"]
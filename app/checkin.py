@@ -0,0 +1,381 @@
+"""Door check-in: signed ticket tokens, per-event attendance bitmaps and offline scanner sync."""
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+from array import array
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from .ids import ULID_LENGTH, decode_ulid, encode_ulid
+from .service import ConnectHubService, utcnow
+from .storage import from_micros, to_micros
+
+TICKET_SECRET_ENV = "CONNECT_HUB_TICKET_SECRET"
+TOKEN_VERSION = 1
+TAG_BYTES = 10
+# flag bits set when the event id is a canonical UUID or ULID packed into 16 bytes
+_UUID_EVENT = 0x80
+_ULID_EVENT = 0x40
+CHECK_IN_STATUSES = ("checked_in", "duplicate", "rejected")
+DASHBOARD_ATTENDANCE_LIMIT = 5
+MAX_SYNC_BATCH = 5_000
+
+INVALID_TICKET = "invalid ticket"
+NOT_REGISTERED = "no registration for this ticket"
+REGISTRATION_CANCELLED = "registration was cancelled"
+WRONG_EVENT = "ticket is for another event"
+
+
+@dataclass(frozen=True, slots=True)
+class CheckIn:
+    """Answer to one scan; ``checked_in_at`` is the first recorded arrival, also for duplicates."""
+
+    status: str
+    event_id: Optional[str] = None
+    participant_id: Optional[str] = None
+    registration_id: Optional[str] = None
+    checked_in_at: Optional[datetime] = None
+    reason: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class SyncReport:
+    """Outcome of one offline upload, with one ``CheckIn`` per scan in upload order."""
+
+    device_id: str
+    checked_in: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    results: List[CheckIn] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "device_id": self.device_id,
+            "received": len(self.results),
+            "checked_in": self.checked_in,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Attendance:
+    event_id: str
+    checked_in: int
+    registered: int
+    rate: float
+    last_check_in: Optional[datetime]
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+# ----------------------------------------------------------------------
+# Ticket tokens
+# ----------------------------------------------------------------------
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TicketSigner:
+    """HMAC-signed ``(event_id, participant_id)`` tokens small enough for a dense QR code.
+
+    The payload is a version byte, the event id (16 raw bytes when it is a
+    canonical ULID or UUID, length-prefixed text otherwise) and the participant id,
+    followed by a truncated HMAC-SHA256 tag; the whole thing is base64url
+    without padding. Verifying needs no lookup, so forged or mistyped codes
+    are turned away before the registration index is touched.
+    """
+
+    def __init__(self, secret: bytes) -> None:
+        if not secret:
+            raise ValueError("ticket secret must not be empty")
+        self._secret = secret
+
+    def sign(self, event_id: str, participant_id: str) -> str:
+        payload = self._pack(event_id, participant_id)
+        return _b64encode(payload + self._tag(payload))
+
+    def verify(self, token: str) -> Optional[Tuple[str, str]]:
+        """``(event_id, participant_id)`` for a genuine token, ``None`` otherwise."""
+        try:
+            raw = _b64decode(token)
+        except (binascii.Error, ValueError):
+            return None
+        payload, tag = raw[:-TAG_BYTES], raw[-TAG_BYTES:]
+        if len(payload) < 2 or not hmac.compare_digest(tag, self._tag(payload)):
+            return None
+        return self._unpack(payload)
+
+    def _tag(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()[:TAG_BYTES]
+
+    @staticmethod
+    def _pack(event_id: str, participant_id: str) -> bytes:
+        if len(event_id) == ULID_LENGTH:
+            try:
+                value = decode_ulid(event_id)
+            except ValueError:
+                pass
+            else:
+                if encode_ulid(value) == event_id:
+                    return bytes((TOKEN_VERSION | _ULID_EVENT,)) + value.to_bytes(16, "big") + participant_id.encode()
+        try:
+            packed = UUID(event_id)
+        except ValueError:
+            packed = None
+        if packed is not None and str(packed) == event_id:
+            return bytes((TOKEN_VERSION | _UUID_EVENT,)) + packed.bytes + participant_id.encode("utf-8")
+        encoded = event_id.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError("event_id is too long for a ticket")
+        return bytes((TOKEN_VERSION, len(encoded))) + encoded + participant_id.encode("utf-8")
+
+    @staticmethod
+    def _unpack(payload: bytes) -> Optional[Tuple[str, str]]:
+        header = payload[0]
+        packed = header & (_UUID_EVENT | _ULID_EVENT)
+        if header & ~packed != TOKEN_VERSION or packed == _UUID_EVENT | _ULID_EVENT:
+            return None
+        try:
+            if packed:
+                if len(payload) < 17:
+                    return None
+                raw = payload[1:17]
+                event_id = str(UUID(bytes=raw)) if packed == _UUID_EVENT else encode_ulid(int.from_bytes(raw, "big"))
+                return event_id, payload[17:].decode("utf-8")
+            end = 2 + payload[1]
+            return payload[2:end].decode("utf-8"), payload[end:].decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
+# ----------------------------------------------------------------------
+# Attendance
+# ----------------------------------------------------------------------
+class _EventAttendance:
+    """Registration ids get dense per-event ordinals; bit ``n`` marks ordinal ``n`` present."""
+
+    __slots__ = ("ordinals", "bits", "arrivals", "count", "last")
+
+    def __init__(self) -> None:
+        self.ordinals: Dict[str, int] = {}
+        self.bits = bytearray()
+        self.arrivals = array("q")
+        self.count = 0
+        self.last = 0
+
+    def ordinal(self, registration_id: str) -> int:
+        ordinal = self.ordinals.get(registration_id)
+        if ordinal is None:
+            ordinal = self.ordinals[registration_id] = len(self.ordinals)
+            if ordinal >> 3 >= len(self.bits):
+                self.bits.extend(bytes(max(16, len(self.bits))))
+            self.arrivals.append(0)
+        return ordinal
+
+    def is_set(self, ordinal: int) -> bool:
+        return bool(self.bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def mark(self, ordinal: int, at: int) -> Tuple[bool, int]:
+        """Record an arrival; returns whether it was the first and the earliest arrival known."""
+        if self.is_set(ordinal):
+            first = self.arrivals[ordinal]
+            if at < first:
+                self.arrivals[ordinal] = first = at
+            return False, first
+        self.bits[ordinal >> 3] |= 1 << (ordinal & 7)
+        self.arrivals[ordinal] = at
+        self.count += 1
+        self.last = max(self.last, at)
+        return True, at
+
+
+class CheckInDesk:
+    """Validates ticket scans against ``service._registration_index`` and records attendance.
+
+    Every scan is a signature check plus two dict lookups, and check-ins are
+    idempotent: scanning a ticket again (or uploading the same offline scan
+    twice) answers ``duplicate`` with the original arrival time. Offline
+    scanners upload batches through ``sync``; the earliest scan of a ticket
+    wins however late it arrives. Attendance counts are kept up to date on
+    every check-in so dashboards never rescan.
+
+    Without an explicit ``secret`` the desk signs with
+    ``$CONNECT_HUB_TICKET_SECRET``; one of the two is required, so tickets
+    keep verifying across restarts and every worker accepts the others'.
+    """
+
+    def __init__(self, service: ConnectHubService, *, secret: Optional[bytes] = None) -> None:
+        if secret is None:
+            configured = os.environ.get(TICKET_SECRET_ENV)
+            if not configured:
+                raise ValueError(f"a ticket secret is required; pass secret or set ${TICKET_SECRET_ENV}")
+            secret = configured.encode("utf-8")
+        if not secret:
+            raise ValueError("ticket secret must not be empty")
+        self._service = service
+        self._signer = TicketSigner(secret)
+        self._events: Dict[str, _EventAttendance] = {}
+        self._devices: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+
+    # ------------------------------------------------------------------
+    # Tickets
+    # ------------------------------------------------------------------
+    def issue(self, *, event_id: str, participant_id: str) -> str:
+        """Ticket token for a confirmed registration."""
+        self._confirmed(event_id, participant_id)
+        return self._signer.sign(event_id, participant_id)
+
+    # ------------------------------------------------------------------
+    # Check-in
+    # ------------------------------------------------------------------
+    def check_in(self, token: str, *, event_id: Optional[str] = None, at: Optional[datetime] = None) -> CheckIn:
+        """Check in the holder of ``token``; ``event_id`` pins the scan to the event at this door."""
+        at = at or utcnow()
+        with self._lock:
+            return self._scan(token, event_id, to_micros(at))
+
+    def sync(self, device_id: str, scans: Iterable[Mapping[str, object]]) -> SyncReport:
+        """Apply a batch of offline scans, each ``{"token", "scanned_at"?, "event_id"?}``."""
+        if not device_id:
+            raise ValueError("device_id is required")
+        batch = list(scans)
+        if len(batch) > MAX_SYNC_BATCH:
+            raise ValueError(f"a sync batch holds at most {MAX_SYNC_BATCH} scans")
+        now = utcnow()
+        report = SyncReport(device_id=device_id)
+        parsed: List[Tuple[int, int, Mapping[str, object]]] = []
+        results: List[Optional[CheckIn]] = [None] * len(batch)
+        for index, scan in enumerate(batch):
+            try:
+                parsed.append((to_micros(min(_scan_time(scan.get("scanned_at"), now), now)), index, scan))
+            except ValueError as exc:
+                results[index] = CheckIn("rejected", reason=str(exc))
+        # oldest first, so a ticket scanned twice offline keeps its earlier arrival
+        parsed.sort(key=lambda item: item[:2])
+        with self._lock:
+            for at, index, scan in parsed:
+                token, event_id = scan.get("token"), scan.get("event_id")
+                if not isinstance(token, str) or (event_id is not None and not isinstance(event_id, str)):
+                    results[index] = CheckIn("rejected", reason=INVALID_TICKET)
+                else:
+                    results[index] = self._scan(token, event_id, at)
+            self._devices[device_id] = now
+        for result in results:
+            assert result is not None
+            report.results.append(result)
+            if result.status == "checked_in":
+                report.checked_in += 1
+            elif result.status == "duplicate":
+                report.duplicates += 1
+            else:
+                report.rejected += 1
+        return report
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def attendance(self, event_id: str) -> Attendance:
+        event = self._service.get_event(event_id)
+        state = self._events.get(event_id)
+        checked_in = state.count if state is not None else 0
+        last = from_micros(state.last) if state is not None and state.count else None
+        rate = min(1.0, checked_in / event.seats_taken) if event.seats_taken else 0.0
+        return Attendance(event_id, checked_in, event.seats_taken, round(rate, 4), last)
+
+    def is_checked_in(self, *, event_id: str, participant_id: str) -> bool:
+        registration_id = self._service._registration_index.get((event_id, participant_id))
+        state = self._events.get(event_id)
+        if registration_id is None or state is None:
+            return False
+        ordinal = state.ordinals.get(registration_id)
+        return ordinal is not None and state.is_set(ordinal)
+
+    def overview(self, limit: int = DASHBOARD_ATTENDANCE_LIMIT) -> Dict[str, object]:
+        """Dashboard block: totals plus the events with the most recent arrivals."""
+        recent = sorted(self._events.items(), key=lambda item: item[1].last, reverse=True)
+        events = []
+        for event_id, _ in recent[:limit]:
+            try:
+                events.append(self.attendance(event_id).to_dict())
+            except KeyError:
+                continue
+        return {
+            "checked_in": sum(state.count for state in self._events.values()),
+            "scans": self.scans,
+            "devices": len(self._devices),
+            "events": events,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _scan(self, token: str, expected_event: Optional[str], at: int) -> CheckIn:
+        self.scans += 1
+        claims = self._signer.verify(token)
+        if claims is None:
+            return CheckIn("rejected", reason=INVALID_TICKET)
+        event_id, participant_id = claims
+        if expected_event is not None and expected_event != event_id:
+            return CheckIn("rejected", event_id, participant_id, reason=WRONG_EVENT)
+        try:
+            registration_id = self._confirmed(event_id, participant_id)
+        except (KeyError, ValueError) as exc:
+            reason = exc.args[0] if exc.args else NOT_REGISTERED
+            return CheckIn("rejected", event_id, participant_id, reason=str(reason))
+        state = self._events.get(event_id)
+        if state is None:
+            state = self._events[event_id] = _EventAttendance()
+        first, arrived = state.mark(state.ordinal(registration_id), at)
+        status = "checked_in" if first else "duplicate"
+        return CheckIn(status, event_id, participant_id, registration_id, from_micros(arrived))
+
+    def _confirmed(self, event_id: str, participant_id: str) -> str:
+        registration_id = self._service._registration_index.get((event_id, participant_id))
+        if registration_id is None:
+            raise KeyError(NOT_REGISTERED)
+        if self._service._registrations[registration_id].status == "cancelled":
+            raise ValueError(REGISTRATION_CANCELLED)
+        return registration_id
+
+
+def _scan_time(value: object, default: datetime) -> datetime:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise ValueError("scanned_at must be an ISO 8601 timestamp") from exc
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        raise ValueError("scanned_at must be a timezone-aware timestamp")
+    return value
+
+
+__all__ = [
+    "Attendance",
+    "CHECK_IN_STATUSES",
+    "CheckIn",
+    "CheckInDesk",
+    "SyncReport",
+    "TICKET_SECRET_ENV",
+    "TicketSigner",
+]
@@ -0,0 +1,93 @@
+"""``Accept-Encoding`` negotiation and precompressed response bodies."""
+from __future__ import annotations
+
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:  # optional dependency: brotli is only offered when installed
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+GZIP_WBITS = 31
+MIN_COMPRESS_SIZE = 512
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported coding from an ``Accept-Encoding`` header, or ``None``."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, *, level: int = 6) -> bytes:
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=min(level, 11))
+    raise ValueError(f"unsupported content encoding {encoding!r}")
+
+
+class PrefixCompressor:
+    """gzip stream whose constant prefix is compressed once.
+
+    The deflate state after the prefix is kept and cloned per response, so a
+    page with a large static head only pays CPU for its dynamic remainder.
+    """
+
+    def __init__(self, prefix: bytes, *, level: int = 6) -> None:
+        self.prefix = prefix
+        self._state = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+        self._head = self._state.compress(prefix) + self._state.flush(zlib.Z_SYNC_FLUSH)
+
+    def compress(self, remainder: bytes) -> bytes:
+        compressor = self._state.copy()
+        return self._head + compressor.compress(remainder) + compressor.flush()
+
+
+class EncodedBody:
+    """A fixed body with its compressed variants computed up front."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.variants: Dict[str, bytes] = {encoding: compress(body, encoding) for encoding in supported_encodings()}
+
+    def select(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        if encoding is not None and encoding in self.variants:
+            return self.variants[encoding], encoding
+        return self.body, None
+
+
+__all__ = [
+    "EncodedBody",
+    "MIN_COMPRESS_SIZE",
+    "PrefixCompressor",
+    "compress",
+    "negotiate",
+    "supported_encodings",
+]
@@ -0,0 +1,290 @@
+"""Streaming CSV and columnar exports of service records."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import struct
+import sys
+import zlib
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from .service import ConnectHubService
+from .storage import from_micros, to_micros
+
+DEFAULT_CHUNK_SIZE = 10_000
+COLUMNAR_MAGIC = b"CHCOL\x01"
+# exports before tags were JSON-encoded joined them with this; still accepted on import
+_LEGACY_TAG_SEPARATOR = "|"
+_LIST_SEPARATOR = "\x1f"
+_NULL_TIMESTAMP = -(2**63)
+_NULL_LENGTH = -1
+_U32 = struct.Struct("<I")
+
+Schema = Tuple[Tuple[str, str], ...]
+SCHEMAS: Dict[str, Schema] = {
+    "events": (
+        ("id", "str"),
+        ("name", "str"),
+        ("category", "str"),
+        ("mode", "str"),
+        ("start_at", "datetime"),
+        ("end_at", "datetime"),
+        ("capacity", "int"),
+        ("location", "str"),
+        ("tags", "list"),
+        ("description", "str"),
+        ("seats_taken", "int"),
+    ),
+    "registrations": (
+        ("id", "str"),
+        ("event_id", "str"),
+        ("participant_id", "str"),
+        ("status", "str"),
+        ("registered_at", "datetime"),
+        ("cancelled_at", "datetime"),
+    ),
+    "feedback": (
+        ("id", "str"),
+        ("event_id", "str"),
+        ("participant_id", "str"),
+        ("score", "int"),
+        ("comment", "str"),
+        ("submitted_at", "datetime"),
+    ),
+    "matches": (
+        ("id", "str"),
+        ("opportunity_id", "str"),
+        ("talent_id", "str"),
+        ("recommended_score", "float"),
+        ("notes", "str"),
+        ("status", "str"),
+        ("created_at", "datetime"),
+    ),
+}
+FORMATS = {"csv": "text/csv; charset=utf-8", "chcol": "application/octet-stream"}
+
+
+def iter_records(
+    service: ConnectHubService, kind: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Sequence[object]]:
+    """Yield ``kind`` records in chunks of at most ``chunk_size``."""
+    if kind not in SCHEMAS:
+        raise ValueError(f"unknown export kind {kind!r}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than zero")
+    if kind == "registrations":
+        # copy the columns under the lock so concurrent writes, moves and
+        # compactions cannot skip or repeat rows; chunks are materialized after
+        with service._write_lock:
+            frozen = service._registrations.freeze()
+        yield from frozen.iter_chunks(chunk_size)
+        return
+    collection = {"events": service._events, "feedback": service._feedback, "matches": service._matches}[kind]
+    # published view: later writes do not disturb the export; walk it once
+    # rather than slicing, which re-descends the vector for every chunk
+    records = iter(collection.values())
+    while chunk := tuple(islice(records, chunk_size)):
+        yield chunk
+
+
+# ----------------------------------------------------------------------
+# CSV
+# ----------------------------------------------------------------------
+def format_tags(tags: Sequence[str]) -> str:
+    """CSV cell for a list column: a JSON array, so any character survives."""
+    return json.dumps(list(tags), ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_tags(text: str) -> List[str]:
+    """Inverse of ``format_tags``; also reads the older ``a|b`` form."""
+    text = text.strip()
+    if text.startswith("["):
+        try:
+            values = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"tags are not a JSON array: {text!r}") from exc
+        if not isinstance(values, list):
+            raise ValueError(f"tags are not a JSON array: {text!r}")
+        return [str(value) for value in values]
+    return [tag for tag in text.split(_LEGACY_TAG_SEPARATOR) if tag]
+
+
+def _csv_cell(kind: str) -> Callable[[object], object]:
+    if kind == "datetime":
+        return lambda value: "" if value is None else value.isoformat()  # type: ignore[union-attr]
+    if kind == "list":
+        return format_tags  # type: ignore[return-value]
+    return lambda value: "" if value is None else value
+
+
+def iter_csv(service: ConnectHubService, kind: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    schema = SCHEMAS[kind]
+    cells = [(name, _csv_cell(column)) for name, column in schema]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([name for name, _ in schema])
+    for chunk in iter_records(service, kind, chunk_size=chunk_size):
+        writer.writerows([cell(getattr(record, name)) for name, cell in cells] for record in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+# ----------------------------------------------------------------------
+# Columnar binary
+# ----------------------------------------------------------------------
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_column(kind: str, values: List[object]) -> bytes:
+    if kind == "int":
+        return _little_endian(array("q", values))  # type: ignore[arg-type]
+    if kind == "float":
+        return _little_endian(array("d", values))  # type: ignore[arg-type]
+    if kind == "datetime":
+        micros = (_NULL_TIMESTAMP if value is None else to_micros(value) for value in values)  # type: ignore[arg-type]
+        return _little_endian(array("q", micros))
+    lengths = array("i")
+    blob = bytearray()
+    for value in values:
+        if value is None:
+            lengths.append(_NULL_LENGTH)
+            continue
+        text = _LIST_SEPARATOR.join(value) if kind == "list" else value  # type: ignore[arg-type]
+        encoded = text.encode("utf-8")  # type: ignore[union-attr]
+        lengths.append(len(encoded))
+        blob += encoded
+    return _little_endian(lengths) + bytes(blob)
+
+
+def _decode_column(kind: str, payload: bytes, rows: int) -> List[object]:
+    if kind in {"int", "float", "datetime"}:
+        values = array("d" if kind == "float" else "q")
+        values.frombytes(payload)
+        if sys.byteorder != "little":
+            values.byteswap()
+        if kind == "datetime":
+            return [None if value == _NULL_TIMESTAMP else from_micros(value) for value in values]
+        return values.tolist()
+    lengths = array("i")
+    lengths.frombytes(payload[: rows * lengths.itemsize])
+    if sys.byteorder != "little":
+        lengths.byteswap()
+    offset = rows * lengths.itemsize
+    decoded: List[object] = []
+    for length in lengths:
+        if length == _NULL_LENGTH:
+            decoded.append(None)
+            continue
+        text = payload[offset : offset + length].decode("utf-8")
+        offset += length
+        decoded.append((text.split(_LIST_SEPARATOR) if text else []) if kind == "list" else text)
+    return decoded
+
+
+def iter_columnar(
+    service: ConnectHubService,
+    kind: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    level: int = 1,
+) -> Iterator[bytes]:
+    """Encode ``kind`` as zlib-compressed column blocks, one row group per chunk.
+
+    Layout: magic, ``u32`` length + JSON schema, then per row group a ``u32``
+    row count followed by one ``u32`` length + block per column; a row count
+    of zero ends the file. Integers and timestamps are little-endian int64
+    (timestamps in epoch microseconds), strings are int32 lengths plus UTF-8.
+    """
+    schema = SCHEMAS[kind]
+    header = json.dumps({"kind": kind, "columns": [list(column) for column in schema]}).encode("utf-8")
+    yield COLUMNAR_MAGIC + _U32.pack(len(header)) + header
+    for chunk in iter_records(service, kind, chunk_size=chunk_size):
+        parts = [_U32.pack(len(chunk))]
+        for name, column in schema:
+            block = zlib.compress(_encode_column(column, [getattr(record, name) for record in chunk]), level)
+            parts.append(_U32.pack(len(block)))
+            parts.append(block)
+        yield b"".join(parts)
+    yield _U32.pack(0)
+
+
+def read_columnar(stream: BinaryIO) -> Iterator[Dict[str, object]]:
+    """Yield the rows of a columnar export as dicts, one row group in memory at a time."""
+
+    def read_exact(size: int) -> bytes:
+        data = stream.read(size)
+        if len(data) != size:
+            raise ValueError("truncated columnar export")
+        return data
+
+    if read_exact(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("not a columnar export")
+    (header_size,) = _U32.unpack(read_exact(_U32.size))
+    schema = [tuple(column) for column in json.loads(read_exact(header_size))["columns"]]
+    while True:
+        (rows,) = _U32.unpack(read_exact(_U32.size))
+        if rows == 0:
+            return
+        columns = []
+        for _, column in schema:
+            (block_size,) = _U32.unpack(read_exact(_U32.size))
+            columns.append(_decode_column(column, zlib.decompress(read_exact(block_size)), rows))
+        names = [name for name, _ in schema]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+def iter_export(
+    service: ConnectHubService, kind: str, fmt: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    if kind not in SCHEMAS:
+        raise ValueError(f"unknown export kind {kind!r}")
+    if fmt == "csv":
+        return iter_csv(service, kind, chunk_size=chunk_size)
+    if fmt == "chcol":
+        return iter_columnar(service, kind, chunk_size=chunk_size)
+    raise ValueError(f"unknown export format {fmt!r}")
+
+
+def write_export(
+    service: ConnectHubService,
+    kind: str,
+    fmt: str,
+    target: Union[str, Path, BinaryIO],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write an export to a path or binary stream and return the bytes written."""
+    if isinstance(target, (str, Path)):
+        with open(target, "wb") as handle:
+            return write_export(service, kind, fmt, handle, chunk_size=chunk_size)
+    written = 0
+    for piece in iter_export(service, kind, fmt, chunk_size=chunk_size):
+        target.write(piece)
+        written += len(piece)
+    return written
+
+
+__all__ = [
+    "COLUMNAR_MAGIC",
+    "FORMATS",
+    "SCHEMAS",
+    "format_tags",
+    "iter_columnar",
+    "iter_csv",
+    "iter_export",
+    "iter_records",
+    "parse_tags",
+    "read_columnar",
+    "write_export",
+]
@@ -0,0 +1,137 @@
+"""Record identifier generators: random UUIDs or time-ordered, monotonic ULIDs."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+IdGenerator = Callable[[], str]
+
+UTC = timezone.utc
+ULID_LENGTH = 26
+_RANDOM_BITS = 80
+_RANDOM_MASK = (1 << _RANDOM_BITS) - 1
+NODE_BITS = 16
+_NODE_SHIFT = _RANDOM_BITS - NODE_BITS
+_NODE_MASK = (1 << NODE_BITS) - 1
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DIGITS = {char: value for value, char in enumerate(CROCKFORD_ALPHABET)}
+# every pair of base32 digits, indexed by the 10 bits it encodes
+_PAIRS = [high + low for high in CROCKFORD_ALPHABET for low in CROCKFORD_ALPHABET]
+
+
+def random_ids() -> str:
+    """The legacy scheme: a random 36-character UUID4 string."""
+    from uuid import uuid4
+
+    return str(uuid4())
+
+
+def _timestamp_digits(millis: int) -> str:
+    pairs = _PAIRS
+    return (
+        pairs[millis >> 40]
+        + pairs[(millis >> 30) & 1023]
+        + pairs[(millis >> 20) & 1023]
+        + pairs[(millis >> 10) & 1023]
+        + pairs[millis & 1023]
+    )
+
+
+def _random_digits(bits: int) -> str:
+    pairs = _PAIRS
+    return (
+        pairs[bits >> 70]
+        + pairs[(bits >> 60) & 1023]
+        + pairs[(bits >> 50) & 1023]
+        + pairs[(bits >> 40) & 1023]
+        + pairs[(bits >> 30) & 1023]
+        + pairs[(bits >> 20) & 1023]
+        + pairs[(bits >> 10) & 1023]
+        + pairs[bits & 1023]
+    )
+
+
+def encode_ulid(value: int) -> str:
+    """26 Crockford base32 digits: ten for the 48-bit timestamp, sixteen for the 80 random bits."""
+    return _timestamp_digits(value >> _RANDOM_BITS) + _random_digits(value & _RANDOM_MASK)
+
+
+def decode_ulid(text: str) -> int:
+    """The 128-bit value of a ULID string; raises ``ValueError`` for anything else."""
+    if len(text) != ULID_LENGTH or text[0] > "7":
+        raise ValueError(f"not a ULID: {text!r}")
+    value = 0
+    try:
+        for char in text.upper():
+            value = (value << 5) | _DIGITS[char]
+    except KeyError:
+        raise ValueError(f"not a ULID: {text!r}") from None
+    return value
+
+
+def ulid_node(text: str) -> int:
+    """Node number stamped by ``TimeOrderedIds(node=...)``; raises ``ValueError`` for non-ULIDs."""
+    return (decode_ulid(text) >> _NODE_SHIFT) & _NODE_MASK
+
+
+def ulid_time(text: str) -> datetime:
+    """Creation time embedded in a ULID, to the millisecond."""
+    return datetime(1970, 1, 1, tzinfo=UTC) + timedelta(milliseconds=decode_ulid(text) >> _RANDOM_BITS)
+
+
+class TimeOrderedIds:
+    """Monotonic ULIDs: a 48-bit millisecond timestamp followed by 80 random bits.
+
+    The 26-character Crockford base32 strings sort in creation order, both
+    lexicographically and by value. IDs minted within one millisecond (or
+    after the clock steps backwards) increment the previous value instead of
+    drawing fresh randomness, so every ID is strictly greater than the last.
+
+    With ``node`` set, the top 16 of the random bits carry that number, so
+    whoever minted an ID can be recovered with ``ulid_node``.
+    """
+
+    def __init__(self, *, clock: Callable[[], int] = time.time_ns, node: Optional[int] = None) -> None:
+        if node is not None and not 0 <= node <= _NODE_MASK:
+            raise ValueError(f"node must be between 0 and {_NODE_MASK}")
+        self._clock = clock
+        self._node = None if node is None else node << _NODE_SHIFT
+        self._millis = -1
+        self._last = 0
+        self._prefix = (-1, "")
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        millis = self._clock() // 1_000_000
+        with self._lock:
+            if millis > self._millis:
+                self._millis = millis
+                noise = int.from_bytes(os.urandom(10), "big")
+                if self._node is not None:
+                    noise = self._node | (noise & ((1 << _NODE_SHIFT) - 1))
+                fresh = (millis << _RANDOM_BITS) | noise
+                self._last = max(fresh, self._last + 1)
+            else:
+                self._last += 1
+            value = self._last
+        stamp = value >> _RANDOM_BITS
+        prefix = self._prefix
+        if prefix[0] != stamp:
+            prefix = self._prefix = (stamp, _timestamp_digits(stamp))
+        return prefix[1] + _random_digits(value & _RANDOM_MASK)
+
+
+__all__ = [
+    "CROCKFORD_ALPHABET",
+    "IdGenerator",
+    "NODE_BITS",
+    "TimeOrderedIds",
+    "decode_ulid",
+    "encode_ulid",
+    "random_ids",
+    "ulid_node",
+    "ulid_time",
+]
@@ -0,0 +1,246 @@
+"""Streaming bulk import of events and registrations from CSV or NDJSON."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .export import parse_tags
+from .service import ConnectHubService
+
+DEFAULT_BATCH_SIZE = 1_000
+MAX_REPORTED_ERRORS = 1_000
+IMPORT_KINDS = ("events", "registrations")
+IMPORT_FORMATS = ("csv", "ndjson")
+
+RawRow = Tuple[int, Union[str, Dict[str, object]]]
+CheckedRow = Tuple[int, Optional[Dict[str, object]], Optional[str]]
+
+
+@dataclass(slots=True)
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Outcome of one import; only the first ``MAX_REPORTED_ERRORS`` errors are kept."""
+
+    kind: str
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line, message))
+
+
+# ----------------------------------------------------------------------
+# Row validation (module-level so process-pool workers can run it)
+# ----------------------------------------------------------------------
+def _text(row: Dict[str, object], name: str, *, required: bool = True) -> Optional[str]:
+    value = row.get(name)
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"{name} is required")
+        return None
+    return str(value)
+
+
+def _timestamp(row: Dict[str, object], name: str) -> datetime:
+    value = _text(row, name)
+    try:
+        parsed = datetime.fromisoformat(value)  # type: ignore[arg-type]
+    except ValueError as exc:
+        raise ValueError(f"{name} is not an ISO 8601 timestamp: {value!r}") from exc
+    ConnectHubService._ensure_timezone(parsed, name)
+    return parsed
+
+
+def validate_event_row(row: Dict[str, object]) -> Dict[str, object]:
+    """Turn a raw row into ``create_event`` keyword arguments, or raise ``ValueError``."""
+    start_at = _timestamp(row, "start_at")
+    end_at = _timestamp(row, "end_at")
+    ConnectHubService._validate_event_window(start_at, end_at)
+    try:
+        capacity = int(row.get("capacity"))  # type: ignore[arg-type]
+    except (TypeError, ValueError) as exc:
+        raise ValueError("capacity must be an integer") from exc
+    if capacity <= 0:
+        raise ValueError("capacity must be greater than zero")
+    tags = row.get("tags") or []
+    if isinstance(tags, str):
+        tags = parse_tags(tags)
+    if not isinstance(tags, list):
+        raise ValueError("tags must be a list or a JSON array string")
+    return {
+        "event_id": _text(row, "id", required=False),
+        "name": _text(row, "name"),
+        "category": _text(row, "category"),
+        "mode": _text(row, "mode"),
+        "start_at": start_at,
+        "end_at": end_at,
+        "capacity": capacity,
+        "location": _text(row, "location", required=False),
+        "tags": [str(tag) for tag in tags],
+        "description": _text(row, "description", required=False),
+    }
+
+
+def validate_registration_row(row: Dict[str, object]) -> Dict[str, object]:
+    return {"event_id": _text(row, "event_id"), "participant_id": _text(row, "participant_id")}
+
+
+_VALIDATORS = {"events": validate_event_row, "registrations": validate_registration_row}
+
+
+def validate_batch(kind: str, batch: List[RawRow]) -> List[CheckedRow]:
+    """Decode and validate one batch, turning every failure into a per-row message."""
+    validator = _VALIDATORS[kind]
+    checked: List[CheckedRow] = []
+    for line, raw in batch:
+        try:
+            row = json.loads(raw) if isinstance(raw, str) else raw
+            if not isinstance(row, dict):
+                raise ValueError("row must be a JSON object")
+            checked.append((line, validator(row), None))
+        except ValueError as exc:  # JSONDecodeError is a ValueError too
+            checked.append((line, None, str(exc)))
+    return checked
+
+
+# ----------------------------------------------------------------------
+# Streaming input
+# ----------------------------------------------------------------------
+def iter_raw_rows(stream: TextIO, fmt: str) -> Iterator[RawRow]:
+    """Yield ``(line, raw)`` pairs; NDJSON lines are left undecoded for the workers."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line, text in enumerate(stream, start=1):
+            if text.strip():
+                yield line, text
+    else:
+        raise ValueError(f"unknown import format {fmt!r}")
+
+
+def _batches(rows: Iterator[RawRow], size: int) -> Iterator[List[RawRow]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _checked_batches(kind: str, batches: Iterator[List[RawRow]], workers: int) -> Iterator[List[CheckedRow]]:
+    if workers <= 1:
+        for batch in batches:
+            yield validate_batch(kind, batch)
+        return
+    # keep a bounded number of batches in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_batch, kind, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _apply(service: ConnectHubService, kind: str, checked: List[CheckedRow], report: ImportReport) -> None:
+    valid: List[Tuple[int, Dict[str, object]]] = []
+    for line, payload, error in checked:
+        report.rows += 1
+        if payload is None:
+            report.add_error(line, error or "invalid row")
+        else:
+            valid.append((line, payload))
+    if not valid:
+        return
+    if kind == "events":
+        results = service.create_events(payload for _, payload in valid)
+    else:
+        results = service.register_participants(
+            (str(payload["event_id"]), str(payload["participant_id"])) for _, payload in valid
+        )
+    for (line, _), result in zip(valid, results):
+        if isinstance(result, Exception):
+            message = result.args[0] if isinstance(result, KeyError) and result.args else str(result)
+            report.add_error(line, str(message))
+        else:
+            report.imported += 1
+
+
+def import_stream(
+    service: ConnectHubService,
+    stream: TextIO,
+    *,
+    kind: str,
+    fmt: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+    on_batch: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """Import rows batch by batch; bad rows are reported and never abort the run.
+
+    With ``workers > 1`` decoding and validation run in a process pool while
+    the service mutations stay in this process, in input order. ``on_batch``
+    sees the running report after every batch and may raise to stop early.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"unknown import kind {kind!r}")
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"unknown import format {fmt!r}")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be greater than zero")
+    report = ImportReport(kind=kind)
+    batches = _batches(iter_raw_rows(stream, fmt), batch_size)
+    for checked in _checked_batches(kind, batches, workers):
+        _apply(service, kind, checked, report)
+        if on_batch is not None:
+            on_batch(report)
+    return report
+
+
+def import_file(
+    service: ConnectHubService,
+    path: Union[str, Path],
+    *,
+    kind: str,
+    fmt: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+) -> ImportReport:
+    """Import a file, inferring the format from its suffix when ``fmt`` is not given."""
+    path = Path(path)
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    with path.open("r", encoding="utf-8", newline="") as stream:
+        return import_stream(service, stream, kind=kind, fmt=fmt, batch_size=batch_size, workers=workers)
+
+
+def import_text(service: ConnectHubService, text: str, *, kind: str, fmt: str, **options: object) -> ImportReport:
+    return import_stream(service, io.StringIO(text, newline=""), kind=kind, fmt=fmt, **options)  # type: ignore[arg-type]
+
+
+__all__ = [
+    "ImportReport",
+    "RowError",
+    "import_file",
+    "import_stream",
+    "import_text",
+    "iter_raw_rows",
+    "validate_batch",
+    "validate_event_row",
+    "validate_registration_row",
+]
@@ -0,0 +1,243 @@
+"""Low-overhead call metrics and an opt-in sampling profiler for Connect Hub."""
+from __future__ import annotations
+
+import heapq
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with Prometheus-compatible output."""
+
+    __slots__ = ("buckets", "counts", "total", "count", "errors")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, *, error: bool = False) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if error:
+            self.errors += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        rows: List[Tuple[str, int]] = []
+        for bound, hits in zip(self.buckets, self.counts):
+            running += hits
+            rows.append((repr(bound), running))
+        rows.append(("+Inf", running + self.counts[-1]))
+        return rows
+
+
+class Metrics:
+    """Registry of per-method and per-route histograms.
+
+    A disabled registry is never consulted on the hot path: ``instrument_service``
+    and ``create_app`` skip wrapping altogether, so the only cost is a flag check
+    at construction time.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        profiler: Optional["SlowRequestProfiler"] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.profiler = profiler
+        self._series: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float, *, error: bool = False) -> None:
+        key = (kind, name)
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = Histogram(self.buckets)
+            histogram.observe(seconds, error=error)
+
+    def snapshot(self) -> Dict[Tuple[str, str], Histogram]:
+        with self._lock:
+            return dict(self._series)
+
+    def render_prometheus(self) -> str:
+        series = self.snapshot()
+        lines: List[str] = []
+        for kind, label in (("service", "method"), ("http", "route")):
+            rows = sorted((name, hist) for (k, name), hist in series.items() if k == kind)
+            prefix = f"connect_hub_{kind}"
+            lines.append(f"# HELP {prefix}_calls_total Number of {kind} calls.")
+            lines.append(f"# TYPE {prefix}_calls_total counter")
+            for name, hist in rows:
+                lines.append(f'{prefix}_calls_total{{{label}="{name}"}} {hist.count}')
+            lines.append(f"# HELP {prefix}_errors_total Number of {kind} calls that failed.")
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for name, hist in rows:
+                lines.append(f'{prefix}_errors_total{{{label}="{name}"}} {hist.errors}')
+            lines.append(f"# HELP {prefix}_latency_seconds Latency of {kind} calls.")
+            lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+            for name, hist in rows:
+                for bound, cumulative in hist.cumulative():
+                    lines.append(
+                        f'{prefix}_latency_seconds_bucket{{{label}="{name}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{prefix}_latency_seconds_sum{{{label}="{name}"}} {hist.total:.6f}')
+                lines.append(f'{prefix}_latency_seconds_count{{{label}="{name}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+def timed(metrics: Metrics, kind: str, name: str, func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            metrics.observe(kind, name, time.perf_counter() - started, error=True)
+            raise
+        metrics.observe(kind, name, time.perf_counter() - started)
+        return result
+
+    return wrapper
+
+
+def instrument_service(service: object, metrics: Optional[Metrics]) -> object:
+    """Wrap every public method of ``service`` in place with latency tracking."""
+    if metrics is None or not metrics.enabled:
+        return service
+    for name in dir(type(service)):
+        if name.startswith("_"):
+            continue
+        attr = getattr(service, name)
+        if callable(attr):
+            setattr(service, name, timed(metrics, "service", name, attr))
+    return service
+
+
+@dataclass(order=True)
+class SlowRequest:
+    duration: float
+    label: str = field(compare=False)
+    started_at: float = field(compare=False)
+    samples: Counter = field(compare=False, default_factory=Counter)
+
+    def format(self) -> str:
+        lines = [f"{self.label} {self.duration * 1000:.2f} ms ({sum(self.samples.values())} samples)"]
+        for stack, hits in self.samples.most_common(5):
+            lines.append(f"  {hits} x")
+            lines.extend(f"    {frame}" for frame in stack)
+        return "\n".join(lines)
+
+
+class SlowRequestProfiler:
+    """Sampling profiler that keeps the stacks of the slowest requests.
+
+    A daemon thread wakes every ``interval`` seconds and captures the stack of
+    each thread that is currently serving a request. Only the ``keep`` slowest
+    requests are retained, in a min-heap.
+    """
+
+    def __init__(self, *, interval: float = 0.005, keep: int = 10, max_depth: int = 12) -> None:
+        self.interval = interval
+        self.keep = keep
+        self.max_depth = max_depth
+        self._active: Dict[int, SlowRequest] = {}
+        self._slowest: List[SlowRequest] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="connect-hub-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def begin(self, label: str) -> None:
+        self.start()
+        record = SlowRequest(duration=0.0, label=label, started_at=time.perf_counter())
+        with self._lock:
+            self._active[threading.get_ident()] = record
+
+    def end(self) -> None:
+        with self._lock:
+            record = self._active.pop(threading.get_ident(), None)
+            if record is None:
+                return
+            record.duration = time.perf_counter() - record.started_at
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, record)
+            elif record.duration > self._slowest[0].duration:
+                heapq.heapreplace(self._slowest, record)
+
+    def slowest(self) -> List[SlowRequest]:
+        with self._lock:
+            return sorted(self._slowest, reverse=True)
+
+    def dump(self) -> str:
+        return "\n\n".join(record.format() for record in self.slowest()) + "\n"
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        with self._lock:
+            if not self._active:
+                return
+            frames = sys._current_frames()
+            for thread_id, record in self._active.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame, limit=self.max_depth)
+                record.samples[tuple(f"{item.name} ({item.filename}:{item.lineno})" for item in stack)] += 1
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Histogram",
+    "Metrics",
+    "SlowRequest",
+    "SlowRequestProfiler",
+    "instrument_service",
+    "timed",
+]
@@ -0,0 +1,148 @@
+"""Interval trees for overlap queries on event time windows."""
+from __future__ import annotations
+
+import random
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+_priorities = random.Random(0x1D)
+
+
+class _Node:
+    __slots__ = ("start", "end", "item", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: int, end: int, item: object) -> None:
+        self.start = start
+        self.end = end
+        self.item = item
+        self.priority = _priorities.random()
+        self.max_end = end
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _refresh(node: _Node) -> None:
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+class IntervalTree(Generic[T]):
+    """Half-open ``[start, end)`` intervals, one per item, in a treap ordered by start.
+
+    Every node also records the largest ``end`` in its subtree, so an overlap
+    query prunes whole subtrees and costs O(log n + k) for ``k`` matches.
+    Adding or removing an item is O(log n) expected.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._entries: Dict[T, _Node] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._entries
+
+    def add(self, item: T, start: int, end: int) -> None:
+        """Insert ``item`` or move it to a new window."""
+        if end <= start:
+            raise ValueError("interval end must be after its start")
+        if item in self._entries:
+            self.remove(item)
+        node = _Node(start, end, item)
+        self._entries[item] = node
+        self._root = self._insert(self._root, node)
+
+    def remove(self, item: T) -> bool:
+        node = self._entries.pop(item, None)
+        if node is None:
+            return False
+        self._root = self._delete(self._root, node)
+        return True
+
+    def overlapping(self, start: int, end: int) -> List[T]:
+        """Items whose interval intersects ``[start, end)``, ordered by start."""
+        found: List[T] = []
+        stack: List[_Node] = []
+        node = self._root
+        # in-order walk that skips subtrees ending before ``start`` and stops past ``end``
+        while stack or node is not None:
+            if node is not None:
+                if node.max_end <= start:
+                    node = None
+                    continue
+                stack.append(node)
+                node = node.left
+                continue
+            current = stack.pop()
+            if current.start >= end:
+                break
+            if current.end > start:
+                found.append(current.item)  # type: ignore[arg-type]
+            node = current.right
+        return found
+
+    # -- treap internals -------------------------------------------------
+    @staticmethod
+    def _less(a: _Node, b: _Node) -> bool:
+        # ties on start are broken by node identity so equal windows can coexist
+        return (a.start, id(a)) < (b.start, id(b))
+
+    def _insert(self, root: Optional[_Node], node: _Node) -> _Node:
+        if root is None:
+            return node
+        if node.priority > root.priority:
+            node.left, node.right = self._split(root, node)
+            _refresh(node)
+            return node
+        if self._less(node, root):
+            root.left = self._insert(root.left, node)
+        else:
+            root.right = self._insert(root.right, node)
+        _refresh(root)
+        return root
+
+    def _split(self, root: Optional[_Node], pivot: _Node) -> Tuple[Optional[_Node], Optional[_Node]]:
+        if root is None:
+            return None, None
+        if self._less(root, pivot):
+            root.right, right = self._split(root.right, pivot)
+            _refresh(root)
+            return root, right
+        left, root.left = self._split(root.left, pivot)
+        _refresh(root)
+        return left, root
+
+    def _merge(self, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            _refresh(left)
+            return left
+        right.left = self._merge(left, right.left)
+        _refresh(right)
+        return right
+
+    def _delete(self, root: Optional[_Node], node: _Node) -> Optional[_Node]:
+        if root is None:
+            return None
+        if root is node:
+            return self._merge(root.left, root.right)
+        if self._less(node, root):
+            root.left = self._delete(root.left, node)
+        else:
+            root.right = self._delete(root.right, node)
+        _refresh(root)
+        return root
+
+
+__all__ = ["IntervalTree"]
@@ -0,0 +1,515 @@
+"""Prioritised background jobs on thread and process pools, with results on disk."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from .export import FORMATS, SCHEMAS, iter_export, iter_records
+from .importer import IMPORT_FORMATS, IMPORT_KINDS, ImportReport, import_text
+from .models import Registration
+from .service import ConnectHubService, utcnow
+
+EXECUTORS = ("thread", "process")
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED = frozenset({"done", "failed", "cancelled"})
+DEFAULT_THREADS = 2
+DEFAULT_PROCESSES = 2
+JOB_SUFFIX = ".job.json"
+INPUT_SUFFIX = ".input"
+_TIMESTAMPS = ("created_at", "started_at", "finished_at")
+
+
+class JobCancelled(Exception):
+    """Raised inside a task by ``JobContext.check`` once cancellation was requested."""
+
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, object]
+    priority: int
+    executor: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    done: int = 0
+    total: Optional[int] = None
+    result: Optional[Dict[str, object]] = None
+    result_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == "done":
+            return 1.0
+        if not self.total:
+            return None
+        return round(min(self.done / self.total, 1.0), 4)
+
+    def to_dict(self) -> Dict[str, object]:
+        payload = asdict(self)
+        payload.pop("result_path")
+        payload["progress"] = self.progress
+        payload["has_result"] = self.status == "done" and self.result_path is not None
+        return payload
+
+
+class JobContext:
+    """What a task sees: its parameters, where to write, and progress/cancel hooks.
+
+    Tasks on the process pool get a context without ``service`` whose
+    ``progress`` and ``check`` do nothing, since the state lives in the parent.
+    """
+
+    __slots__ = ("job", "service", "output_path", "_cancel")
+
+    def __init__(
+        self,
+        job: Job,
+        output_path: Path,
+        service: Optional[ConnectHubService] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> None:
+        self.job = job
+        self.service = service
+        self.output_path = output_path
+        self._cancel = cancel
+
+    @property
+    def params(self) -> Dict[str, object]:
+        return self.job.params
+
+    @property
+    def input_path(self) -> Path:
+        """Where the runner spooled the job's input, next to its output."""
+        return self.output_path.with_name(f"{self.job.id}{INPUT_SUFFIX}")
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel is not None and self._cancel.is_set()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise JobCancelled(self.job.id)
+
+    def progress(self, done: int, total: Optional[int] = None) -> None:
+        self.job.done = done
+        if total is not None:
+            self.job.total = total
+
+
+Task = Callable[[JobContext], Optional[Dict[str, object]]]
+Validator = Callable[[Dict[str, object]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSpec:
+    func: Task
+    executor: str
+    suffix: Union[str, Callable[[Dict[str, object]], str]] = ".json"
+    validate: Optional[Validator] = None
+    media_type: Union[str, Callable[[Dict[str, object]], str]] = "application/octet-stream"
+    spool: Optional[str] = None
+
+
+def _run_in_process(func: Task, job: Job, output_path: str) -> Optional[Dict[str, object]]:
+    return func(JobContext(job, Path(output_path)))
+
+
+# ----------------------------------------------------------------------
+# Built-in tasks
+# ----------------------------------------------------------------------
+def _validate_export(params: Dict[str, object]) -> None:
+    if params.get("kind") not in SCHEMAS:
+        raise ValueError(f"unknown export kind {params.get('kind')!r}")
+    if params.get("format", "csv") not in FORMATS:
+        raise ValueError(f"unknown export format {params.get('format')!r}")
+
+
+def export_task(ctx: JobContext) -> Dict[str, object]:
+    kind, fmt = str(ctx.params["kind"]), str(ctx.params.get("format", "csv"))
+    written = 0
+    with open(ctx.output_path, "wb") as handle:
+        for chunk in iter_export(ctx.service, kind, fmt):  # type: ignore[arg-type]
+            ctx.check()
+            handle.write(chunk)
+            written += len(chunk)
+            ctx.progress(written)
+    return {"kind": kind, "format": fmt, "size": written}
+
+
+def _validate_import(params: Dict[str, object]) -> None:
+    if params.get("kind") not in IMPORT_KINDS:
+        raise ValueError(f"unknown import kind {params.get('kind')!r}")
+    if params.get("format") not in IMPORT_FORMATS:
+        raise ValueError(f"unknown import format {params.get('format')!r}")
+    if not isinstance(params.get("text"), str):
+        raise ValueError("text is required")
+
+
+def import_task(ctx: JobContext) -> Dict[str, object]:
+    text = ctx.input_path.read_text(encoding="utf-8")
+    total = text.count("\n") + 1
+
+    def on_batch(report: ImportReport) -> None:
+        ctx.progress(report.rows, total)
+        ctx.check()
+
+    report = import_text(
+        ctx.service,  # type: ignore[arg-type]
+        text,
+        kind=str(ctx.params["kind"]),
+        fmt=str(ctx.params["format"]),
+        on_batch=on_batch,
+    )
+    with open(ctx.output_path, "w", encoding="utf-8") as handle:
+        json.dump(asdict(report), handle, ensure_ascii=False)
+    return {"rows": report.rows, "imported": report.imported, "failed": report.failed}
+
+
+def _archive_cutoff(params: Dict[str, object]) -> datetime:
+    value = params.get("before")
+    if value is None:
+        return utcnow()
+    try:
+        cutoff = datetime.fromisoformat(str(value))
+    except ValueError as exc:
+        raise ValueError(f"before is not an ISO 8601 timestamp: {value!r}") from exc
+    ConnectHubService._ensure_timezone(cutoff, "before")
+    return cutoff
+
+
+def archive_task(ctx: JobContext) -> Dict[str, object]:
+    """Write every event that ended before ``before`` with its registrations as NDJSON.
+
+    Registrations are grouped in one pass over a point-in-time copy of the
+    store, so the cost is one scan however many events are archived.
+    """
+    cutoff = _archive_cutoff(ctx.params)
+    service: ConnectHubService = ctx.service  # type: ignore[assignment]
+    events = [event for event in service.list_events() if event.end_at < cutoff]
+    grouped: Dict[str, List[Registration]] = {event.id: [] for event in events}
+    total = len(service._registrations)
+    scanned = 0
+    for chunk in iter_records(service, "registrations"):
+        ctx.check()
+        for record in chunk:
+            bucket = grouped.get(record.event_id)  # type: ignore[attr-defined]
+            if bucket is not None:
+                bucket.append(record)  # type: ignore[arg-type]
+        scanned += len(chunk)
+        ctx.progress(scanned, total + len(events))
+    registrations = 0
+    with open(ctx.output_path, "w", encoding="utf-8") as handle:
+        for index, event in enumerate(events, start=1):
+            ctx.check()
+            records = sorted(grouped[event.id], key=lambda record: record.registered_at)
+            registrations += len(records)
+            line = {"event": asdict(event), "registrations": [asdict(record) for record in records]}
+            handle.write(json.dumps(line, default=str, ensure_ascii=False) + "\n")
+            ctx.progress(scanned + index, total + len(events))
+    return {"before": cutoff.isoformat(), "events": len(events), "registrations": registrations}
+
+
+BUILTIN_TASKS: Dict[str, TaskSpec] = {
+    "export": TaskSpec(
+        export_task,
+        "thread",
+        lambda params: f".{params.get('format', 'csv')}",
+        _validate_export,
+        lambda params: FORMATS[str(params.get("format", "csv"))],
+    ),
+    "import": TaskSpec(import_task, "thread", ".json", _validate_import, "application/json", spool="text"),
+    "archive": TaskSpec(archive_task, "thread", ".ndjson", _archive_cutoff, "application/x-ndjson"),
+}
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+class JobRunner:
+    """Queues jobs by priority (higher first, then oldest) and runs them in the background.
+
+    Thread jobs run on ``threads`` worker threads next to the service.
+    Process jobs run on a ``ProcessPoolExecutor`` of ``processes`` workers
+    that is only started when the first one arrives; their task must be a
+    module-level function and only sees its parameters and output path.
+    Every job is recorded as ``<id>.job.json`` under ``directory`` and its
+    output as ``<id><suffix>``, so finished jobs survive a restart. A task
+    whose spec names a ``spool`` parameter gets that value written to
+    ``<id>.input`` instead of kept in its params; only its size is recorded.
+    """
+
+    def __init__(
+        self,
+        service: ConnectHubService,
+        directory: Union[str, Path],
+        *,
+        threads: int = DEFAULT_THREADS,
+        processes: int = DEFAULT_PROCESSES,
+    ) -> None:
+        self.service = service
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.slots = {"thread": threads, "process": processes}
+        self._specs: Dict[str, TaskSpec] = dict(BUILTIN_TASKS)
+        self._jobs: Dict[str, Job] = {}
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {executor: [] for executor in EXECUTORS}
+        self._cancels: Dict[str, threading.Event] = {}
+        self._finished: Dict[str, threading.Event] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+        self._load()
+
+    def register(
+        self,
+        kind: str,
+        func: Task,
+        *,
+        executor: str = "thread",
+        suffix: Union[str, Callable[[Dict[str, object]], str]] = ".json",
+        validate: Optional[Validator] = None,
+        media_type: Union[str, Callable[[Dict[str, object]], str]] = "application/octet-stream",
+        spool: Optional[str] = None,
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        self._specs[kind] = TaskSpec(func, executor, suffix, validate, media_type, spool)
+
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._specs)
+
+    # ------------------------------------------------------------------
+    # Client API
+    # ------------------------------------------------------------------
+    def submit(self, kind: str, params: Optional[Dict[str, object]] = None, *, priority: int = 0) -> Job:
+        spec = self._specs.get(kind)
+        if spec is None:
+            raise ValueError(f"unknown job kind {kind!r}")
+        if not self.slots[spec.executor]:
+            raise ValueError(f"no {spec.executor} workers are configured for {kind} jobs")
+        params = dict(params or {})
+        if spec.validate is not None:
+            spec.validate(params)
+        job = Job(
+            id=str(uuid4()),
+            kind=kind,
+            params=params,
+            priority=priority,
+            executor=spec.executor,
+            status="queued",
+            created_at=utcnow(),
+        )
+        if spec.spool is not None:
+            payload = str(params.pop(spec.spool)).encode("utf-8")
+            (self.directory / f"{job.id}{INPUT_SUFFIX}").write_bytes(payload)
+            params[f"{spec.spool}_bytes"] = len(payload)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("job runner is shut down")
+            self._jobs[job.id] = job
+            self._cancels[job.id] = threading.Event()
+            self._finished[job.id] = threading.Event()
+            heapq.heappush(self._queues[spec.executor], (-priority, next(self._sequence), job.id))
+            self._save(job)
+            self._ensure_workers(spec.executor)
+            self._condition.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Job:
+        try:
+            return self._jobs[job_id]
+        except KeyError as exc:
+            raise KeyError(f"job {job_id} not found") from exc
+
+    def list(self, *, status: Optional[str] = None) -> List[Job]:
+        jobs = [job for job in list(self._jobs.values()) if status is None or job.status == status]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job at once, or ask a running one to stop at its next check."""
+        job = self.get(job_id)
+        with self._condition:
+            if job.status in FINISHED:
+                return job
+            self._cancels[job_id].set()
+            if job.status == "queued":
+                self._finish(job, "cancelled")
+        return job
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Job:
+        job = self.get(job_id)
+        finished = self._finished.get(job_id)
+        if finished is not None:
+            finished.wait(timeout)
+        return job
+
+    def result_path(self, job_id: str) -> Path:
+        job = self.get(job_id)
+        if job.status != "done" or job.result_path is None:
+            raise ValueError(f"job {job_id} is {job.status}")
+        return Path(job.result_path)
+
+    def media_type(self, job_id: str) -> str:
+        """Content type of a job's result file, as declared by its task."""
+        job = self.get(job_id)
+        spec = self._specs.get(job.kind)
+        if spec is None:
+            return "application/octet-stream"
+        return spec.media_type(job.params) if callable(spec.media_type) else spec.media_type
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._condition:
+            self._closed = True
+            for job in self._jobs.values():
+                if job.status == "queued":
+                    self._finish(job, "cancelled")
+                elif job.status == "running":
+                    self._cancels[job.id].set()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _ensure_workers(self, executor: str) -> None:
+        running = sum(1 for worker in self._workers if worker.name.startswith(f"connect-hub-{executor}-job"))
+        for index in range(running, self.slots[executor]):
+            worker = threading.Thread(
+                target=self._work, args=(executor,), name=f"connect-hub-{executor}-job-{index}", daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self, executor: str) -> None:
+        queue = self._queues[executor]
+        while True:
+            with self._condition:
+                job = None
+                while job is None:
+                    while not queue and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    candidate = self._jobs[heapq.heappop(queue)[2]]
+                    if candidate.status == "queued":
+                        job = candidate
+                job.status = "running"
+                job.started_at = utcnow()
+                self._save(job)
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        spec = self._specs[job.kind]
+        suffix = spec.suffix(job.params) if callable(spec.suffix) else spec.suffix
+        final = self.directory / f"{job.id}{suffix}"
+        partial = final.with_name(final.name + ".part")
+        cancel = self._cancels[job.id]
+        try:
+            if job.executor == "process":
+                future: Future = self._process_pool().submit(_run_in_process, spec.func, job, str(partial))
+                result = future.result()
+            else:
+                result = spec.func(JobContext(job, partial, self.service, cancel))
+            if cancel.is_set():
+                raise JobCancelled(job.id)
+        except JobCancelled:
+            self._discard(partial)
+            with self._condition:
+                self._finish(job, "cancelled")
+            return
+        except Exception as exc:  # surfaced through the job status
+            self._discard(partial)
+            job.error = f"{type(exc).__name__}: {exc}"
+            with self._condition:
+                self._finish(job, "failed")
+            return
+        if partial.exists():
+            os.replace(partial, final)
+            job.result_path = str(final)
+        job.result = result
+        with self._condition:
+            self._finish(job, "done")
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._condition:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.slots["process"])
+            return self._pool
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = utcnow()
+        self._save(job)
+        self._discard(self.directory / f"{job.id}{INPUT_SUFFIX}")
+        self._finished[job.id].set()
+
+    @staticmethod
+    def _discard(path: Path) -> None:
+        if path.exists():
+            path.unlink()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _save(self, job: Job) -> None:
+        record = asdict(job)
+        for name in _TIMESTAMPS:
+            if record[name] is not None:
+                record[name] = record[name].isoformat()
+        target = self.directory / f"{job.id}{JOB_SUFFIX}"
+        temporary = target.with_name(target.name + ".tmp")
+        temporary.write_text(json.dumps(record, default=str, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporary, target)
+
+    def _load(self) -> None:
+        names = {item.name for item in fields(Job)}
+        for path in self.directory.glob(f"*{JOB_SUFFIX}"):
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                job = Job(**{name: value for name, value in record.items() if name in names})
+            except (OSError, TypeError, ValueError):
+                continue  # a torn or foreign file; skip it rather than refuse to start
+            for name in _TIMESTAMPS:
+                value = getattr(job, name)
+                if value is not None:
+                    setattr(job, name, datetime.fromisoformat(value))
+            self._jobs[job.id] = job
+            self._finished[job.id] = finished = threading.Event()
+            self._cancels[job.id] = threading.Event()
+            finished.set()
+            if job.status not in FINISHED:
+                job.error = "interrupted by a restart"
+                self._finish(job, "failed")
+
+
+__all__ = [
+    "BUILTIN_TASKS",
+    "Job",
+    "JobCancelled",
+    "JobContext",
+    "JobRunner",
+    "TaskSpec",
+    "archive_task",
+    "export_task",
+    "import_task",
+]
@@ -0,0 +1,597 @@
+"""Generate or replay request traffic against the WSGI app and report capacity over time.
+
+Run ``python -m app.loadsim --help``. Traffic is either generated from an
+arrival rate and a request mix, or replayed from a JSONL log with one
+request per line::
+
+    {"at": 0.25, "method": "POST", "path": "/api/registrations",
+     "body": {"event_id": "{event:0}", "participant_id": "p-7"}, "kind": "register"}
+
+``at`` is seconds from the start of the run. Paths and body strings may use
+placeholders that are resolved when the request is sent, so logs replay
+against any service: ``{event}`` (a random known event), ``{event:N}`` (the
+Nth known event), ``{registration}`` (a registration created earlier in
+the run, consumed once) and ``{match}`` (a known match).
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import io
+import json
+import math
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+from urllib.parse import urlsplit
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from .service import ConnectHubService, utcnow
+from .web import create_app
+
+KINDS = ("read", "register", "cancel", "feedback", "match_update")
+PRESETS: Dict[str, Dict[str, float]] = {
+    "browse": {"read": 0.9, "register": 0.06, "cancel": 0.01, "feedback": 0.02, "match_update": 0.01},
+    "ticket-drop": {"read": 0.3, "register": 0.65, "cancel": 0.03, "feedback": 0.01, "match_update": 0.01},
+}
+READ_PATHS = (
+    "/api/events",
+    "/api/dashboard",
+    "/api/recommendations?participant_id={participant}&limit=3",
+    "/api/search?q=session",
+    "/api/events/changes?since=0",
+)
+MATCH_STATUSES = ("pending", "in_review", "approved", "rejected", "contacted")
+SEED_MATCHES = 20
+_PLACEHOLDER = re.compile(r"\{(event(?::\d+)?|registration|match)\}")
+
+
+@dataclass(frozen=True, slots=True)
+class LoadRequest:
+    at: float
+    method: str
+    path: str
+    body: Optional[Dict[str, object]] = None
+    kind: str = "read"
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "LoadRequest":
+        method = str(payload.get("method", "GET")).upper()
+        path = payload.get("path")
+        if not isinstance(path, str) or not path.startswith("/"):
+            raise ValueError("each request needs a path starting with /")
+        body = payload.get("body")
+        if body is not None and not isinstance(body, dict):
+            raise ValueError("body must be a JSON object")
+        kind = payload.get("kind")
+        return cls(
+            at=float(payload.get("at", 0.0)),  # type: ignore[arg-type]
+            method=method,
+            path=path,
+            body=body,
+            kind=kind if isinstance(kind, str) else _kind_of(method, path),
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(frozen=True, slots=True)
+class Stats:
+    label: str
+    requests: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    error_rate: float
+    rejection_rate: float
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Per-interval and per-kind statistics; latency runs from a request's scheduled arrival."""
+
+    duration: float
+    sent: int
+    skipped: int
+    total: Stats
+    windows: List[Stats] = field(default_factory=list)
+    kinds: List[Stats] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    def format(self) -> str:
+        header = f"{'':>12} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'4xx':>7}"
+        lines = [f"sent {self.sent:,} requests in {self.duration:.1f}s ({self.skipped:,} skipped)", header]
+        for stats in [*self.windows, *self.kinds, self.total]:
+            lines.append(
+                f"{stats.label:>12} {stats.requests:7,} {stats.throughput:8.1f} {stats.p50_ms:8.2f} "
+                f"{stats.p95_ms:8.2f} {stats.p99_ms:8.2f} {stats.error_rate:7.1%} {stats.rejection_rate:7.1%}"
+            )
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Traffic
+# ----------------------------------------------------------------------
+def generate(
+    *,
+    rate: float,
+    duration: float,
+    mix: Optional[Dict[str, float]] = None,
+    participants: int = 10_000,
+    hot_events: int = 5,
+    seed: int = 0,
+) -> Iterator[LoadRequest]:
+    """Poisson arrivals at ``rate`` per second for ``duration`` seconds, drawn from ``mix``.
+
+    Four in five registrations and feedback target one of the first
+    ``hot_events`` events, the way a ticket drop concentrates demand.
+    """
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be positive")
+    weights = _normalize(mix or PRESETS["browse"])
+    kinds, cumulative = list(weights), []
+    running = 0.0
+    for kind in kinds:
+        running += weights[kind]
+        cumulative.append(running)
+    rng = random.Random(seed)
+    at = rng.expovariate(rate)
+    while at < duration:
+        kind = kinds[min(bisect_right(cumulative, rng.random() * running), len(kinds) - 1)]
+        participant = f"p-{rng.randrange(participants)}"
+        event = f"{{event:{rng.randrange(hot_events)}}}" if rng.random() < 0.8 else "{event}"
+        yield _request(kind, round(at, 6), participant, event, rng)
+        at += rng.expovariate(rate)
+
+
+def _request(kind: str, at: float, participant: str, event: str, rng: random.Random) -> LoadRequest:
+    if kind == "register":
+        return LoadRequest(at, "POST", "/api/registrations", {"event_id": event, "participant_id": participant}, kind)
+    if kind == "cancel":
+        return LoadRequest(at, "POST", "/api/registrations/{registration}/cancel", None, kind)
+    if kind == "feedback":
+        body = {"event_id": event, "participant_id": participant, "score": rng.randint(1, 5), "comment": "load test"}
+        return LoadRequest(at, "POST", "/api/feedback", body, kind)
+    if kind == "match_update":
+        body = {"status": rng.choice(MATCH_STATUSES)}
+        return LoadRequest(at, "POST", "/api/matches/{match}/status", body, kind)
+    path = rng.choice(READ_PATHS).replace("{participant}", participant)
+    return LoadRequest(at, "GET", path, None, "read")
+
+
+def load_log(path: Union[str, Path]) -> Iterator[LoadRequest]:
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield LoadRequest.from_dict(json.loads(line))
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"line {number}: {exc}") from exc
+
+
+def write_log(requests: Iterable[LoadRequest], handle: TextIO) -> int:
+    written = 0
+    for request in requests:
+        handle.write(json.dumps(request.to_dict(), ensure_ascii=False) + "\n")
+        written += 1
+    return written
+
+
+def seed_service(*, events: int = 100, capacity: int = 200, seed: int = 0) -> ConnectHubService:
+    """A service with ``events`` upcoming events, the first ones meant to sell out."""
+    rng = random.Random(seed)
+    service = ConnectHubService(schedule_policy="off", venue_policy="off")
+    start = utcnow() + timedelta(days=7)
+    service.create_events(
+        {
+            "name": f"Session {index}",
+            "category": rng.choice(("workshop", "talk", "meetup", "lab")),
+            "mode": "online",
+            "start_at": start + timedelta(hours=index),
+            "end_at": start + timedelta(hours=index + 2),
+            "capacity": capacity,
+            "tags": [f"track-{index % 7}"],
+        }
+        for index in range(events)
+    )
+    return service
+
+
+# ----------------------------------------------------------------------
+# Targets
+# ----------------------------------------------------------------------
+class WsgiTarget:
+    """Calls a WSGI callable directly, in the client's own thread."""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    def send(self, method: str, path: str, body: Optional[bytes]) -> Tuple[int, bytes]:
+        route, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": route,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "loadsim",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_LENGTH": str(len(body or b"")),
+            "CONTENT_TYPE": "application/json",
+            "wsgi.input": io.BytesIO(body or b""),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "http",
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        status: List[int] = []
+
+        def start_response(line: str, headers: list, exc_info: object = None) -> None:
+            status.append(int(line.split(" ", 1)[0]))
+
+        result = self.app(environ, start_response)
+        try:
+            payload = b"".join(result)
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        return status[0], payload
+
+    def close(self) -> None:
+        return None
+
+
+class HttpTarget:
+    """Sends requests over HTTP, one keep-alive connection per client thread."""
+
+    def __init__(self, url: str, *, timeout: float = 30.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError("only http:// URLs are supported")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, method: str, path: str, body: Optional[bytes]) -> Tuple[int, bytes]:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self._local.connection = None
+            raise
+        if response.will_close:
+            connection.close()
+            self._local.connection = None
+        return response.status, payload
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+
+
+class _ThreadingServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args: object) -> None:
+        return None
+
+
+def serve(app: Callable, *, host: str = "127.0.0.1", port: int = 0) -> Tuple[WSGIServer, str]:
+    """Serve ``app`` from a background thread; returns the server and its base URL."""
+    server = make_server(host, port, app, server_class=_ThreadingServer, handler_class=_QuietHandler)
+    threading.Thread(target=server.serve_forever, name="loadsim-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+class _Pools:
+    """Ids the placeholders resolve to, filled from the target and from responses."""
+
+    def __init__(self, events: Sequence[str], matches: Sequence[str], seed: int) -> None:
+        self.events = list(events)
+        self.matches = list(matches)
+        self.registrations: List[str] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def resolve(self, text: str) -> Optional[str]:
+        missing = False
+
+        def substitute(found: "re.Match[str]") -> str:
+            nonlocal missing
+            token = found.group(1)
+            value = self._pick(token)
+            if value is None:
+                missing = True
+                return ""
+            return value
+
+        with self._lock:
+            resolved = _PLACEHOLDER.sub(substitute, text)
+        return None if missing else resolved
+
+    def remember(self, kind: str, payload: bytes) -> None:
+        if kind != "register":
+            return
+        try:
+            registration_id = json.loads(payload)["id"]
+        except (ValueError, KeyError, TypeError):
+            return
+        with self._lock:
+            self.registrations.append(registration_id)
+
+    def _pick(self, token: str) -> Optional[str]:
+        if token.startswith("event"):
+            if not self.events:
+                return None
+            _, _, index = token.partition(":")
+            return self.events[int(index) % len(self.events)] if index else self._rng.choice(self.events)
+        if token == "match":
+            return self._rng.choice(self.matches) if self.matches else None
+        if not self.registrations:
+            return None
+        # consume a random earlier registration so each is cancelled at most once
+        index = self._rng.randrange(len(self.registrations))
+        self.registrations[index], self.registrations[-1] = self.registrations[-1], self.registrations[index]
+        return self.registrations.pop()
+
+
+def discover(target: Union[WsgiTarget, HttpTarget], *, seed_matches: int = SEED_MATCHES) -> Tuple[List[str], List[str]]:
+    """Known event and match ids on the target, creating a few matches when there are none."""
+    status, payload = target.send("GET", "/api/events", None)
+    events = [event["id"] for event in json.loads(payload)] if status == 200 else []
+    status, payload = target.send("GET", "/api/matches", None)
+    matches = [match["id"] for match in json.loads(payload)["matches"]] if status == 200 else []
+    for index in range(seed_matches if not matches else 0):
+        body = json.dumps({"opportunity_id": f"opp-{index}", "talent_id": f"talent-{index}", "recommended_score": 0.5})
+        status, payload = target.send("POST", "/api/matches", body.encode("utf-8"))
+        if status == 201:
+            matches.append(json.loads(payload)["id"])
+    return events, matches
+
+
+def run(
+    requests: Iterable[LoadRequest],
+    target: Union[WsgiTarget, HttpTarget],
+    *,
+    clients: int = 16,
+    speed: float = 1.0,
+    interval: float = 1.0,
+    seed: int = 0,
+) -> LoadReport:
+    """Send ``requests`` open-loop on their schedule through ``clients`` concurrent clients.
+
+    Arrivals do not wait for earlier responses, so when the target falls
+    behind the queueing delay shows up in latency instead of silently
+    lowering the offered load.
+    """
+    if clients < 1 or speed <= 0 or interval <= 0:
+        raise ValueError("clients, speed and interval must be positive")
+    events, matches = discover(target)
+    pools = _Pools(events, matches, seed)
+    pending: "queue.Queue[Optional[Tuple[LoadRequest, float]]]" = queue.Queue()
+    samples: List[Tuple[str, float, float, int]] = []
+    skipped = [0]
+    record_lock = threading.Lock()
+
+    def client() -> None:
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            request, due = item
+            path = pools.resolve(request.path)
+            body = None
+            if path is not None and request.body is not None:
+                resolved = pools.resolve(json.dumps(request.body, ensure_ascii=False))
+                body = resolved.encode("utf-8") if resolved is not None else None
+                path = path if resolved is not None else None
+            if path is None:
+                with record_lock:
+                    skipped[0] += 1
+                continue
+            try:
+                status, payload = target.send(request.method, path, body)
+            except Exception:
+                status, payload = 0, b""
+            finished = time.perf_counter()
+            if status == 201:
+                pools.remember(request.kind, payload)
+            with record_lock:
+                samples.append((request.kind, due - started, finished - due, status))
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=client, name=f"loadsim-client-{n}", daemon=True) for n in range(clients)]
+    for worker in workers:
+        worker.start()
+    sent = 0
+    for request in requests:
+        due = started + request.at / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put((request, due))
+        sent += 1
+    for _ in workers:
+        pending.put(None)
+    for worker in workers:
+        worker.join()
+    target.close()
+    duration = max(time.perf_counter() - started, 1e-9)
+    return _report(samples, sent, skipped[0], duration, interval)
+
+
+def _report(
+    samples: List[Tuple[str, float, float, int]], sent: int, skipped: int, duration: float, interval: float
+) -> LoadReport:
+    report = LoadReport(duration=duration, sent=sent, skipped=skipped, total=_stats("total", samples, duration))
+    windows: Dict[int, List[Tuple[str, float, float, int]]] = {}
+    for sample in samples:
+        windows.setdefault(int((sample[1] + sample[2]) // interval), []).append(sample)
+    for index in range(max(windows, default=-1) + 1):
+        label = f"{index * interval:g}-{(index + 1) * interval:g}s"
+        report.windows.append(_stats(label, windows.get(index, []), interval))
+    for kind in KINDS + tuple(sorted({sample[0] for sample in samples} - set(KINDS))):
+        chosen = [sample for sample in samples if sample[0] == kind]
+        if chosen:
+            report.kinds.append(_stats(kind, chosen, duration))
+    return report
+
+
+def _stats(label: str, samples: Sequence[Tuple[str, float, float, int]], seconds: float) -> Stats:
+    latencies = sorted(sample[2] * 1000 for sample in samples)
+    count = len(latencies)
+    errors = sum(1 for sample in samples if sample[3] == 0 or sample[3] >= 500)
+    rejected = sum(1 for sample in samples if 400 <= sample[3] < 500)
+    return Stats(
+        label=label,
+        requests=count,
+        throughput=round(count / seconds, 2) if seconds else 0.0,
+        p50_ms=round(_percentile(latencies, 0.5), 3),
+        p95_ms=round(_percentile(latencies, 0.95), 3),
+        p99_ms=round(_percentile(latencies, 0.99), 3),
+        error_rate=round(errors / count, 4) if count else 0.0,
+        rejection_rate=round(rejected / count, 4) if count else 0.0,
+    )
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def _normalize(mix: Dict[str, float]) -> Dict[str, float]:
+    unknown = set(mix) - set(KINDS)
+    if unknown:
+        raise ValueError(f"unknown request kinds: {', '.join(sorted(unknown))}")
+    if any(weight < 0 for weight in mix.values()) or not any(mix.values()):
+        raise ValueError("mix weights must be non-negative and not all zero")
+    total = sum(mix.values())
+    return {kind: weight / total for kind, weight in mix.items() if weight}
+
+
+def _kind_of(method: str, path: str) -> str:
+    if method == "GET":
+        return "read"
+    if path == "/api/registrations":
+        return "register"
+    if path.startswith("/api/registrations/"):
+        return "cancel"
+    if path == "/api/feedback":
+        return "feedback"
+    if path.startswith("/api/matches/"):
+        return "match_update"
+    return "write"
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    if text in PRESETS:
+        return PRESETS[text]
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        try:
+            mix[kind.strip()] = float(weight)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"bad mix entry {part!r}; use kind=weight") from exc
+    return mix
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.loadsim", description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--log", help="replay requests from this JSONL file")
+    source.add_argument("--rate", type=float, default=200.0, help="generated arrivals per second (default 200)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of generated traffic (default 10)")
+    parser.add_argument(
+        "--mix", type=_parse_mix, default=PRESETS["browse"], help="preset (browse, ticket-drop) or kind=weight,..."
+    )
+    parser.add_argument("--record", help="write the generated requests to this JSONL file instead of sending them")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (default 1)")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients (default 16)")
+    parser.add_argument("--interval", type=float, default=1.0, help="report window in seconds (default 1)")
+    parser.add_argument("--events", type=int, default=100, help="events to seed in-process (default 100)")
+    parser.add_argument("--capacity", type=int, default=200, help="seats per seeded event (default 200)")
+    parser.add_argument("--seed", type=int, default=0)
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument("--url", help="send to a running server instead of an in-process app")
+    target_group.add_argument("--serve", action="store_true", help="serve the in-process app over local HTTP")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    options = parser.parse_args(argv)
+
+    if options.log:
+        requests: Iterable[LoadRequest] = load_log(options.log)
+    else:
+        requests = generate(rate=options.rate, duration=options.duration, mix=options.mix, seed=options.seed)
+    if options.record:
+        with open(options.record, "w", encoding="utf-8") as handle:
+            print(f"wrote {write_log(requests, handle):,} requests to {options.record}")
+        return 0
+
+    server = None
+    if options.url:
+        target: Union[WsgiTarget, HttpTarget] = HttpTarget(options.url)
+    else:
+        app = create_app(seed_service(events=options.events, capacity=options.capacity, seed=options.seed))
+        if options.serve:
+            server, url = serve(app)
+            target = HttpTarget(url)
+        else:
+            target = WsgiTarget(app)
+    try:
+        report = run(requests, target, clients=options.clients, speed=options.speed, interval=options.interval)
+    finally:
+        if server is not None:
+            server.shutdown()
+    print(json.dumps(report.to_dict(), indent=2) if options.json else report.format())
+    return 0
+
+
+__all__ = [
+    "HttpTarget",
+    "KINDS",
+    "LoadReport",
+    "LoadRequest",
+    "PRESETS",
+    "Stats",
+    "WsgiTarget",
+    "generate",
+    "load_log",
+    "main",
+    "run",
+    "seed_service",
+    "serve",
+    "write_log",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -33,6 +33,27 @@ class Registration:
     cancelled_at: Optional[datetime] = None
 
 
+@dataclass(frozen=True, slots=True)
+class RegistrationAttempt:
+    """One call to ``register_participant``; ``outcome`` is "confirmed" or why it failed."""
+
+    event_id: str
+    participant_id: str
+    outcome: str
+    at: datetime
+
+
+@dataclass(slots=True)
+class Reservation:
+    id: str
+    event_id: str
+    participant_id: str
+    status: str
+    held_at: datetime
+    expires_at: datetime
+    registration_id: Optional[str] = None
+
+
 @dataclass(slots=True)
 class Feedback:
     id: str
@@ -52,6 +73,7 @@ class MatchRecord:
     notes: Optional[str]
     status: str
     created_at: datetime
+    approved_at: Optional[datetime] = None
 
 
 @dataclass(slots=True)
@@ -60,6 +82,12 @@ class Recommendation:
     reason: str
 
 
+@dataclass(slots=True)
+class SearchHit:
+    event: Event
+    score: float
+
+
 @dataclass(slots=True)
 class RecommendationResponse:
     participant_id: str
@@ -0,0 +1,206 @@
+"""Copy-on-write collections that hand readers immutable, versioned views."""
+from __future__ import annotations
+
+from collections.abc import MutableMapping, Sequence
+from itertools import chain, islice
+from typing import Dict, Generic, Iterator, Optional, Tuple, TypeVar, Union
+
+K = TypeVar("K")
+V = TypeVar("V")
+T = TypeVar("T")
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_COMPACT_MIN_SLOTS = 64
+
+
+def _assoc(node: Tuple[object, ...], shift: int, index: int, value: object) -> Tuple[object, ...]:
+    """Copy of ``node`` with ``value`` placed at ``index``, copying only the path to its leaf."""
+    slot = (index >> shift) & _MASK
+    if shift:
+        child = _assoc(node[slot] if slot < len(node) else (), shift - _BITS, index, value)  # type: ignore[arg-type]
+    else:
+        child = value
+    if slot == len(node):
+        return node + (child,)
+    return node[:slot] + (child,) + node[slot + 1 :]
+
+
+def _walk(node: Tuple[object, ...], shift: int, reverse: bool) -> Iterator[object]:
+    children = reversed(node) if reverse else node
+    if not shift:
+        return iter(children)
+    return chain.from_iterable(_walk(child, shift - _BITS, reverse) for child in children)  # type: ignore[arg-type]
+
+
+class PersistentVector(Generic[T]):
+    """Immutable vector stored as a 32-way trie of tuples.
+
+    ``set`` and ``append`` return a new vector that shares every untouched
+    node with the old one, so a write copies at most one 32-slot tuple per
+    level (four levels cover a million items) and old versions stay valid.
+    """
+
+    __slots__ = ("_count", "_shift", "_root")
+
+    def __init__(self, count: int = 0, shift: int = 0, root: Tuple[object, ...] = ()) -> None:
+        self._count = count
+        self._shift = shift
+        self._root = root
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> T:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("vector index out of range")
+        node = self._root
+        for shift in range(self._shift, 0, -_BITS):
+            node = node[(index >> shift) & _MASK]  # type: ignore[assignment]
+        return node[index & _MASK]  # type: ignore[return-value]
+
+    def __iter__(self) -> Iterator[T]:
+        return _walk(self._root, self._shift, False)  # type: ignore[return-value]
+
+    def __reversed__(self) -> Iterator[T]:
+        return _walk(self._root, self._shift, True)  # type: ignore[return-value]
+
+    def set(self, index: int, value: T) -> "PersistentVector[T]":
+        if not 0 <= index < self._count:
+            raise IndexError("vector index out of range")
+        return PersistentVector(self._count, self._shift, _assoc(self._root, self._shift, index, value))
+
+    def append(self, value: T) -> "PersistentVector[T]":
+        shift, root = self._shift, self._root
+        if self._count == _WIDTH << shift:
+            shift, root = shift + _BITS, (root,)
+        return PersistentVector(self._count + 1, shift, _assoc(root, shift, self._count, value))
+
+    @classmethod
+    def of(cls, items: Iterator[T]) -> "PersistentVector[T]":
+        vector: PersistentVector[T] = cls()
+        for item in items:
+            vector = vector.append(item)
+        return vector
+
+
+class FrozenView(Sequence, Generic[T]):
+    """Read-only sequence over one published version of a ``CopyOnWriteDict``."""
+
+    __slots__ = ("_slots", "_size", "_part")
+
+    def __init__(self, slots: PersistentVector[Optional[Tuple[object, object]]], size: int, part: int) -> None:
+        self._slots = slots
+        self._size = size
+        self._part = part  # 0 for keys, 1 for values, -1 for (key, value) pairs
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, Tuple[T, ...]]:  # type: ignore[override]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            return tuple(islice(self, start, stop, step)) if step > 0 else tuple(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("view index out of range")
+        if self._size == len(self._slots):
+            return self._pick(self._slots[index])  # type: ignore[arg-type]
+        return next(islice(iter(self), index, None))
+
+    def __iter__(self) -> Iterator[T]:
+        return self._picked(iter(self._slots))
+
+    def __reversed__(self) -> Iterator[T]:
+        return self._picked(reversed(self._slots))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (FrozenView, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FrozenView({list(self)!r})"
+
+    def _pick(self, entry: Tuple[object, object]) -> T:
+        return entry if self._part < 0 else entry[self._part]  # type: ignore[return-value]
+
+    def _picked(self, entries: Iterator[Optional[Tuple[object, object]]]) -> Iterator[T]:
+        pick = self._pick
+        return (pick(entry) for entry in entries if entry is not None)
+
+
+class CopyOnWriteDict(MutableMapping, Generic[K, V]):
+    """Dict whose ``values()``/``items()`` are immutable views published by writers.
+
+    Entries sit in insertion order in a ``PersistentVector``. Each write
+    publishes the new vector and live count with one attribute store, so
+    ``values()`` and ``items()`` are a reference grab: readers never copy,
+    never lock and never observe a view changing underneath them. Writers
+    must be serialized by the caller. Deleted entries leave holes that are
+    compacted away once they outnumber live entries.
+    """
+
+    __slots__ = ("_data", "_index", "_published", "version")
+
+    def __init__(self) -> None:
+        self._data: Dict[K, V] = {}
+        self._index: Dict[K, int] = {}
+        self._published: Tuple[PersistentVector[Optional[Tuple[K, V]]], int] = (PersistentVector(), 0)
+        self.version = 0
+
+    def __getitem__(self, key: K) -> V:
+        return self._data[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        entries = self._published[0]
+        slot = self._index.get(key)
+        if slot is None:
+            self._index[key] = len(entries)
+            entries = entries.append((key, value))
+        else:
+            entries = entries.set(slot, (key, value))
+        self._data[key] = value
+        self._published = (entries, len(self._data))
+        self.version += 1
+
+    def __delitem__(self, key: K) -> None:
+        del self._data[key]
+        entries = self._published[0].set(self._index.pop(key), None)
+        if len(entries) >= _COMPACT_MIN_SLOTS and len(self._data) * 2 < len(entries):
+            entries = PersistentVector.of(entry for entry in entries if entry is not None)
+            self._index = {entry[0]: slot for slot, entry in enumerate(entries)}  # type: ignore[index]
+        self._published = (entries, len(self._data))
+        self.version += 1
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._view(0))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:  # type: ignore[override]
+        return self._data.get(key, default)
+
+    def values(self) -> FrozenView[V]:  # type: ignore[override]
+        return self._view(1)
+
+    def items(self) -> FrozenView[Tuple[K, V]]:  # type: ignore[override]
+        return self._view(-1)
+
+    def keys_snapshot(self) -> Tuple[K, ...]:
+        return tuple(self._view(0))
+
+    def _view(self, part: int) -> FrozenView:
+        entries, size = self._published
+        return FrozenView(entries, size, part)
+
+
+__all__ = ["CopyOnWriteDict", "FrozenView", "PersistentVector"]
@@ -0,0 +1,210 @@
+"""Bounded cache of per-participant recommendation results with precise invalidation."""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .models import Event, RecommendationResponse
+
+DEFAULT_MAX_ENTRIES = 4_096
+DEFAULT_TTL = 300.0
+
+CacheKey = Tuple[str, int]
+Rank = Tuple[float, datetime]
+
+
+class _Entry:
+    __slots__ = ("response", "event_ids", "cutoff", "valid_until", "expires_at")
+
+    def __init__(
+        self,
+        response: RecommendationResponse,
+        event_ids: Tuple[str, ...],
+        cutoff: Optional[Rank],
+        valid_until: Optional[datetime],
+        expires_at: float,
+    ) -> None:
+        self.response = response
+        self.event_ids = event_ids
+        self.cutoff = cutoff
+        self.valid_until = valid_until
+        self.expires_at = expires_at
+
+
+class RecommendationCache:
+    """LRU of ``recommend_events`` results keyed by ``(participant_id, limit)``.
+
+    An entry is dropped exactly when it may have gone stale:
+
+    * an event it lists changes in any way (seats, schedule, details);
+    * an eligible event changes and now ranks at or ahead of the entry's last
+      pick, or the entry listed fewer events than it asked for;
+    * the participant's own registrations change;
+    * a listed event ends, since it then stops being eligible.
+
+    Cutoffs live in a sorted list, so finding the entries an event change can
+    displace is a bisection plus the entries actually invalidated. ``ttl``
+    bounds how long an entry may live regardless. Results computed while an
+    invalidation happened are not stored, so a slow reader can never cache a
+    result older than the change that should have evicted it.
+
+    Cached responses are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._by_event: Dict[str, Set[CacheKey]] = {}
+        self._by_participant: Dict[str, Set[CacheKey]] = {}
+        # (rank of the last pick, key) for full entries; entries that came up short are kept apart
+        self._cutoffs: List[Tuple[Rank, CacheKey]] = []
+        self._short: Set[CacheKey] = set()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Reads and writes
+    # ------------------------------------------------------------------
+    def get(self, participant_id: str, limit: int, now: datetime) -> Optional[RecommendationResponse]:
+        key = (participant_id, limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= self._clock() or (entry.valid_until is not None and now > entry.valid_until):
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.response
+
+    def put(
+        self,
+        participant_id: str,
+        limit: int,
+        response: RecommendationResponse,
+        events: Sequence[Event],
+        ranks: Sequence[Rank],
+        generation: int,
+    ) -> bool:
+        """Store a result computed since ``generation`` was read; ``False`` when it is already stale."""
+        key = (participant_id, limit)
+        valid_until = min((event.end_at for event in events), default=None)
+        cutoff = ranks[-1] if len(events) >= limit and ranks else None
+        entry = _Entry(response, tuple(event.id for event in events), cutoff, valid_until, self._clock() + self.ttl)
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            while len(self._entries) >= self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = entry
+            for event_id in entry.event_ids:
+                self._by_event.setdefault(event_id, set()).add(key)
+            self._by_participant.setdefault(participant_id, set()).add(key)
+            if cutoff is None:
+                self._short.add(key)
+            else:
+                insort(self._cutoffs, (cutoff, key))
+            return True
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def event_changed(self, event_id: str, rank: Optional[Rank]) -> None:
+        """``rank`` is the event's new ranking key, or ``None`` when it can no longer be recommended."""
+        with self._lock:
+            self.generation += 1
+            stale = set(self._by_event.get(event_id, ()))
+            if rank is not None:
+                stale.update(self._short)
+                start = bisect_left(self._cutoffs, (rank,))
+                stale.update(key for _, key in self._cutoffs[start:])
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def participant_changed(self, participant_id: str) -> None:
+        with self._lock:
+            self.generation += 1
+            stale = list(self._by_participant.get(participant_id, ()))
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_event.clear()
+            self._by_participant.clear()
+            self._cutoffs.clear()
+            self._short.clear()
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _drop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for event_id in entry.event_ids:
+            keys = self._by_event.get(event_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_event[event_id]
+        keys = self._by_participant.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_participant[key[0]]
+        if entry.cutoff is None:
+            self._short.discard(key)
+        else:
+            index = bisect_left(self._cutoffs, (entry.cutoff, key))
+            if index < len(self._cutoffs) and self._cutoffs[index][1] == key:
+                del self._cutoffs[index]
+
+
+__all__ = ["DEFAULT_MAX_ENTRIES", "DEFAULT_TTL", "RecommendationCache"]
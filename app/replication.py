@@ -0,0 +1,192 @@
+"""Read replicas that follow a primary service through its change stream."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import replace
+from typing import Iterable, List, Optional, Tuple
+
+from .changes import Change, ChangeStream
+from .models import (
+    DashboardMetrics,
+    Event,
+    MatchRecord,
+    RecommendationResponse,
+    Registration,
+    Reservation,
+    SearchHit,
+    SurfaceBlueprint,
+)
+from .service import ConnectHubService
+
+
+class ReplicaService(ConnectHubService):
+    """Read-only copy of a primary kept in sync by applying its change stream.
+
+    Every read first checks how long ago the replica last reached the head of
+    the stream and catches up synchronously when that exceeds
+    ``max_staleness`` seconds, so reads are never staler than the bound even
+    if the follower thread is not running.
+    """
+
+    def __init__(self, stream: ChangeStream, *, max_staleness: float = 0.5) -> None:
+        super().__init__()
+        self.stream = stream
+        self.max_staleness = max_staleness
+        self.applied_sequence = 0
+        self._synced_at = float("-inf")
+        self._follower: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_primary(
+        cls, primary: ConnectHubService, stream: ChangeStream, *, max_staleness: float = 0.5
+    ) -> "ReplicaService":
+        """Seed a replica from the primary's current state, then follow the stream."""
+        from .snapshot import capture, restore
+
+        sequence = stream.last_sequence
+        replica = cls(stream, max_staleness=max_staleness)
+        restore(capture(primary), service=replica)
+        replica.applied_sequence = sequence
+        return replica
+
+    # ------------------------------------------------------------------
+    # Applying changes
+    # ------------------------------------------------------------------
+    def apply(self, change: Change) -> None:
+        entity = change.operation.partition(".")[0]
+        record = change.record
+        if entity == "event":
+            self._store_event(replace(record))  # type: ignore[type-var]
+        elif entity == "registration":
+            self._store_registration(record)  # type: ignore[arg-type]
+        elif entity == "feedback":
+            self._feedback[record.id] = record  # type: ignore[attr-defined]
+        elif entity == "match":
+            self._store_match(record)  # type: ignore[arg-type]
+        elif entity == "reservation":
+            if change.operation == "reservation.created":
+                self._reservations.add(record)  # type: ignore[arg-type]
+            else:
+                self._reservations.settle(record)  # type: ignore[arg-type]
+        elif entity == "blueprint":
+            self._surface_blueprint = record  # type: ignore[assignment]
+        self.applied_sequence = change.sequence
+        self._publish(change.operation, record)
+
+    def apply_all(self, changes: Iterable[Change]) -> int:
+        applied = 0
+        with self._write_lock:
+            for change in changes:
+                if change.sequence <= self.applied_sequence:
+                    continue
+                self.apply(change)
+                applied += 1
+        return applied
+
+    def catch_up(self, *, timeout: Optional[float] = 0) -> int:
+        started = time.monotonic()
+        applied = self.apply_all(self.stream.read(self.applied_sequence, timeout=timeout))
+        if self.applied_sequence >= self.stream.last_sequence:
+            self._synced_at = started
+        return applied
+
+    @property
+    def lag(self) -> int:
+        return self.stream.last_sequence - self.applied_sequence
+
+    def _ensure_fresh(self) -> None:
+        if time.monotonic() - self._synced_at > self.max_staleness:
+            self.catch_up()
+
+    # ------------------------------------------------------------------
+    # Follower thread
+    # ------------------------------------------------------------------
+    def start(self, *, poll_interval: float = 0.05) -> None:
+        if self._follower is not None:
+            return
+        self._stopped.clear()
+
+        def follow() -> None:
+            while not self._stopped.is_set():
+                self.catch_up(timeout=poll_interval)
+
+        self._follower = threading.Thread(target=follow, name="connect-hub-replica", daemon=True)
+        self._follower.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._follower is not None:
+            self._follower.join()
+            self._follower = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def list_events(self, **filters: Optional[str]) -> List[Event]:
+        self._ensure_fresh()
+        return super().list_events(**filters)
+
+    def get_event(self, event_id: str) -> Event:
+        self._ensure_fresh()
+        return super().get_event(event_id)
+
+    def search_events(self, query: str, *, limit: int = 10) -> List[SearchHit]:
+        self._ensure_fresh()
+        return super().search_events(query, limit=limit)
+
+    def events_changed_since(self, since: int = 0) -> Tuple[int, List[Event]]:
+        self._ensure_fresh()
+        return super().events_changed_since(since)
+
+    def list_registrations(self, **filters: Optional[str]) -> List[Registration]:
+        self._ensure_fresh()
+        return super().list_registrations(**filters)
+
+    def schedule_conflicts(self, *, participant_id: str, event_id: str) -> List[Event]:
+        self._ensure_fresh()
+        return super().schedule_conflicts(participant_id=participant_id, event_id=event_id)
+
+    def venue_conflicts(self, **window: object) -> List[Event]:
+        self._ensure_fresh()
+        return super().venue_conflicts(**window)  # type: ignore[arg-type]
+
+    def get_reservation(self, reservation_id: str) -> Reservation:
+        self._ensure_fresh()
+        return super().get_reservation(reservation_id)
+
+    def list_matches(self, *, status: Optional[str] = None) -> List[MatchRecord]:
+        self._ensure_fresh()
+        return super().list_matches(status=status)
+
+    def recommend_events(self, *, participant_id: str, limit: int = 3) -> RecommendationResponse:
+        self._ensure_fresh()
+        return super().recommend_events(participant_id=participant_id, limit=limit)
+
+    def dashboard(self) -> DashboardMetrics:
+        self._ensure_fresh()
+        return super().dashboard()
+
+    def surface_blueprint(self) -> SurfaceBlueprint:
+        self._ensure_fresh()
+        return super().surface_blueprint()
+
+    def _expire_holds_before_read(self) -> None:
+        # the primary expires holds and streams the result
+        return None
+
+    # ------------------------------------------------------------------
+    # Writes go to the primary
+    # ------------------------------------------------------------------
+    def _read_only(self, *args: object, **kwargs: object) -> None:
+        raise RuntimeError("replicas are read-only; send writes to the primary service")
+
+    create_event = update_event = register_participant = cancel_registration = _read_only  # type: ignore[assignment]
+    record_feedback = create_match = update_match_status = configure_surface_blueprint = _read_only  # type: ignore[assignment]
+    create_events = register_participants = _read_only  # type: ignore[assignment]
+    reserve_seat = confirm_reservation = release_reservation = _read_only  # type: ignore[assignment]
+    expire_reservations = _read_only  # type: ignore[assignment]
+
+
+__all__ = ["ReplicaService"]
@@ -0,0 +1,104 @@
+"""Time-limited seat holds with heap-ordered expiry."""
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .models import Reservation
+
+HELD = "held"
+SETTLED_RETENTION = timedelta(hours=1)
+
+
+class ReservationBook:
+    """Active and settled holds plus a min-heap of pending expiries.
+
+    Settled holds leave their heap entry behind; it is discarded lazily when
+    it reaches the top, so placing or settling a hold costs O(log n) and an
+    expiry sweep only touches holds that are actually due. Settled holds stay
+    readable for ``retention`` and are then dropped, so the book only grows
+    with the holds that are live or recently settled.
+    """
+
+    def __init__(self, *, retention: timedelta = SETTLED_RETENTION) -> None:
+        self.retention = retention
+        self._holds: Dict[str, Reservation] = {}
+        self._active: Dict[Tuple[str, str], str] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+        # (settled at, reservation id) in settling order
+        self._settled: Deque[Tuple[datetime, str]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __iter__(self) -> Iterator[Reservation]:
+        return iter(list(self._holds.values()))
+
+    def get(self, reservation_id: str) -> Reservation:
+        try:
+            return self._holds[reservation_id]
+        except KeyError as exc:
+            raise KeyError(f"reservation {reservation_id} not found") from exc
+
+    def active_for(self, event_id: str, participant_id: str) -> Optional[Reservation]:
+        reservation_id = self._active.get((event_id, participant_id))
+        return None if reservation_id is None else self._holds[reservation_id]
+
+    def add(self, reservation: Reservation) -> None:
+        self._holds[reservation.id] = reservation
+        if reservation.status == HELD:
+            self._active[(reservation.event_id, reservation.participant_id)] = reservation.id
+            heapq.heappush(self._expiry, (reservation.expires_at, reservation.id))
+
+    def settle(self, reservation: Reservation, now: Optional[datetime] = None) -> None:
+        """Store a reservation that left the ``held`` state and drop holds settled long ago."""
+        now = now or datetime.now(timezone.utc)
+        self._holds[reservation.id] = reservation
+        key = (reservation.event_id, reservation.participant_id)
+        if self._active.get(key) == reservation.id:
+            del self._active[key]
+        self._settled.append((now, reservation.id))
+        self.prune(now)
+
+    def prune(self, now: datetime) -> int:
+        settled, cutoff, pruned = self._settled, now - self.retention, 0
+        while settled and settled[0][0] <= cutoff:
+            reservation_id = settled.popleft()[1]
+            reservation = self._holds.get(reservation_id)
+            if reservation is not None and reservation.status != HELD:
+                del self._holds[reservation_id]
+                pruned += 1
+        return pruned
+
+    def peek_expiry(self) -> Optional[datetime]:
+        """Earliest queued deadline without touching the heap; safe to call without the lock.
+
+        The entry may belong to a hold that was already settled, so a due
+        value means a sweep is worth taking the lock for, not that one expires.
+        """
+        try:
+            return self._expiry[0][0]
+        except IndexError:
+            return None
+
+    def next_expiry(self) -> Optional[datetime]:
+        while self._expiry and not self._is_held(self._expiry[0][1]):
+            heapq.heappop(self._expiry)
+        return self._expiry[0][0] if self._expiry else None
+
+    def pop_due(self, now: datetime) -> List[Reservation]:
+        due: List[Reservation] = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, reservation_id = heapq.heappop(self._expiry)
+            if self._is_held(reservation_id):
+                due.append(self._holds[reservation_id])
+        return due
+
+    def _is_held(self, reservation_id: str) -> bool:
+        reservation = self._holds.get(reservation_id)
+        return reservation is not None and reservation.status == HELD
+
+
+__all__ = ["HELD", "SETTLED_RETENTION", "ReservationBook"]
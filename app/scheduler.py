@@ -0,0 +1,363 @@
+"""Registration reminders on a hierarchical timer wheel with batched dispatch."""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import count
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, List, Optional, Protocol, Set, Tuple, Union
+
+from .models import Event, Registration
+from .service import ConnectHubService, utcnow
+from .storage import from_micros, to_micros
+
+WHEEL_BITS = 8
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4
+DEFAULT_OFFSETS: Tuple[Tuple[str, timedelta], ...] = (
+    ("T-24h", timedelta(hours=24)),
+    ("T-1h", timedelta(hours=1)),
+)
+DEFAULT_BATCH_SIZE = 500
+
+
+class Timer:
+    __slots__ = ("id", "tick", "payload", "level", "slot")
+
+    def __init__(self, timer_id: int, tick: int, payload: object) -> None:
+        self.id = timer_id
+        self.tick = tick
+        self.payload = payload
+        self.level = -1
+        self.slot = -1
+
+
+class TimerWheel:
+    """Hierarchical timing wheel over integer ticks.
+
+    A timer lives on the lowest level whose window it shares with the current
+    tick, so level 0 holds timers due within the current 256 ticks, level 1
+    those within the current 65 536, and so on. When the clock crosses a
+    window boundary the matching higher-level slot is cascaded down. Adding
+    and cancelling are O(1), and while level 0 is empty advancing jumps
+    straight to the next non-empty cascade, so its cost depends on the timers
+    that come due, never on how many are pending or how many ticks pass.
+    """
+
+    def __init__(self, start_tick: int = 0) -> None:
+        self.current = start_tick
+        self._levels: List[List[Dict[int, Timer]]] = [[{} for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)]
+        # timers beyond the top level's window, re-placed whenever that window rolls over
+        self._overflow: Dict[int, Timer] = {}
+        self._level_counts = [0] * (WHEEL_LEVELS + 1)
+        self._ids = count(1)
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def add(self, tick: int, payload: object) -> Timer:
+        timer = Timer(next(self._ids), max(tick, self.current + 1), payload)
+        self._place(timer)
+        self._pending += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        if timer.level < 0:
+            return False
+        del self._slot(timer.level, timer.slot)[timer.id]
+        self._level_counts[timer.level] -= 1
+        timer.level = timer.slot = -1
+        self._pending -= 1
+        return True
+
+    def advance(self, tick: int) -> List[Timer]:
+        """Move the clock to ``tick`` and return every timer due by then, in deadline order."""
+        due: List[Timer] = []
+        while self.current < tick:
+            if not self._pending:
+                self.current = tick
+                break
+            if not self._level_counts[0]:
+                # nothing on level 0: jump straight to the next cascade that brings timers down
+                wake = self._next_cascade()
+                if wake > tick:
+                    self.current = tick
+                    break
+                self.current = wake - 1
+            self.current += 1
+            if not self.current & WHEEL_MASK:
+                self._cascade()
+            slot = self._levels[0][self.current & WHEEL_MASK]
+            if slot:
+                expired = sorted(slot.values(), key=lambda timer: timer.id)
+                slot.clear()
+                self._level_counts[0] -= len(expired)
+                self._pending -= len(expired)
+                for timer in expired:
+                    timer.level = timer.slot = -1
+                due.extend(expired)
+        return due
+
+    def _cascade(self) -> None:
+        top = 1
+        while top < WHEEL_LEVELS and not (self.current >> (WHEEL_BITS * top)) & WHEEL_MASK:
+            top += 1
+        # higher levels first: their timers may land in a lower slot due this very tick
+        for level in range(top, 0, -1):
+            index = 0 if level == WHEEL_LEVELS else (self.current >> (WHEEL_BITS * level)) & WHEEL_MASK
+            slot = self._slot(level, index)
+            if not slot:
+                continue
+            moved = list(slot.values())
+            slot.clear()
+            self._level_counts[level] -= len(moved)
+            for timer in moved:
+                self._place(timer)
+
+    def _next_cascade(self) -> int:
+        """First future tick at which a non-empty higher-level slot cascades."""
+        wake = ((self.current >> (WHEEL_BITS * WHEEL_LEVELS)) + 1) << (WHEEL_BITS * WHEEL_LEVELS)
+        for level in range(1, WHEEL_LEVELS):
+            if not self._level_counts[level]:
+                continue
+            shift = WHEEL_BITS * level
+            slots = self._levels[level]
+            # occupied slots always lie after the clock's own index on their level
+            for index in range(((self.current >> shift) & WHEEL_MASK) + 1, WHEEL_SLOTS):
+                if slots[index]:
+                    window = (self.current >> (shift + WHEEL_BITS)) << (shift + WHEEL_BITS)
+                    wake = min(wake, window | (index << shift))
+                    break
+        return wake
+
+    def _place(self, timer: Timer) -> None:
+        # the lowest level whose window (all higher bits) the deadline shares with the clock
+        level, shift = 0, WHEEL_BITS
+        while level < WHEEL_LEVELS and timer.tick >> shift != self.current >> shift:
+            level, shift = level + 1, shift + WHEEL_BITS
+        index = 0 if level == WHEEL_LEVELS else (timer.tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+        timer.level, timer.slot = level, index
+        self._slot(level, index)[timer.id] = timer
+        self._level_counts[level] += 1
+
+    def _slot(self, level: int, index: int) -> Dict[int, Timer]:
+        return self._overflow if level == WHEEL_LEVELS else self._levels[level][index]
+
+
+@dataclass(slots=True)
+class Notification:
+    kind: str
+    registration_id: str
+    event_id: str
+    participant_id: str
+    event_name: str
+    start_at: datetime
+    due_at: datetime
+
+
+class NotificationSender(Protocol):
+    def send(self, notifications: List[Notification]) -> None: ...
+
+
+class JsonLinesSender:
+    """Stand-in sender writing one JSON object per notification to a stream or file."""
+
+    def __init__(self, target: Union[str, Path, IO[str], None] = None) -> None:
+        self._path = Path(target) if isinstance(target, (str, Path)) else None
+        self._stream = None if self._path is not None else (target or sys.stdout)
+        self.sent = 0
+
+    def send(self, notifications: List[Notification]) -> None:
+        lines = "".join(json.dumps(asdict(item), default=str, ensure_ascii=False) + "\n" for item in notifications)
+        if self._path is not None:
+            with self._path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+        else:
+            self._stream.write(lines)  # type: ignore[union-attr]
+            self._stream.flush()  # type: ignore[union-attr]
+        self.sent += len(notifications)
+
+
+class ReminderScheduler:
+    """Keeps reminders for every confirmed registration and sends them when due.
+
+    Reminders are (re)queued from the service's change feed: a confirmed
+    registration gets one timer per offset before its event's ``start_at``,
+    a cancellation drops them, and moving an event reschedules its
+    registrations. Offsets that are already in the past are skipped.
+    """
+
+    def __init__(
+        self,
+        service: ConnectHubService,
+        sender: NotificationSender,
+        *,
+        offsets: Iterable[Tuple[str, timedelta]] = DEFAULT_OFFSETS,
+        resolution: timedelta = timedelta(seconds=1),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        self.service = service
+        self.sender = sender
+        self.offsets = tuple(offsets)
+        self.batch_size = batch_size
+        self._clock = clock
+        self._resolution = max(1, int(resolution / timedelta(microseconds=1)))
+        self._wheel = TimerWheel(self._tick(clock()))
+        self._timers: Dict[str, List[Timer]] = {}
+        self._by_event: Dict[str, Set[str]] = {}
+        self._starts: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.dispatched = 0
+
+    @classmethod
+    def attach(cls, service: ConnectHubService, sender: NotificationSender, **options: object) -> "ReminderScheduler":
+        """Subscribe to ``service`` and queue reminders for registrations it already holds."""
+        scheduler = cls(service, sender, **options)  # type: ignore[arg-type]
+        with service._write_lock:
+            scheduler._unsubscribe = service.subscribe(scheduler.on_change)
+            for chunk in service._registrations.iter_chunks(10_000):
+                for record in chunk:
+                    scheduler.on_change("registration.created", record)
+        return scheduler
+
+    def detach(self) -> None:
+        self.stop()
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    # ------------------------------------------------------------------
+    # Change feed
+    # ------------------------------------------------------------------
+    def on_change(self, operation: str, record: object) -> None:
+        if isinstance(record, Registration) and operation.startswith("registration."):
+            with self._lock:
+                self._cancel(record.id)
+                if record.status == "confirmed":
+                    self._schedule(record.id, record.event_id, record.participant_id)
+        elif isinstance(record, Event) and operation == "event.updated":
+            with self._lock:
+                previous = self._starts.get(record.id)
+                self._starts[record.id] = record.start_at
+                if previous is None or previous == record.start_at:
+                    return
+            # rebuild from the confirmed registrations, not the pending timers:
+            # a postponed event can bring back reminders that had already lapsed
+            confirmed = self.service.list_registrations(event_id=record.id, status="confirmed")
+            with self._lock:
+                for registration_id in list(self._by_event.get(record.id, ())):
+                    self._cancel(registration_id)
+                for registration in confirmed:
+                    self._schedule(registration.id, record.id, registration.participant_id, start_at=record.start_at)
+
+    def _schedule(
+        self, registration_id: str, event_id: str, participant_id: str, *, start_at: Optional[datetime] = None
+    ) -> None:
+        if start_at is None:
+            start_at = self.service._events[event_id].start_at
+        self._starts[event_id] = start_at
+        timers = []
+        now_tick = self._wheel.current
+        for kind, offset in self.offsets:
+            tick = self._tick(start_at - offset)
+            if tick > now_tick:
+                timers.append(self._wheel.add(tick, (kind, event_id, participant_id, registration_id)))
+        if timers:
+            self._timers[registration_id] = timers
+            self._by_event.setdefault(event_id, set()).add(registration_id)
+
+    def _cancel(self, registration_id: str) -> None:
+        timers = self._timers.pop(registration_id, None)
+        if not timers:
+            return
+        for timer in timers:
+            self._wheel.cancel(timer)
+        event_id = timers[0].payload[1]  # type: ignore[index]
+        siblings = self._by_event.get(event_id)
+        if siblings is not None:
+            siblings.discard(registration_id)
+            if not siblings:
+                del self._by_event[event_id]
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def run_due(self, now: Optional[datetime] = None) -> int:
+        """Send every reminder due by ``now`` in batches; returns how many were sent."""
+        with self._lock:
+            due = self._wheel.advance(self._tick(now or self._clock()))
+            for timer in due:
+                registration_id = timer.payload[3]  # type: ignore[index]
+                remaining = [other for other in self._timers.get(registration_id, ()) if other.level >= 0]
+                if remaining:
+                    self._timers[registration_id] = remaining
+                else:
+                    self._cancel(registration_id)
+        sent = 0
+        for start in range(0, len(due), self.batch_size):
+            batch = [self._notification(timer) for timer in due[start : start + self.batch_size]]
+            batch = [item for item in batch if item is not None]
+            if batch:
+                self.sender.send(batch)
+                sent += len(batch)
+        self.dispatched += sent
+        return sent
+
+    def start(self, *, poll_interval: float = 1.0) -> None:
+        if self._worker is not None:
+            return
+        self._stopped.clear()
+
+        def loop() -> None:
+            while not self._stopped.wait(poll_interval):
+                self.run_due()
+
+        self._worker = threading.Thread(target=loop, name="connect-hub-reminders", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _notification(self, timer: Timer) -> Optional[Notification]:
+        kind, event_id, participant_id, registration_id = timer.payload  # type: ignore[misc]
+        event = self.service._events.get(event_id)
+        if event is None:
+            return None
+        return Notification(
+            kind=kind,
+            registration_id=registration_id,
+            event_id=event_id,
+            participant_id=participant_id,
+            event_name=event.name,
+            start_at=event.start_at,
+            due_at=from_micros(timer.tick * self._resolution),
+        )
+
+    def _tick(self, moment: datetime) -> int:
+        return to_micros(moment) // self._resolution
+
+
+__all__ = [
+    "JsonLinesSender",
+    "Notification",
+    "NotificationSender",
+    "ReminderScheduler",
+    "TimerWheel",
+]
@@ -0,0 +1,139 @@
+"""In-memory BM25 full-text index over event text, CJK-aware."""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_CJK_RUN = re.compile(f"[{_CJK}]+")
+_TOKEN_PATTERN = re.compile(f"[{_CJK}]+|[^\\W_{_CJK}]+")
+NAME_WEIGHT = 3
+TAG_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: Optional[str], *, unigrams: bool = False) -> List[str]:
+    """Latin/digit runs become lower-cased words; CJK runs become overlapping bigrams.
+
+    A CJK run of a single character is kept as a unigram. With ``unigrams``
+    every character of a longer run is emitted as well; the index does this
+    so one-character queries still match, while longer queries stay bigrams.
+    """
+    if not text:
+        return []
+    tokens: List[str] = []
+    for run in _TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if _CJK_RUN.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[idx : idx + 2] for idx in range(len(run) - 1))
+                if unigrams:
+                    tokens.extend(run)
+        else:
+            tokens.append(run)
+    return tokens
+
+
+class SearchIndex:
+    """Inverted index of weighted term frequencies, updated one document at a time.
+
+    Name tokens count ``NAME_WEIGHT`` times, tags ``TAG_WEIGHT`` and
+    description tokens once, which gives a simple field boost under BM25.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._slots: Dict[str, int] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_terms: List[Dict[str, int]] = []
+        self._doc_lengths: List[int] = []
+        self._free: List[int] = []
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, doc_id: str, *, name: str, tags: Iterable[str] = (), description: Optional[str] = None) -> None:
+        terms: Counter = Counter()
+        for token in tokenize(name, unigrams=True):
+            terms[token] += NAME_WEIGHT
+        for tag in tags:
+            for token in tokenize(tag, unigrams=True):
+                terms[token] += TAG_WEIGHT
+        for token in tokenize(description, unigrams=True):
+            terms[token] += DESCRIPTION_WEIGHT
+        with self._lock:
+            self._remove(doc_id)
+            slot = self._free.pop() if self._free else len(self._doc_ids)
+            if slot == len(self._doc_ids):
+                self._doc_ids.append(doc_id)
+                self._doc_terms.append({})
+                self._doc_lengths.append(0)
+            self._doc_ids[slot] = doc_id
+            self._doc_terms[slot] = dict(terms)
+            self._doc_lengths[slot] = sum(terms.values())
+            self._slots[doc_id] = slot
+            for token, frequency in terms.items():
+                self._postings.setdefault(token, {})[slot] = frequency
+            self._total_length += self._doc_lengths[slot]
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(self, query: str, *, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+        with self._lock:
+            count = len(self._slots)
+            if not count:
+                return []
+            average = self._total_length / count or 1.0
+            lengths = self._doc_lengths
+            # norm(slot) = base + per_length * length, hoisted out of the posting loop
+            base = BM25_K1 * (1 - BM25_B)
+            per_length = BM25_K1 * BM25_B / average
+            scores: Dict[int, float] = {}
+            score_of = scores.get
+            for token in tokens:
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                for slot, frequency in postings.items():
+                    norm = frequency + base + per_length * lengths[slot]
+                    scores[slot] = score_of(slot, 0.0) + weight * frequency / norm
+            top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            return [(self._doc_ids[slot], score) for slot, score in top]  # type: ignore[misc]
+
+    def _remove(self, doc_id: str) -> None:
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return
+        terms = self._doc_terms[slot]
+        for token in terms:
+            postings = self._postings[token]
+            del postings[slot]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._doc_lengths[slot]
+        self._doc_lengths[slot] = 0
+        self._doc_ids[slot] = None
+        self._doc_terms[slot] = {}
+        self._free.append(slot)
+
+
+__all__ = ["SearchIndex", "tokenize"]
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from collections import Counter
-from dataclasses import asdict, replace
+import heapq
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Iterable, List, Optional, Tuple
-from uuid import uuid4
+from functools import wraps
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from .models import (
     DashboardMetrics,
@@ -14,27 +20,186 @@ from .models import (
     Recommendation,
     RecommendationResponse,
     Registration,
+    RegistrationAttempt,
+    Reservation,
+    SearchHit,
     SurfaceBlueprint,
     SurfaceSection,
 )
+from .ids import IdGenerator, TimeOrderedIds
+from .intervals import IntervalTree
+from .mvcc import CopyOnWriteDict, FrozenView
+from .recommendations import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, RecommendationCache
+from .reservations import HELD, ReservationBook
+from .storage import RegistrationKeyIndex, RegistrationStore, to_micros
+from .tracing import record_scan
+from .vocabulary import TermIndex
 
+if TYPE_CHECKING:
+    from .search import SearchIndex
 
 UTC = timezone.utc
+UPCOMING_LIMIT = 5
+DEFAULT_HOLD_TTL = timedelta(minutes=10)
+CONFLICT_POLICIES = ("off", "warn", "reject")
+FULL_EVENT = "event is already at full capacity"
+ALREADY_REGISTERED = "participant already registered for event"
+EVENT_FINISHED = "cannot register for an event that has already finished"
+
+ChangeListener = Callable[[str, object], None]
+AttemptListener = Callable[[RegistrationAttempt], None]
+
+conflict_logger = logging.getLogger("app.conflicts")
+
+
+class RegistrationRejected(ValueError):
+    """A registration attempt refused for a reason listeners can branch on via ``code``."""
+
+    def __init__(self, message: str, code: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self) -> Tuple[type, Tuple[object, ...]]:
+        # process shards pickle errors back to the parent
+        return (RegistrationRejected, (str(self), self.code))
+
+
+class ScheduleConflict(RegistrationRejected):
+    """A registration or event window clashes with events in ``conflicts``."""
+
+    def __init__(self, message: str, conflicts: List[Event]) -> None:
+        super().__init__(message, "conflict")
+        self.conflicts = conflicts
+
+    def __reduce__(self) -> Tuple[type, Tuple[object, ...]]:
+        return (ScheduleConflict, (str(self), self.conflicts))
 
 
 def utcnow() -> datetime:
     return datetime.now(UTC)
 
 
+def recommendation_rank(event: Event) -> Tuple[float, datetime]:
+    return (event.seats_taken / event.capacity if event.capacity else 1.0, event.start_at)
+
+
+def _mutation(method: Callable) -> Callable:
+    """Serialize writers and publish a new snapshot when the outermost write commits.
+
+    Readers use the published copy-on-write views and never take the lock.
+    """
+
+    @wraps(method)
+    def wrapper(self: "ConnectHubService", *args: object, **kwargs: object) -> object:
+        with self._write_lock:
+            self._write_depth += 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._publish_snapshot()
+
+    return wrapper
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceSnapshot:
+    """Consistent, immutable view across collections at one point in time."""
+
+    versions: Tuple[int, ...]
+    events: FrozenView[Event]
+    feedback: FrozenView[Feedback]
+    matches: FrozenView[MatchRecord]
+    confirmed_registrations: int
+
+
+@dataclass(slots=True)
+class DashboardTotals:
+    """Mergeable dashboard aggregates for one service (or shard)."""
+
+    total_events: int
+    total_registrations: int
+    fill_rate_sum: float
+    fill_rate_count: int
+    category_counts: Counter
+    upcoming_events: List[Event]
+    matches_waiting_review: int
+
+
+def merge_dashboard(parts: Iterable[DashboardTotals]) -> DashboardMetrics:
+    parts = list(parts)
+    fill_rate_count = sum(part.fill_rate_count for part in parts)
+    average_fill_rate = 0.0
+    if fill_rate_count:
+        average_fill_rate = round(sum(part.fill_rate_sum for part in parts) / fill_rate_count, 3)
+    category_counter: Counter = Counter()
+    for part in parts:
+        category_counter.update(part.category_counts)
+    upcoming = heapq.merge(*(part.upcoming_events for part in parts), key=lambda evt: evt.start_at)
+    return DashboardMetrics(
+        total_events=sum(part.total_events for part in parts),
+        total_registrations=sum(part.total_registrations for part in parts),
+        average_fill_rate=average_fill_rate,
+        top_categories=[category for category, _ in category_counter.most_common(3)],
+        upcoming_events=list(islice(upcoming, UPCOMING_LIMIT)),
+        matches_waiting_review=sum(part.matches_waiting_review for part in parts),
+    )
+
+
 class ConnectHubService:
     """Domain service powering the Connect Hub MVP."""
 
-    def __init__(self) -> None:
-        self._events: Dict[str, Event] = {}
-        self._registrations: Dict[str, Registration] = {}
-        self._registration_index: Dict[Tuple[str, str], str] = {}
-        self._feedback: Dict[str, Feedback] = {}
-        self._matches: Dict[str, MatchRecord] = {}
+    def __init__(
+        self,
+        *,
+        schedule_policy: str = "warn",
+        venue_policy: str = "warn",
+        id_generator: Optional[IdGenerator] = None,
+        recommendation_cache_size: int = DEFAULT_MAX_ENTRIES,
+        recommendation_ttl: float = DEFAULT_TTL,
+    ) -> None:
+        for name, policy in (("schedule_policy", schedule_policy), ("venue_policy", venue_policy)):
+            if policy not in CONFLICT_POLICIES:
+                raise ValueError(f"{name} must be one of {', '.join(CONFLICT_POLICIES)}")
+        self.schedule_policy = schedule_policy
+        self.venue_policy = venue_policy
+        # time-ordered by default, so ids sort the way records were created
+        self._new_id: IdGenerator = id_generator or TimeOrderedIds()
+        self._events: CopyOnWriteDict[str, Event] = CopyOnWriteDict()
+        self._registrations = RegistrationStore()
+        self._registration_index: RegistrationKeyIndex = self._registrations.index
+        self._feedback: CopyOnWriteDict[str, Feedback] = CopyOnWriteDict()
+        self._matches: CopyOnWriteDict[str, MatchRecord] = CopyOnWriteDict()
+        # matches are kept in insertion order; this stays true while that is also created_at order
+        self._matches_in_order = True
+        self._latest_match: Optional[datetime] = None
+        self._categories = TermIndex()
+        self._modes = TermIndex()
+        self._tags = TermIndex()
+        # event id -> modification version, ordered oldest to newest change
+        self._event_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._event_version = 0
+        # append-only (versions, event ids) change log read lock-free; swapped for a compacted one
+        self._event_log: Tuple[array, List[str]] = (array("q"), [])
+        # built by the first search, so services that never search skip tokenizing every event
+        self._search: Optional["SearchIndex"] = None
+        # per-participant results; None when disabled with recommendation_cache_size=0
+        self.recommendation_cache: Optional[RecommendationCache] = None
+        if recommendation_cache_size > 0:
+            self.recommendation_cache = RecommendationCache(
+                max_entries=recommendation_cache_size, ttl=recommendation_ttl
+            )
+        # participant id -> confirmed event windows; venue key -> booked event windows
+        self._participant_schedules: Dict[str, IntervalTree[str]] = {}
+        self._venue_schedules: Dict[str, IntervalTree[str]] = {}
+        self._venue_of: Dict[str, str] = {}
+        self._reservations = ReservationBook()
+        self._listeners: List[ChangeListener] = []
+        self._attempt_listeners: List[AttemptListener] = []
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._snapshot = self._build_snapshot()
         self._surface_blueprint = SurfaceBlueprint(
             frontend=SurfaceSection(title="前台介面", summary="", features=[]),
             backend=SurfaceSection(title="後台介面", summary="", features=[]),
@@ -43,6 +208,7 @@ class ConnectHubService:
     # ------------------------------------------------------------------
     # Event operations
     # ------------------------------------------------------------------
+    @_mutation
     def create_event(
         self,
         *,
@@ -55,13 +221,17 @@ class ConnectHubService:
         location: Optional[str] = None,
         tags: Optional[Iterable[str]] = None,
         description: Optional[str] = None,
+        event_id: Optional[str] = None,
     ) -> Event:
         self._validate_event_window(start_at, end_at)
         self._ensure_timezone(start_at, "start_at")
         self._ensure_timezone(end_at, "end_at")
         if capacity <= 0:
             raise ValueError("capacity must be greater than zero")
-        event_id = str(uuid4())
+        if event_id is None:
+            event_id = self._new_id()
+        elif event_id in self._events:
+            raise ValueError(f"event {event_id} already exists")
         event = Event(
             id=event_id,
             name=name,
@@ -74,9 +244,23 @@ class ConnectHubService:
             tags=list(tags or []),
             description=description,
         )
-        self._events[event_id] = event
+        self._check_venue(event)
+        self._store_event(event)
+        self._publish("event.created", event)
         return event
 
+    @_mutation
+    def create_events(self, payloads: Iterable[Dict[str, object]]) -> List[Union[Event, Exception]]:
+        """Create a batch of events under one lock; each failure is returned in place of its event."""
+        results: List[Union[Event, Exception]] = []
+        for payload in payloads:
+            try:
+                results.append(ConnectHubService.create_event(self, **payload))  # type: ignore[arg-type]
+            except (TypeError, ValueError) as exc:
+                results.append(exc)
+        return results
+
+    @_mutation
     def update_event(self, event_id: str, **updates: object) -> Event:
         event = self._get_event(event_id)
         data = asdict(event)
@@ -94,7 +278,9 @@ class ConnectHubService:
             if capacity < event.seats_taken:
                 raise ValueError("capacity cannot be lower than current registrations")
         updated = Event(**data)  # type: ignore[arg-type]
-        self._events[event_id] = updated
+        self._check_venue(updated)
+        self._store_event(updated)
+        self._publish("event.updated", updated)
         return updated
 
     def list_events(
@@ -104,43 +290,100 @@ class ConnectHubService:
         mode: Optional[str] = None,
         tag: Optional[str] = None,
     ) -> List[Event]:
-        events = list(self._events.values())
-        if category:
-            events = [evt for evt in events if evt.category == category]
-        if mode:
-            events = [evt for evt in events if evt.mode == mode]
-        if tag:
-            events = [evt for evt in events if tag in evt.tags]
+        self._expire_holds_before_read()
+        if category or mode or tag:
+            events, scanned = self._filter_events(category=category, mode=mode, tag=tag)
+        else:
+            events = self._events.values()
+            scanned = len(events)
+        record_scan("list_events", scanned=scanned, returned=len(events), sorted_items=len(events))
         return sorted(events, key=lambda evt: evt.start_at)
 
     def get_event(self, event_id: str) -> Event:
+        self._expire_holds_before_read()
         return self._get_event(event_id)
 
+    def canonical_category(self, name: str) -> str:
+        """The interned spelling of category ``name``, or ``name`` itself if no event uses it yet."""
+        vocabulary = self._categories.vocabulary
+        term_id = vocabulary.lookup(name)
+        return name if term_id is None else vocabulary.term(term_id)
+
+    def search_events(self, query: str, *, limit: int = 10) -> List[SearchHit]:
+        """Rank events against ``query`` by BM25 over names, tags and descriptions."""
+        self._expire_holds_before_read()
+        index = self._search or self._build_search_index()
+        hits = index.search(query, limit=limit)
+        results = [SearchHit(event=self._events[event_id], score=score) for event_id, score in hits]
+        record_scan("search_events", scanned=len(hits), returned=len(results))
+        return results
+
+    def events_changed_since(self, since: int = 0) -> Tuple[int, List[Event]]:
+        """Return the current event version and the events modified after ``since``.
+
+        Cost is proportional to the number of changes since ``since``, not the
+        number of events, and readers never take the write lock.
+        """
+        self._expire_holds_before_read()
+        versions, event_ids = self._event_log
+        # ids are appended after their versions, so this many entries are complete
+        count = len(event_ids)
+        if not count:
+            return 0, []
+        seen: Set[str] = set()
+        changed: List[Event] = []
+        for position in range(count - 1, bisect_right(versions, since, 0, count) - 1, -1):
+            event_id = event_ids[position]
+            if event_id not in seen:
+                seen.add(event_id)
+                changed.append(self._events[event_id])
+        changed.reverse()
+        return versions[count - 1], changed
+
     # ------------------------------------------------------------------
     # Registration operations
     # ------------------------------------------------------------------
+    @_mutation
     def register_participant(self, *, event_id: str, participant_id: str) -> Registration:
+        if not self._attempt_listeners:
+            return self._register(event_id, participant_id)
+        try:
+            record = self._register(event_id, participant_id)
+        except (KeyError, ValueError) as exc:
+            self._notify_attempt(event_id, participant_id, self._attempt_outcome(exc))
+            raise
+        self._notify_attempt(event_id, participant_id, "confirmed")
+        return record
+
+    def _register(self, event_id: str, participant_id: str) -> Registration:
+        self._expire_due(utcnow())
+        hold = self._reservations.active_for(event_id, participant_id)
+        if hold is not None:
+            return self._confirm(hold)
         event = self._get_event(event_id)
         if not event.has_available_seats():
-            raise ValueError("event is already at full capacity")
+            raise RegistrationRejected(FULL_EVENT, "full")
         if not participant_id:
             raise ValueError("participant_id is required")
         if event.end_at <= utcnow():
-            raise ValueError("cannot register for an event that has already finished")
+            raise RegistrationRejected(EVENT_FINISHED, "finished")
 
         key = (event_id, participant_id)
         now = utcnow()
-        if key in self._registration_index:
-            existing_id = self._registration_index[key]
+        existing_id = self._registration_index.get(key)
+        if existing_id is not None and self._registrations[existing_id].status != "cancelled":
+            raise RegistrationRejected(ALREADY_REGISTERED, "duplicate")
+        if self.schedule_policy != "off":
+            self._check_schedule(participant_id, event)
+        if existing_id is not None:
             existing = self._registrations[existing_id]
-            if existing.status != "cancelled":
-                raise ValueError("participant already registered for event")
             revived = replace(existing, status="confirmed", cancelled_at=None, registered_at=now)
-            self._registrations[existing_id] = revived
-            self._events[event_id] = replace(event, seats_taken=event.seats_taken + 1)
+            self._store_registration(revived)
+            self._publish("registration.updated", revived)
+            self._set_seats_taken(event, event.seats_taken + 1)
             return revived
 
-        registration_id = str(uuid4())
+        registration_id = self._new_id()
         record = Registration(
             id=registration_id,
             event_id=event_id,
@@ -148,24 +391,40 @@ class ConnectHubService:
             status="confirmed",
             registered_at=now,
         )
-        self._registrations[registration_id] = record
+        self._store_registration(record)
         self._registration_index[key] = registration_id
-        self._events[event_id] = replace(event, seats_taken=event.seats_taken + 1)
+        self._publish("registration.created", record)
+        self._set_seats_taken(event, event.seats_taken + 1)
         return record
 
+    @_mutation
+    def register_participants(self, pairs: Iterable[Tuple[str, str]]) -> List[Union[Registration, Exception]]:
+        """Register ``(event_id, participant_id)`` pairs under one lock; failures are returned in place."""
+        results: List[Union[Registration, Exception]] = []
+        for event_id, participant_id in pairs:
+            try:
+                results.append(
+                    ConnectHubService.register_participant(self, event_id=event_id, participant_id=participant_id)
+                )
+            except (KeyError, ValueError) as exc:
+                results.append(exc)
+        return results
+
+    @_mutation
     def cancel_registration(self, registration_id: str) -> Registration:
         registration = self._get_registration(registration_id)
         if registration.status == "cancelled":
             return registration
 
         updated = replace(registration, status="cancelled", cancelled_at=utcnow())
-        self._registrations[registration_id] = updated
+        self._store_registration(updated)
         key = (registration.event_id, registration.participant_id)
         self._registration_index[key] = registration_id
+        self._publish("registration.updated", updated)
 
         event = self._get_event(registration.event_id)
         if event.seats_taken > 0:
-            self._events[event.id] = replace(event, seats_taken=event.seats_taken - 1)
+            self._set_seats_taken(event, event.seats_taken - 1)
         return updated
 
     def list_registrations(
@@ -175,18 +434,117 @@ class ConnectHubService:
         participant_id: Optional[str] = None,
         status: Optional[str] = None,
     ) -> List[Registration]:
-        records = list(self._registrations.values())
-        if event_id:
-            records = [record for record in records if record.event_id == event_id]
-        if participant_id:
-            records = [record for record in records if record.participant_id == participant_id]
-        if status:
-            records = [record for record in records if record.status == status]
-        return sorted(records, key=lambda record: record.registered_at)
+        # the columns are updated in place and compaction renumbers rows, so scans hold the lock
+        with self._write_lock:
+            records = self._registrations.select(event_id=event_id, participant_id=participant_id, status=status)
+            # rows are appended in registered_at order unless an out-of-order write was ever stored
+            in_order = self._registrations.time_ordered
+        record_scan(
+            "list_registrations",
+            scanned=len(self._registrations),
+            returned=len(records),
+            sorted_items=0 if in_order else len(records),
+        )
+        return records if in_order else sorted(records, key=lambda record: record.registered_at)
+
+    # ------------------------------------------------------------------
+    # Schedule conflicts
+    # ------------------------------------------------------------------
+    def schedule_conflicts(self, *, participant_id: str, event_id: str) -> List[Event]:
+        """Confirmed events of ``participant_id`` whose time window overlaps ``event_id``."""
+        event = self._get_event(event_id)
+        tree = self._participant_schedules.get(participant_id)
+        if tree is None:
+            return []
+        clashes = tree.overlapping(to_micros(event.start_at), to_micros(event.end_at))
+        return [self._events[other] for other in clashes if other != event_id]
+
+    def venue_conflicts(
+        self,
+        *,
+        location: str,
+        start_at: datetime,
+        end_at: datetime,
+        exclude: Optional[str] = None,
+    ) -> List[Event]:
+        """In-person events booked at ``location`` during ``[start_at, end_at)``."""
+        tree = self._venue_schedules.get(self._venue_key(location))
+        if tree is None:
+            return []
+        clashes = tree.overlapping(to_micros(start_at), to_micros(end_at))
+        return [self._events[other] for other in clashes if other != exclude]
+
+    # ------------------------------------------------------------------
+    # Reservation operations
+    # ------------------------------------------------------------------
+    @_mutation
+    def reserve_seat(
+        self,
+        *,
+        event_id: str,
+        participant_id: str,
+        ttl: timedelta = DEFAULT_HOLD_TTL,
+    ) -> Reservation:
+        """Hold a seat for ``ttl``; it counts towards ``seats_taken`` until settled."""
+        self._expire_due(utcnow())
+        if ttl <= timedelta(0):
+            raise ValueError("ttl must be positive")
+        event = self._get_event(event_id)
+        if not event.has_available_seats():
+            raise RegistrationRejected(FULL_EVENT, "full")
+        if not participant_id:
+            raise ValueError("participant_id is required")
+        now = utcnow()
+        if event.end_at <= now:
+            raise RegistrationRejected(EVENT_FINISHED, "finished")
+        if self._reservations.active_for(event_id, participant_id) is not None:
+            raise ValueError("participant already holds a reservation for event")
+        existing_id = self._registration_index.get((event_id, participant_id))
+        if existing_id is not None and self._registrations[existing_id].status != "cancelled":
+            raise RegistrationRejected(ALREADY_REGISTERED, "duplicate")
+
+        reservation = Reservation(
+            id=self._new_id(),
+            event_id=event_id,
+            participant_id=participant_id,
+            status=HELD,
+            held_at=now,
+            expires_at=now + ttl,
+        )
+        self._reservations.add(reservation)
+        self._publish("reservation.created", reservation)
+        self._set_seats_taken(event, event.seats_taken + 1)
+        return reservation
+
+    @_mutation
+    def confirm_reservation(self, reservation_id: str) -> Registration:
+        self._expire_due(utcnow())
+        reservation = self._reservations.get(reservation_id)
+        if reservation.status != HELD:
+            raise ValueError(f"reservation is {reservation.status}, not held")
+        return self._confirm(reservation)
+
+    @_mutation
+    def release_reservation(self, reservation_id: str) -> Reservation:
+        reservation = self._reservations.get(reservation_id)
+        if reservation.status != HELD:
+            return reservation
+        released = self._settle_reservation(reservation, "released")
+        self._publish("reservation.updated", released)
+        return released
+
+    @_mutation
+    def expire_reservations(self, now: Optional[datetime] = None) -> List[Reservation]:
+        return self._expire_due(now or utcnow())
+
+    def get_reservation(self, reservation_id: str) -> Reservation:
+        self._expire_holds_before_read()
+        return self._reservations.get(reservation_id)
 
     # ------------------------------------------------------------------
     # Feedback operations
     # ------------------------------------------------------------------
+    @_mutation
     def record_feedback(
         self,
         *,
@@ -198,7 +556,7 @@ class ConnectHubService:
         if not 1 <= score <= 5:
             raise ValueError("score must be between 1 and 5")
         self._get_event(event_id)
-        feedback_id = str(uuid4())
+        feedback_id = self._new_id()
         feedback = Feedback(
             id=feedback_id,
             event_id=event_id,
@@ -208,11 +566,13 @@ class ConnectHubService:
             submitted_at=utcnow(),
         )
         self._feedback[feedback_id] = feedback
+        self._publish("feedback.created", feedback)
         return feedback
 
     # ------------------------------------------------------------------
     # Matchmaking operations
     # ------------------------------------------------------------------
+    @_mutation
     def create_match(
         self,
         *,
@@ -223,7 +583,7 @@ class ConnectHubService:
     ) -> MatchRecord:
         if not 0 <= recommended_score <= 1:
             raise ValueError("recommended_score must be between 0 and 1")
-        match_id = str(uuid4())
+        match_id = self._new_id()
         record = MatchRecord(
             id=match_id,
             opportunity_id=opportunity_id,
@@ -233,15 +593,21 @@ class ConnectHubService:
             status="pending",
             created_at=utcnow(),
         )
-        self._matches[match_id] = record
+        self._store_match(record)
+        self._publish("match.created", record)
         return record
 
     def list_matches(self, *, status: Optional[str] = None) -> List[MatchRecord]:
-        matches = list(self._matches.values())
+        matches = self._matches.values()
         if status:
             matches = [match for match in matches if match.status == status]
+        if self._matches_in_order:
+            record_scan("list_matches", scanned=len(self._matches), returned=len(matches), sorted_items=0)
+            return list(reversed(matches))
+        record_scan("list_matches", scanned=len(self._matches), returned=len(matches), sorted_items=len(matches))
         return sorted(matches, key=lambda match: match.created_at, reverse=True)
 
+    @_mutation
     def update_match_status(
         self, match_id: str, *, status: str, notes: Optional[str] = None
     ) -> MatchRecord:
@@ -250,59 +616,111 @@ class ConnectHubService:
             raise ValueError("invalid match status")
         match = self._get_match(match_id)
         updated_notes = match.notes if notes is None else notes
-        updated = replace(match, status=status, notes=updated_notes)
-        self._matches[match_id] = updated
+        approved = status == "approved" and match.status != "approved"
+        approved_at = utcnow() if approved else match.approved_at
+        updated = replace(match, status=status, notes=updated_notes, approved_at=approved_at)
+        self._store_match(updated)
+        self._publish("match.approved" if approved else "match.updated", updated)
         return updated
 
     # ------------------------------------------------------------------
     # Insights
     # ------------------------------------------------------------------
     def recommend_events(self, *, participant_id: str, limit: int = 3) -> RecommendationResponse:
+        self._expire_holds_before_read()
+        cache = self.recommendation_cache
+        if cache is None:
+            return self._recommendation_response(participant_id, self._recommendation_candidates(limit))
+        cached = cache.get(participant_id, limit, utcnow())
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        top = self._recommendation_candidates(limit)
+        response = self._recommendation_response(participant_id, top)
+        cache.put(participant_id, limit, response, top, [recommendation_rank(event) for event in top], generation)
+        return response
+
+    def _recommendation_response(self, participant_id: str, top: List[Event]) -> RecommendationResponse:
+        recommendations = [
+            Recommendation(event_id=event.id, reason=self._build_reason(event))
+            for event in top
+        ]
+        return RecommendationResponse(participant_id=participant_id, recommendations=recommendations)
+
+    def _recommendation_candidates(self, limit: int) -> List[Event]:
+        self._expire_holds_before_read()
         now = utcnow()
         candidates = [
             event
             for event in self._events.values()
             if event.end_at >= now and event.has_available_seats()
         ]
-        candidates.sort(key=lambda evt: (evt.seats_taken / evt.capacity if evt.capacity else 1.0, evt.start_at))
+        candidates.sort(key=recommendation_rank)
         top = candidates[:limit]
-        recommendations = [
-            Recommendation(event_id=event.id, reason=self._build_reason(event))
-            for event in top
-        ]
-        return RecommendationResponse(participant_id=participant_id, recommendations=recommendations)
+        record_scan("recommend_events", scanned=len(self._events), returned=len(top), sorted_items=len(candidates))
+        return top
 
     def dashboard(self) -> DashboardMetrics:
-        total_events = len(self._events)
-        total_registrations = sum(
-            1 for registration in self._registrations.values() if registration.status == "confirmed"
+        return merge_dashboard([self._dashboard_totals()])
+
+    def snapshot(self) -> ServiceSnapshot:
+        """Return the view published by the last committed write."""
+        self._expire_holds_before_read()
+        snapshot = self._snapshot
+        if snapshot.versions != self._collection_versions() and not self._write_depth:
+            # state loaded outside a mutation (snapshot restore, replica apply)
+            snapshot = self._publish_snapshot()
+        return snapshot
+
+    def _publish_snapshot(self) -> ServiceSnapshot:
+        snapshot = self._snapshot = self._build_snapshot()
+        return snapshot
+
+    def _build_snapshot(self) -> ServiceSnapshot:
+        # every part is an already-published immutable view, so this is O(1)
+        return ServiceSnapshot(
+            versions=self._collection_versions(),
+            events=self._events.values(),
+            feedback=self._feedback.values(),
+            matches=self._matches.values(),
+            confirmed_registrations=self._registrations.count_status("confirmed"),
         )
-        average_fill_rate = 0.0
-        if total_events:
-            fill_rates = [event.seats_taken / event.capacity for event in self._events.values() if event.capacity]
-            if fill_rates:
-                average_fill_rate = round(sum(fill_rates) / len(fill_rates), 3)
 
-        category_counter = Counter(event.category for event in self._events.values())
-        top_categories = [category for category, _ in category_counter.most_common(3)]
+    def _collection_versions(self) -> Tuple[int, ...]:
+        return (self._events.version, self._feedback.version, self._matches.version, self._registrations.version)
 
-        upcoming = [event for event in self._events.values() if event.start_at >= utcnow()]
-        upcoming.sort(key=lambda evt: evt.start_at)
+    def _dashboard_totals(self) -> DashboardTotals:
+        snapshot = self.snapshot()
+        events = snapshot.events
+        total_events = len(events)
+        fill_rates = [event.seats_taken / event.capacity for event in events if event.capacity]
+        category_counter = Counter(event.category for event in events)
 
-        pending_matches = sum(1 for match in self._matches.values() if match.status == "pending")
+        now = utcnow()
+        upcoming = [event for event in events if event.start_at >= now]
+        upcoming.sort(key=lambda evt: evt.start_at)
 
-        return DashboardMetrics(
+        pending_matches = sum(1 for match in snapshot.matches if match.status == "pending")
+        record_scan(
+            "dashboard",
+            scanned=4 * total_events + len(snapshot.matches),
+            returned=min(len(upcoming), UPCOMING_LIMIT),
+            sorted_items=len(upcoming),
+        )
+        return DashboardTotals(
             total_events=total_events,
-            total_registrations=total_registrations,
-            average_fill_rate=average_fill_rate,
-            top_categories=top_categories,
-            upcoming_events=upcoming[:5],
+            total_registrations=snapshot.confirmed_registrations,
+            fill_rate_sum=sum(fill_rates),
+            fill_rate_count=len(fill_rates),
+            category_counts=category_counter,
+            upcoming_events=upcoming[:UPCOMING_LIMIT],
             matches_waiting_review=pending_matches,
         )
 
     # ------------------------------------------------------------------
     # Experience blueprint
     # ------------------------------------------------------------------
+    @_mutation
     def configure_surface_blueprint(
         self,
         *,
@@ -310,14 +728,255 @@ class ConnectHubService:
         backend: SurfaceSection,
     ) -> SurfaceBlueprint:
         self._surface_blueprint = SurfaceBlueprint(frontend=frontend, backend=backend)
+        self._publish("blueprint.updated", self._surface_blueprint)
         return self._surface_blueprint
 
     def surface_blueprint(self) -> SurfaceBlueprint:
         return self._surface_blueprint
 
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+    def subscribe(self, listener: ChangeListener) -> Callable[[], None]:
+        """Call ``listener(operation, record)`` after every committed mutation."""
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(self, operation: str, record: object) -> None:
+        for listener in self._listeners:
+            listener(operation, record)
+
+    def watch_attempts(self, listener: AttemptListener) -> Callable[[], None]:
+        """Call ``listener(attempt)`` for every ``register_participant`` call, failed or not.
+
+        Listeners run under the write lock, so they should only enqueue.
+        """
+        self._attempt_listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._attempt_listeners:
+                self._attempt_listeners.remove(listener)
+
+        return unsubscribe
+
+    def _notify_attempt(self, event_id: str, participant_id: str, outcome: str) -> None:
+        attempt = RegistrationAttempt(event_id=event_id, participant_id=participant_id, outcome=outcome, at=utcnow())
+        for listener in self._attempt_listeners:
+            listener(attempt)
+
+    @staticmethod
+    def _attempt_outcome(exc: Exception) -> str:
+        if isinstance(exc, RegistrationRejected):
+            return exc.code
+        if isinstance(exc, KeyError):
+            return "unknown_event"
+        return "invalid"
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _confirm(self, reservation: Reservation) -> Registration:
+        # hand the held seat back and take it again as a registration under the same lock
+        released = self._settle_reservation(reservation, "released")
+        try:
+            registration = self._register(reservation.event_id, reservation.participant_id)
+        except ValueError:
+            self._publish("reservation.updated", released)
+            raise
+        confirmed = replace(released, status="confirmed", registration_id=registration.id)
+        self._reservations.settle(confirmed)
+        self._publish("reservation.updated", confirmed)
+        return registration
+
+    def _expire_holds_before_read(self) -> None:
+        """Release holds that ran out before a read counts their seats.
+
+        The check is one heap peek; the write lock is only taken when a hold
+        may actually be due, so quiet events never report expired holds as
+        taken and reads stay lock-free otherwise.
+        """
+        deadline = self._reservations.peek_expiry()
+        if deadline is not None and deadline <= utcnow():
+            self.expire_reservations()
+
+    def _expire_due(self, now: datetime) -> List[Reservation]:
+        due = self._reservations.pop_due(now)
+        expired = [self._settle_reservation(reservation, "expired", now) for reservation in due]
+        self._reservations.prune(now)
+        for reservation in expired:
+            self._publish("reservation.updated", reservation)
+        return expired
+
+    def _settle_reservation(self, reservation: Reservation, status: str, now: Optional[datetime] = None) -> Reservation:
+        settled = replace(reservation, status=status)
+        self._reservations.settle(settled, now)
+        event = self._events.get(reservation.event_id)
+        if event is not None and event.seats_taken > 0:
+            self._set_seats_taken(event, event.seats_taken - 1)
+        return settled
+
+    def _set_seats_taken(self, event: Event, seats_taken: int) -> Event:
+        updated = replace(event, seats_taken=seats_taken)
+        self._events[event.id] = updated
+        self._touch_event(event.id)
+        self._publish("event.updated", updated)
+        return updated
+
+    def _store_event(self, event: Event) -> Event:
+        event.category = self._categories.canonical(event.category)
+        event.mode = self._modes.canonical(event.mode)
+        event.tags = [self._tags.canonical(tag) for tag in event.tags]
+        previous = self._events.get(event.id)
+        self._events[event.id] = event
+        self._categories.update(event.id, [previous.category] if previous else (), [event.category])
+        self._modes.update(event.id, [previous.mode] if previous else (), [event.mode])
+        self._tags.update(event.id, previous.tags if previous else (), event.tags)
+        self._touch_event(event.id)
+        self._index_venue(event)
+        if previous is not None and (previous.start_at, previous.end_at) != (event.start_at, event.end_at):
+            self._reschedule_attendees(event)
+        if self._search is not None:
+            self._search.add(event.id, name=event.name, tags=event.tags, description=event.description)
+        return event
+
+    def _build_search_index(self) -> "SearchIndex":
+        from .search import SearchIndex
+
+        with self._write_lock:
+            if self._search is None:
+                index = SearchIndex()
+                for event in self._events.values():
+                    index.add(event.id, name=event.name, tags=event.tags, description=event.description)
+                self._search = index
+            return self._search
+
+    def _check_schedule(self, participant_id: str, event: Event) -> None:
+        tree = self._participant_schedules.get(participant_id)
+        if tree is None:
+            return
+        clashes = tree.overlapping(to_micros(event.start_at), to_micros(event.end_at))
+        if not clashes:
+            return
+        conflicts = [self._events[other] for other in clashes]
+        message = f"participant {participant_id} is already booked for {', '.join(clashes)} at that time"
+        if self.schedule_policy == "reject":
+            raise ScheduleConflict(message, conflicts)
+        conflict_logger.warning("%s (event %s)", message, event.id)
+
+    def _check_venue(self, event: Event) -> None:
+        if self.venue_policy == "off" or not self._is_in_person(event):
+            return
+        conflicts = self.venue_conflicts(
+            location=event.location,  # type: ignore[arg-type]
+            start_at=event.start_at,
+            end_at=event.end_at,
+            exclude=event.id,
+        )
+        if not conflicts:
+            return
+        names = ", ".join(other.id for other in conflicts)
+        message = f"{event.location} is already booked for {names} at that time"
+        if self.venue_policy == "reject":
+            raise ScheduleConflict(message, conflicts)
+        conflict_logger.warning("%s (event %s)", message, event.id)
+
+    def _index_venue(self, event: Event) -> None:
+        previous = self._venue_of.pop(event.id, None)
+        if previous is not None:
+            self._venue_schedules[previous].remove(event.id)
+        if self._is_in_person(event):
+            key = self._venue_key(event.location)  # type: ignore[arg-type]
+            tree = self._venue_schedules.setdefault(key, IntervalTree())
+            tree.add(event.id, to_micros(event.start_at), to_micros(event.end_at))
+            self._venue_of[event.id] = key
+
+    def _store_registration(self, record: Registration) -> None:
+        """Write a registration and keep its participant's schedule and cached picks in step."""
+        self._registrations[record.id] = record
+        if self.recommendation_cache is not None:
+            self.recommendation_cache.participant_changed(record.participant_id)
+        tree = self._participant_schedules.get(record.participant_id)
+        if record.status == "confirmed":
+            event = self._events.get(record.event_id)
+            if event is None:
+                return
+            if tree is None:
+                tree = self._participant_schedules[record.participant_id] = IntervalTree()
+            tree.add(record.event_id, to_micros(event.start_at), to_micros(event.end_at))
+        elif tree is not None:
+            tree.remove(record.event_id)
+
+    def _store_match(self, record: MatchRecord) -> None:
+        if record.id not in self._matches:
+            if self._latest_match is not None and record.created_at < self._latest_match:
+                self._matches_in_order = False
+            else:
+                self._latest_match = record.created_at
+        self._matches[record.id] = record
+
+    def _reschedule_attendees(self, event: Event) -> None:
+        start, end = to_micros(event.start_at), to_micros(event.end_at)
+        with self._write_lock:
+            confirmed = self._registrations.select(event_id=event.id, status="confirmed")
+        for record in confirmed:
+            tree = self._participant_schedules.get(record.participant_id)
+            if tree is not None and record.event_id in tree:
+                tree.add(record.event_id, start, end)
+
+    @staticmethod
+    def _is_in_person(event: Event) -> bool:
+        return bool(event.location and event.location.strip()) and event.mode.casefold() != "online"
+
+    @staticmethod
+    def _venue_key(location: str) -> str:
+        return " ".join(location.split()).casefold()
+
+    def _touch_event(self, event_id: str) -> None:
+        self._event_version += 1
+        self._event_versions.pop(event_id, None)
+        self._event_versions[event_id] = self._event_version
+        versions, event_ids = self._event_log
+        if len(event_ids) > 2 * len(self._event_versions) + 1_024:
+            # drop superseded entries; readers holding the old log still see a valid prefix
+            self._event_log = (array("q", self._event_versions.values()), list(self._event_versions))
+        else:
+            versions.append(self._event_version)
+            event_ids.append(event_id)
+        cache = self.recommendation_cache
+        if cache is not None:
+            event = self._events.get(event_id)
+            eligible = event is not None and event.has_available_seats() and event.end_at >= utcnow()
+            cache.event_changed(event_id, recommendation_rank(event) if eligible else None)  # type: ignore[arg-type]
+
+    def _filter_events(
+        self,
+        *,
+        category: Optional[str],
+        mode: Optional[str],
+        tag: Optional[str],
+    ) -> Tuple[List[Event], int]:
+        """Events carrying every given term, and how many candidates were checked."""
+        postings = [
+            index.members(term)
+            for index, term in ((self._categories, category), (self._modes, mode), (self._tags, tag))
+            if term
+        ]
+        postings.sort(key=len)
+        # snapshot the smallest posting set; writers may add to it while we read
+        candidates, rest = tuple(postings[0]), postings[1:]
+        events = self._events
+        matched = [
+            events[event_id]
+            for event_id in candidates
+            if all(event_id in members for members in rest) and event_id in events
+        ]
+        return matched, len(candidates)
+
     def _get_event(self, event_id: str) -> Event:
         try:
             return self._events[event_id]
@@ -370,4 +1029,14 @@ def reset_service(*, seed_events: Optional[Iterable[dict]] = None) -> None:
             service.create_event(**payload)
 
 
-__all__ = ["service", "ConnectHubService", "reset_service", "utcnow"]
+__all__ = [
+    "service",
+    "ConnectHubService",
+    "DashboardTotals",
+    "RegistrationRejected",
+    "ScheduleConflict",
+    "ServiceSnapshot",
+    "merge_dashboard",
+    "reset_service",
+    "utcnow",
+]
@@ -0,0 +1,248 @@
+"""Hash-partitioned facade over several independent ``ConnectHubService`` shards."""
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import threading
+import zlib
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from .ids import NODE_BITS, IdGenerator, TimeOrderedIds, ulid_node
+from .models import (
+    DashboardMetrics,
+    Event,
+    Feedback,
+    MatchRecord,
+    Recommendation,
+    RecommendationResponse,
+    Registration,
+)
+from .service import ConnectHubService, merge_dashboard, recommendation_rank
+
+Reply = Callable[[], object]
+
+
+class LocalShard:
+    """Shard living in the calling process, serialized by its own lock."""
+
+    def __init__(self, service: Optional[ConnectHubService] = None) -> None:
+        self.service = service or ConnectHubService()
+        self._lock = threading.Lock()
+
+    def submit(self, method: str, *args: object, **kwargs: object) -> Reply:
+        with self._lock:
+            value = getattr(self.service, method)(*args, **kwargs)
+        return lambda: value
+
+    def close(self) -> None:
+        return None
+
+
+def _serve_shard(conn: object, node: int) -> None:  # pragma: no cover - runs in the worker process
+    service = ConnectHubService(id_generator=TimeOrderedIds(node=node))
+    while True:
+        message = conn.recv()  # type: ignore[attr-defined]
+        if message is None:
+            break
+        method, args, kwargs = message
+        try:
+            conn.send((True, getattr(service, method)(*args, **kwargs)))  # type: ignore[attr-defined]
+        except Exception as exc:
+            conn.send((False, exc))  # type: ignore[attr-defined]
+
+
+class ProcessShard:
+    """Shard owned by a worker process and driven over a pipe.
+
+    ``submit`` sends the call immediately and returns a reply handle, so a
+    scatter to several process shards runs them in parallel. Only one call per
+    shard is in flight at a time. The worker's service stamps ``node`` into
+    the ids it mints.
+    """
+
+    def __init__(self, context: Optional[multiprocessing.context.BaseContext] = None, *, node: int = 0) -> None:
+        ctx = context or multiprocessing.get_context()
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_serve_shard, args=(child, node), daemon=True)
+        self._process.start()
+        child.close()
+        self._lock = threading.Lock()
+
+    def submit(self, method: str, *args: object, **kwargs: object) -> Reply:
+        self._lock.acquire()
+        try:
+            self._conn.send((method, args, kwargs))
+        except BaseException:
+            self._lock.release()
+            raise
+
+        def reply() -> object:
+            try:
+                ok, value = self._conn.recv()
+            finally:
+                self._lock.release()
+            if not ok:
+                raise value
+            return value
+
+        return reply
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._conn.close()
+        self._process.join(timeout=5)
+
+
+class ShardedConnectHubService:
+    """Routes single-event calls to the owning shard and scatter-gathers listings.
+
+    Events are placed by a stable hash of their id; registrations and feedback
+    live on their event's shard and matches on the shard of their opportunity.
+    Each shard mints time-ordered ids stamped with its index, so a
+    registration or match id names its shard and no routing table is kept.
+    """
+
+    def __init__(
+        self,
+        shards: int = 4,
+        *,
+        processes: bool = False,
+        id_generator: Optional[IdGenerator] = None,
+    ) -> None:
+        if shards <= 0:
+            raise ValueError("shards must be greater than zero")
+        if shards > 1 << NODE_BITS:
+            raise ValueError(f"at most {1 << NODE_BITS} shards are supported")
+        self.shards: List[object] = [
+            ProcessShard(node=index)
+            if processes
+            else LocalShard(ConnectHubService(id_generator=TimeOrderedIds(node=index)))
+            for index in range(shards)
+        ]
+        self._new_id: IdGenerator = id_generator or TimeOrderedIds()
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()  # type: ignore[attr-defined]
+
+    def __enter__(self) -> "ShardedConnectHubService":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Routing helpers
+    # ------------------------------------------------------------------
+    def shard_index(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % len(self.shards)
+
+    def _call(self, index: int, method: str, *args: object, **kwargs: object) -> object:
+        return self.shards[index].submit(method, *args, **kwargs)()  # type: ignore[attr-defined]
+
+    def _scatter(self, method: str, *args: object, **kwargs: object) -> List[object]:
+        replies = [shard.submit(method, *args, **kwargs) for shard in self.shards]  # type: ignore[attr-defined]
+        results: List[object] = []
+        error: Optional[Exception] = None
+        for reply in replies:
+            # every reply must be collected so each shard releases its pipe
+            try:
+                results.append(reply())
+            except Exception as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+        return results
+
+    def _locate(self, record_id: str, kind: str) -> int:
+        """Shard that minted ``record_id``, read from the node bits of the id."""
+        try:
+            index = ulid_node(record_id)
+        except ValueError:
+            index = len(self.shards)
+        if index >= len(self.shards):
+            raise KeyError(f"{kind} {record_id} not found")
+        return index
+
+    # ------------------------------------------------------------------
+    # Event operations
+    # ------------------------------------------------------------------
+    def create_event(self, **payload: object) -> Event:
+        event_id = payload.pop("event_id", None) or self._new_id()
+        return self._call(self.shard_index(event_id), "create_event", event_id=event_id, **payload)  # type: ignore[return-value]
+
+    def update_event(self, event_id: str, **updates: object) -> Event:
+        return self._call(self.shard_index(event_id), "update_event", event_id, **updates)  # type: ignore[return-value]
+
+    def get_event(self, event_id: str) -> Event:
+        return self._call(self.shard_index(event_id), "get_event", event_id)  # type: ignore[return-value]
+
+    def list_events(self, **filters: Optional[str]) -> List[Event]:
+        parts: Iterable[List[Event]] = self._scatter("list_events", **filters)  # type: ignore[assignment]
+        return list(heapq.merge(*parts, key=lambda evt: evt.start_at))
+
+    # ------------------------------------------------------------------
+    # Registration and feedback operations
+    # ------------------------------------------------------------------
+    def register_participant(self, *, event_id: str, participant_id: str) -> Registration:
+        return self._call(  # type: ignore[return-value]
+            self.shard_index(event_id), "register_participant", event_id=event_id, participant_id=participant_id
+        )
+
+    def cancel_registration(self, registration_id: str) -> Registration:
+        index = self._locate(registration_id, "registration")
+        return self._call(index, "cancel_registration", registration_id)  # type: ignore[return-value]
+
+    def list_registrations(
+        self,
+        *,
+        event_id: Optional[str] = None,
+        participant_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Registration]:
+        filters = {"event_id": event_id, "participant_id": participant_id, "status": status}
+        if event_id:
+            return self._call(self.shard_index(event_id), "list_registrations", **filters)  # type: ignore[return-value]
+        parts: Iterable[List[Registration]] = self._scatter("list_registrations", **filters)  # type: ignore[assignment]
+        return list(heapq.merge(*parts, key=lambda record: record.registered_at))
+
+    def record_feedback(self, *, event_id: str, **payload: object) -> Feedback:
+        return self._call(self.shard_index(event_id), "record_feedback", event_id=event_id, **payload)  # type: ignore[return-value]
+
+    # ------------------------------------------------------------------
+    # Matchmaking operations
+    # ------------------------------------------------------------------
+    def create_match(self, *, opportunity_id: str, **payload: object) -> MatchRecord:
+        index = self.shard_index(opportunity_id)
+        return self._call(index, "create_match", opportunity_id=opportunity_id, **payload)  # type: ignore[return-value]
+
+    def list_matches(self, *, status: Optional[str] = None) -> List[MatchRecord]:
+        parts: Iterable[List[MatchRecord]] = self._scatter("list_matches", status=status)  # type: ignore[assignment]
+        return list(heapq.merge(*parts, key=lambda match: match.created_at, reverse=True))
+
+    def update_match_status(self, match_id: str, *, status: str, notes: Optional[str] = None) -> MatchRecord:
+        index = self._locate(match_id, "match")
+        return self._call(index, "update_match_status", match_id, status=status, notes=notes)  # type: ignore[return-value]
+
+    # ------------------------------------------------------------------
+    # Insights
+    # ------------------------------------------------------------------
+    def recommend_events(self, *, participant_id: str, limit: int = 3) -> RecommendationResponse:
+        parts: Sequence[List[Event]] = self._scatter("_recommendation_candidates", limit=limit)  # type: ignore[assignment]
+        merged = heapq.merge(*parts, key=recommendation_rank)
+        recommendations = [
+            Recommendation(event_id=event.id, reason=ConnectHubService._build_reason(event))
+            for event in islice(merged, limit)
+        ]
+        return RecommendationResponse(participant_id=participant_id, recommendations=recommendations)
+
+    def dashboard(self) -> DashboardMetrics:
+        return merge_dashboard(self._scatter("_dashboard_totals"))  # type: ignore[arg-type]
+
+
+__all__ = ["LocalShard", "ProcessShard", "ShardedConnectHubService"]
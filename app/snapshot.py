@@ -0,0 +1,113 @@
+"""Serialize service state to JSON so workers can start without re-seeding."""
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .models import Event, Feedback, MatchRecord, Registration, Reservation, SurfaceFeature, SurfaceSection
+from .reservations import HELD
+from .service import ConnectHubService
+
+SNAPSHOT_VERSION = 1
+_DATETIME_FIELDS = (
+    "start_at",
+    "end_at",
+    "registered_at",
+    "cancelled_at",
+    "submitted_at",
+    "created_at",
+    "approved_at",
+    "held_at",
+    "expires_at",
+)
+
+
+def capture(service: ConnectHubService) -> Dict[str, object]:
+    blueprint = service.surface_blueprint()
+    return {
+        "version": SNAPSHOT_VERSION,
+        "events": [_encode(asdict(event)) for event in service._events.values()],
+        "registrations": [_encode(asdict(record)) for record in service._registrations.values()],
+        "feedback": [_encode(asdict(feedback)) for feedback in service._feedback.values()],
+        "matches": [_encode(asdict(match)) for match in service._matches.values()],
+        "reservations": [
+            _encode(asdict(reservation)) for reservation in service._reservations if reservation.status == HELD
+        ],
+        "blueprint": {"frontend": asdict(blueprint.frontend), "backend": asdict(blueprint.backend)},
+    }
+
+
+def restore(data: Dict[str, object], *, service: Optional[ConnectHubService] = None) -> ConnectHubService:
+    """Rebuild a service from ``capture`` output without re-running validation."""
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {data.get('version')!r}")
+    if service is None:
+        service = ConnectHubService()
+    for payload in _rows(data, "events"):
+        service._store_event(Event(**_decode(payload)))
+    for payload in _rows(data, "registrations"):
+        record = Registration(**_decode(payload))
+        service._store_registration(record)
+    for payload in _rows(data, "feedback"):
+        feedback = Feedback(**_decode(payload))
+        service._feedback[feedback.id] = feedback
+    for payload in _rows(data, "matches"):
+        service._store_match(MatchRecord(**_decode(payload)))
+    for payload in _rows(data, "reservations"):
+        service._reservations.add(Reservation(**_decode(payload)))
+    blueprint = data.get("blueprint")
+    if isinstance(blueprint, dict):
+        # called on the base class so read-only replicas can be seeded too
+        ConnectHubService.configure_surface_blueprint(
+            service,
+            frontend=_section(blueprint["frontend"]),
+            backend=_section(blueprint["backend"]),
+        )
+    return service
+
+
+def save(service: ConnectHubService, path: Union[str, Path]) -> None:
+    Path(path).write_text(json.dumps(capture(service), ensure_ascii=False), encoding="utf-8")
+
+
+def load(path: Union[str, Path]) -> ConnectHubService:
+    return restore(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def _rows(data: Dict[str, object], key: str) -> List[Dict[str, object]]:
+    rows = data.get(key, [])
+    return rows if isinstance(rows, list) else []
+
+
+def _encode(payload: Dict[str, object]) -> Dict[str, object]:
+    for name in _DATETIME_FIELDS:
+        value = payload.get(name)
+        if isinstance(value, datetime):
+            payload[name] = value.isoformat()
+    return payload
+
+
+def _decode(payload: Dict[str, object]) -> Dict[str, object]:
+    payload = dict(payload)
+    for name in _DATETIME_FIELDS:
+        value = payload.get(name)
+        if isinstance(value, str):
+            payload[name] = datetime.fromisoformat(value)
+    return payload
+
+
+def _section(payload: Dict[str, object]) -> SurfaceSection:
+    features = [SurfaceFeature(**feature) for feature in payload.get("features", [])]  # type: ignore[union-attr]
+    return SurfaceSection(title=payload["title"], summary=payload["summary"], features=features)  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":  # pragma: no cover - build helper
+    from .main import bootstrap_demo_service
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "connect-hub-snapshot.json"
+    save(bootstrap_demo_service(), target)
+    print(f"Wrote demo snapshot to {target}")
@@ -0,0 +1,142 @@
+// Client-rendered Connect Hub dashboard: keeps a local copy of every event
+// and only asks the server for the ones modified since the last version.
+(function () {
+    "use strict";
+
+    const root = document.querySelector("[data-live-dashboard]");
+    if (!root) {
+        return;
+    }
+    const interval = Number(root.dataset.refreshMs || 5000);
+    const events = new Map();
+    let version = 0;
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined && text !== null) {
+            node.textContent = String(text);
+        }
+        return node;
+    }
+
+    function parseDate(value) {
+        return new Date(String(value).replace(" ", "T"));
+    }
+
+    function formatDate(value) {
+        return parseDate(value).toLocaleString(undefined, { dateStyle: "short", timeStyle: "short" });
+    }
+
+    function titleCase(value) {
+        return String(value).replace(/\b\w/g, (letter) => letter.toUpperCase());
+    }
+
+    function eventCard(event) {
+        const card = el("article", "event-card");
+        const header = el("header");
+        header.append(el("h2", null, event.name), el("span", "category", titleCase(event.category)));
+        const details = el("dl");
+        const remaining = Math.max(event.capacity - event.seats_taken, 0);
+        [
+            ["Mode", titleCase(event.mode)],
+            ["When", formatDate(event.start_at) + " – " + formatDate(event.end_at)],
+            ["Location", event.location || "待定"],
+            ["Capacity", event.seats_taken + "/" + event.capacity + " (剩餘 " + remaining + ")"],
+        ].forEach(([label, value]) => {
+            const row = el("div");
+            row.append(el("dt", null, label), el("dd", null, value));
+            details.append(row);
+        });
+        const footer = el("footer");
+        (event.tags || []).forEach((tag) => footer.append(el("span", "tag", tag)));
+        card.append(header, details, el("p", "description", event.description || ""), footer);
+        return card;
+    }
+
+    function renderEvents(container, list) {
+        if (!list.length) {
+            container.replaceChildren(el("p", "empty", "目前沒有可報名的活動。"));
+            return;
+        }
+        container.replaceChildren(...list.map(eventCard));
+    }
+
+    function renderFeatures(section, data) {
+        section.querySelector("h2").textContent = data.title;
+        section.querySelector(".summary").textContent = data.summary;
+        const grid = section.querySelector(".feature-grid");
+        if (!data.features.length) {
+            grid.replaceChildren(el("p", "empty", "尚未定義功能。"));
+            return;
+        }
+        grid.replaceChildren(
+            ...data.features.map((feature) => {
+                const card = el("article", "feature-card");
+                const header = el("header");
+                header.append(el("h3", null, feature.name));
+                if (feature.ai_enabled) {
+                    header.append(el("span", "badge badge-ai", "AI"));
+                }
+                card.append(header, el("p", null, feature.description));
+                if (feature.highlights.length) {
+                    const list = el("ul", "highlights");
+                    feature.highlights.forEach((item) => list.append(el("li", null, item)));
+                    card.append(list);
+                }
+                return card;
+            })
+        );
+    }
+
+    function renderMetrics(metrics) {
+        root.querySelector("[data-metric=total_events]").textContent = metrics.total_events;
+        root.querySelector("[data-metric=total_registrations]").textContent = metrics.total_registrations;
+        root.querySelector("[data-metric=average_fill_rate]").textContent =
+            Math.round(metrics.average_fill_rate * 100) + "%";
+        root.querySelector("[data-metric=matches_waiting_review]").textContent = metrics.matches_waiting_review;
+        renderEvents(root.querySelector("[data-upcoming]"), metrics.upcoming_events);
+    }
+
+    async function getJSON(url) {
+        const response = await fetch(url, { headers: { Accept: "application/json" } });
+        if (!response.ok) {
+            throw new Error(url + " returned " + response.status);
+        }
+        return response.json();
+    }
+
+    async function refresh() {
+        const delta = await getJSON("/api/events/changes?since=" + version);
+        if (delta.reset) {
+            events.clear();
+        }
+        version = delta.version;
+        if (!delta.events.length && !delta.reset) {
+            return;
+        }
+        delta.events.forEach((event) => events.set(event.id, event));
+        const ordered = Array.from(events.values()).sort((a, b) => parseDate(a.start_at) - parseDate(b.start_at));
+        renderEvents(root.querySelector("[data-all-events]"), ordered);
+        renderMetrics(await getJSON("/api/dashboard"));
+    }
+
+    async function loop() {
+        try {
+            await refresh();
+        } catch (error) {
+            console.warn("dashboard refresh failed", error);
+        }
+        window.setTimeout(loop, interval);
+    }
+
+    getJSON("/api/surface")
+        .then((surface) => {
+            renderFeatures(root.querySelector("[data-surface=frontend]"), surface.frontend);
+            renderFeatures(root.querySelector("[data-surface=backend]"), surface.backend);
+        })
+        .catch((error) => console.warn("surface load failed", error));
+    loop();
+})();
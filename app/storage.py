@@ -0,0 +1,445 @@
+"""Column-oriented storage for high-volume service records."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableMapping, ValuesView
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .models import Registration
+
+UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_NO_TIMESTAMP = -(2**63)
+_DELETED = 0
+_SLOT_BITS = 32
+_EMPTY = -1
+_VACATED = -2
+_COMPACT_MIN_ROWS = 1_024
+
+
+def to_micros(value: datetime) -> int:
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _Interner:
+    """Maps strings to dense integer slots and back."""
+
+    __slots__ = ("values", "slots")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.slots: Dict[str, int] = {}
+
+    def slot(self, value: str) -> int:
+        slot = self.slots.get(value)
+        if slot is None:
+            slot = self.slots[value] = len(self.values)
+            self.values.append(value)
+        return slot
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self.slots.get(value)
+
+
+class _RowIndex:
+    """Open-addressing hash table from registration ids to rows.
+
+    Slots hold row numbers only; the id strings stay in the store's id column
+    and are compared through it, so each id is kept exactly once.
+    """
+
+    __slots__ = ("_ids", "_table", "_mask", "_filled")
+
+    def __init__(self, ids: List[Optional[str]]) -> None:
+        self._ids = ids
+        self._reset(8)
+
+    def get(self, key: str) -> Optional[int]:
+        ids, table, mask = self._ids, self._table, self._mask
+        perturb = hash(key) & 0xFFFFFFFFFFFFFFFF
+        slot = perturb & mask
+        while True:
+            row = table[slot]
+            if row == _EMPTY:
+                return None
+            if row >= 0 and ids[row] == key:
+                return row
+            perturb >>= 5
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def add(self, key: str, row: int) -> None:
+        """Index ``row`` under ``key``; neither may be in the table yet."""
+        if (self._filled + 1) * 3 >= len(self._table) * 2:
+            self.rebuild()
+        table, mask = self._table, self._mask
+        perturb = hash(key) & 0xFFFFFFFFFFFFFFFF
+        slot = perturb & mask
+        while table[slot] >= 0:
+            perturb >>= 5
+            slot = (slot * 5 + perturb + 1) & mask
+        if table[slot] == _EMPTY:
+            self._filled += 1
+        table[slot] = row
+
+    def pop(self, key: str) -> int:
+        ids, table, mask = self._ids, self._table, self._mask
+        perturb = hash(key) & 0xFFFFFFFFFFFFFFFF
+        slot = perturb & mask
+        while True:
+            row = table[slot]
+            if row == _EMPTY:
+                raise KeyError(key)
+            if row >= 0 and ids[row] == key:
+                table[slot] = _VACATED
+                return row
+            perturb >>= 5
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def rebuild(self) -> None:
+        """Re-hash every live id, dropping vacated slots and sizing for growth."""
+        live = [(key, row) for row, key in enumerate(self._ids) if key is not None]
+        size = 8
+        while size * 2 <= len(live) * 3:
+            size <<= 1
+        self._reset(size * 2)
+        for key, row in live:
+            self.add(key, row)
+
+    def _reset(self, size: int) -> None:
+        self._table = array("q", [_EMPTY]) * size
+        self._mask = size - 1
+        self._filled = 0
+
+
+class RegistrationStore(MutableMapping):
+    """Registration records kept in ``array`` columns keyed by registration id.
+
+    Participant and event ids are interned into integer slots, the status is a
+    one-byte code and timestamps are epoch microseconds. ``Registration``
+    objects are only materialized when a row is read.
+
+    A write that moves ``registered_at`` (a revived registration) appends a
+    fresh row and retires the old one, so rows stay in registration-time
+    order; ``time_ordered`` turns false for good once an older timestamp is
+    appended after a newer one, and readers must then sort. Once retired rows
+    outnumber live ones the columns are compacted, so churn does not grow the
+    store. Rows are rewritten in place and renumbered by compaction, so
+    ``select``, point reads and row numbers are only consistent while the
+    caller holds the service lock; ``freeze`` gives lock-free readers a copy.
+    """
+
+    def __init__(self) -> None:
+        self._ids: List[Optional[str]] = []
+        self._rows = _RowIndex(self._ids)
+        self._live = 0
+        self._participants = _Interner()
+        self._event_ids = _Interner()
+        self._statuses = _Interner()
+        self._statuses.slot("")  # code 0 marks deleted rows
+        self._participant_col = array("I")
+        self._event_col = array("I")
+        self._status_col = array("B")
+        self._registered_col = array("q")
+        self._cancelled_col = array("q")
+        self._keys: Dict[int, int] = {}
+        self._status_counts: List[int] = [0]
+        self._latest = _NO_TIMESTAMP
+        self._compactions = 0
+        self.time_ordered = True
+        self.version = 0
+        self.index = RegistrationKeyIndex(self)
+
+    # -- mapping protocol ----------------------------------------------
+    def __getitem__(self, registration_id: str) -> Registration:
+        row = self._rows.get(registration_id)
+        if row is None:
+            raise KeyError(registration_id)
+        return self._materialize(row)
+
+    def __setitem__(self, registration_id: str, record: Registration) -> None:
+        if record.id != registration_id:
+            raise ValueError("registration id does not match the record")
+        event_slot = self._event_ids.slot(record.event_id)
+        participant_slot = self._participants.slot(record.participant_id)
+        status_code = self._status_code(record.status)
+        registered = to_micros(record.registered_at)
+        cancelled = _NO_TIMESTAMP if record.cancelled_at is None else to_micros(record.cancelled_at)
+
+        row = self._rows.get(registration_id)
+        if row is not None and self._registered_col[row] != registered:
+            self._rows.pop(registration_id)
+            self._retire(row)
+            row = None
+        if row is None:
+            if registered < self._latest:
+                self.time_ordered = False
+            else:
+                self._latest = registered
+            row = len(self._ids)
+            self._rows.add(registration_id, row)
+            self._ids.append(registration_id)
+            self._live += 1
+            self._event_col.append(event_slot)
+            self._participant_col.append(participant_slot)
+            self._status_col.append(status_code)
+            self._registered_col.append(registered)
+            self._cancelled_col.append(cancelled)
+        else:
+            self._keys.pop(self._key(self._event_col[row], self._participant_col[row]), None)
+            self._status_counts[self._status_col[row]] -= 1
+            self._event_col[row] = event_slot
+            self._participant_col[row] = participant_slot
+            self._status_col[row] = status_code
+            self._registered_col[row] = registered
+            self._cancelled_col[row] = cancelled
+        self._keys[self._key(event_slot, participant_slot)] = row
+        self._status_counts[status_code] += 1
+        self.version += 1
+        self._maybe_compact()
+
+    def __delitem__(self, registration_id: str) -> None:
+        self._retire(self._rows.pop(registration_id))
+        self.version += 1
+        self._maybe_compact()
+
+    def __iter__(self) -> Iterator[str]:
+        return (registration_id for registration_id in self._ids if registration_id is not None)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, registration_id: object) -> bool:
+        return isinstance(registration_id, str) and self._rows.get(registration_id) is not None
+
+    def values(self) -> "RegistrationValues":
+        return RegistrationValues(self)
+
+    # -- columnar queries ----------------------------------------------
+    def count_status(self, status: str) -> int:
+        code = self._statuses.lookup(status)
+        return 0 if code is None else self._status_counts[code]
+
+    def select(
+        self,
+        *,
+        event_id: Optional[str] = None,
+        participant_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Registration]:
+        """Filter on the integer columns and materialize only matching rows."""
+        event_slot = participant_slot = status_code = None
+        if event_id:
+            event_slot = self._event_ids.lookup(event_id)
+            if event_slot is None:
+                return []
+        if participant_id:
+            participant_slot = self._participants.lookup(participant_id)
+            if participant_slot is None:
+                return []
+        if status:
+            status_code = self._statuses.lookup(status)
+            if status_code is None:
+                return []
+        events, participants, statuses = self._event_col, self._participant_col, self._status_col
+        matched = []
+        for row in range(len(statuses)):
+            code = statuses[row]
+            if code == _DELETED or (status_code is not None and code != status_code):
+                continue
+            if event_slot is not None and events[row] != event_slot:
+                continue
+            if participant_slot is not None and participants[row] != participant_slot:
+                continue
+            matched.append(self._materialize(row))
+        return matched
+
+    def iter_chunks(self, size: int) -> Iterator[List[Registration]]:
+        compactions = self._compactions
+        for start in range(0, len(self._ids), size):
+            if self._compactions != compactions:
+                raise RuntimeError("registration store compacted during iteration")
+            stop = min(start + size, len(self._ids))
+            chunk = [self._materialize(row) for row in range(start, stop) if self._status_col[row] != _DELETED]
+            if chunk:
+                yield chunk
+
+    def freeze(self) -> "FrozenRegistrations":
+        """Point-in-time copy of the columns; take it under the service lock.
+
+        Only the fixed-width columns and the id list are copied; the interned
+        strings are append-only, so the copy keeps referring to them.
+        """
+        return FrozenRegistrations(self)
+
+    def compact(self) -> None:
+        """Drop retired rows from every column, keeping live rows in order."""
+        keep = [row for row, registration_id in enumerate(self._ids) if registration_id is not None]
+        if len(keep) == len(self._ids):
+            return
+        self._ids[:] = [self._ids[row] for row in keep]
+        for name in ("_event_col", "_participant_col", "_status_col", "_registered_col", "_cancelled_col"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[row] for row in keep]))
+        moved = {old: new for new, old in enumerate(keep)}
+        self._keys = {key: moved[row] for key, row in self._keys.items()}
+        self._rows.rebuild()
+        self._compactions += 1
+
+    # -- helpers -------------------------------------------------------
+    def _retire(self, row: int) -> None:
+        key = self._key(self._event_col[row], self._participant_col[row])
+        if self._keys.get(key) == row:
+            del self._keys[key]
+        self._status_counts[self._status_col[row]] -= 1
+        self._status_col[row] = _DELETED
+        self._ids[row] = None
+        self._live -= 1
+
+    def _maybe_compact(self) -> None:
+        rows = len(self._ids)
+        if rows >= _COMPACT_MIN_ROWS and (rows - self._live) * 2 > rows:
+            self.compact()
+
+    def _status_code(self, status: str) -> int:
+        code = self._statuses.slot(status)
+        if code > 255:
+            raise ValueError("too many distinct registration statuses")
+        if code == len(self._status_counts):
+            self._status_counts.append(0)
+        return code
+
+    @staticmethod
+    def _key(event_slot: int, participant_slot: int) -> int:
+        return (event_slot << _SLOT_BITS) | participant_slot
+
+    def _row_for_key(self, event_id: str, participant_id: str) -> Optional[int]:
+        event_slot = self._event_ids.lookup(event_id)
+        participant_slot = self._participants.lookup(participant_id)
+        if event_slot is None or participant_slot is None:
+            return None
+        return self._keys.get(self._key(event_slot, participant_slot))
+
+    def _materialize(self, row: int) -> Registration:
+        cancelled = self._cancelled_col[row]
+        return Registration(
+            id=self._ids[row],  # type: ignore[arg-type]
+            event_id=self._event_ids.values[self._event_col[row]],
+            participant_id=self._participants.values[self._participant_col[row]],
+            status=self._statuses.values[self._status_col[row]],
+            registered_at=from_micros(self._registered_col[row]),
+            cancelled_at=None if cancelled == _NO_TIMESTAMP else from_micros(cancelled),
+        )
+
+
+class FrozenRegistrations:
+    """Registrations as they were when ``RegistrationStore.freeze`` was called."""
+
+    __slots__ = (
+        "_ids",
+        "_event_col",
+        "_participant_col",
+        "_status_col",
+        "_registered_col",
+        "_cancelled_col",
+        "_event_ids",
+        "_participants",
+        "_statuses",
+        "_live",
+    )
+
+    def __init__(self, store: RegistrationStore) -> None:
+        self._ids = list(store._ids)
+        self._event_col = array("I", store._event_col)
+        self._participant_col = array("I", store._participant_col)
+        self._status_col = array("B", store._status_col)
+        self._registered_col = array("q", store._registered_col)
+        self._cancelled_col = array("q", store._cancelled_col)
+        self._event_ids = store._event_ids
+        self._participants = store._participants
+        self._statuses = store._statuses
+        self._live = len(store)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def iter_chunks(self, size: int) -> Iterator[List[Registration]]:
+        materialize = RegistrationStore._materialize
+        for start in range(0, len(self._ids), size):
+            stop = min(start + size, len(self._ids))
+            chunk = [
+                materialize(self, row)  # type: ignore[arg-type]
+                for row in range(start, stop)
+                if self._status_col[row] != _DELETED
+            ]
+            if chunk:
+                yield chunk
+
+
+class RegistrationValues(ValuesView):
+    """Values view that walks the columns directly instead of re-hashing ids."""
+
+    _mapping: RegistrationStore
+
+    def __iter__(self) -> Iterator[Registration]:
+        store = self._mapping
+        statuses = store._status_col
+        for row in range(len(statuses)):
+            if statuses[row] != _DELETED:
+                yield store._materialize(row)
+
+
+class RegistrationKeyIndex(MutableMapping):
+    """``(event_id, participant_id) -> registration_id`` view over a store."""
+
+    def __init__(self, store: RegistrationStore) -> None:
+        self._store = store
+
+    def __getitem__(self, key: Tuple[str, str]) -> str:
+        row = self._store._row_for_key(*key)
+        if row is None:
+            raise KeyError(key)
+        return self._store._ids[row]  # type: ignore[return-value]
+
+    def __setitem__(self, key: Tuple[str, str], registration_id: str) -> None:
+        record = self._store[registration_id]
+        if (record.event_id, record.participant_id) != key:
+            raise ValueError("registration does not belong to the given key")
+
+    def __delitem__(self, key: Tuple[str, str]) -> None:
+        store = self._store
+        row = store._row_for_key(*key)
+        if row is None:
+            raise KeyError(key)
+        del store._keys[store._key(store._event_col[row], store._participant_col[row])]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        store = self._store
+        for row in store._keys.values():
+            yield (
+                store._event_ids.values[store._event_col[row]],
+                store._participants.values[store._participant_col[row]],
+            )
+
+    def __len__(self) -> int:
+        return len(self._store._keys)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+        return self._store._row_for_key(*key) is not None
+
+
+__all__ = [
+    "FrozenRegistrations",
+    "RegistrationKeyIndex",
+    "RegistrationStore",
+    "RegistrationValues",
+    "from_micros",
+    "to_micros",
+]
@@ -0,0 +1,142 @@
+"""Request-scoped tracing of service calls, record scans and render time."""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("app.trace")
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("connect_hub_trace", default=None)
+
+
+@dataclass(slots=True)
+class TraceEntry:
+    operation: str
+    duration_ms: float = 0.0
+    scanned: int = 0
+    returned: int = 0
+    sorted: int = 0
+
+
+@dataclass
+class Trace:
+    label: str
+    started_at: float = field(default_factory=time.perf_counter)
+    entries: List[TraceEntry] = field(default_factory=list)
+    _open: List[TraceEntry] = field(default_factory=list, repr=False)
+
+    @property
+    def total_scanned(self) -> int:
+        return sum(entry.scanned for entry in self.entries)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "label": self.label,
+            "duration_ms": round(self.elapsed_ms(), 3),
+            "scanned": self.total_scanned,
+            "calls": [asdict(entry) for entry in self.entries],
+        }
+
+    def server_timing(self) -> str:
+        parts = []
+        for entry in self.entries:
+            desc = f"scanned={entry.scanned} returned={entry.returned} sorted={entry.sorted}"
+            parts.append(f'{entry.operation};dur={entry.duration_ms:.3f};desc="{desc}"')
+        parts.append(f"total;dur={self.elapsed_ms():.3f}")
+        return ", ".join(parts)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def tracing(label: str) -> Iterator[Trace]:
+    trace = Trace(label=label)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(operation: str) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    entry = TraceEntry(operation=operation)
+    trace.entries.append(entry)
+    trace._open.append(entry)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        trace._open.pop()
+
+
+def record_scan(operation: str, *, scanned: int, returned: int, sorted_items: int = 0) -> None:
+    """Attach scan statistics to the innermost open call of the active trace.
+
+    Costs a single context-variable lookup when no trace is active.
+    """
+    trace = _current.get()
+    if trace is None:
+        return
+    if trace._open and trace._open[-1].operation == operation:
+        entry = trace._open[-1]
+    else:
+        entry = TraceEntry(operation=operation)
+        trace.entries.append(entry)
+    entry.scanned += scanned
+    entry.returned += returned
+    entry.sorted += sorted_items
+
+
+def trace_service(service: object) -> object:
+    """Wrap every public method of ``service`` so traced requests record each call."""
+    for name in dir(type(service)):
+        if name.startswith("_"):
+            continue
+        attr = getattr(service, name)
+        if callable(attr):
+            setattr(service, name, _traced(name, attr))
+    return service
+
+
+def _traced(name: str, func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        if _current.get() is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def log_trace(trace: Trace) -> None:
+    logger.info(json.dumps(trace.to_dict(), separators=(",", ":")))
+
+
+__all__ = [
+    "Trace",
+    "TraceEntry",
+    "current_trace",
+    "log_trace",
+    "record_scan",
+    "span",
+    "trace_service",
+    "tracing",
+]
@@ -0,0 +1,82 @@
+"""Interned vocabularies for low-cardinality event attributes."""
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, List, Optional
+
+
+class Vocabulary:
+    """Assigns each distinct term a small integer id and a shared string instance."""
+
+    __slots__ = ("_ids", "_terms")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._ids
+
+    def intern(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            shared = sys.intern(term)
+            self._ids[shared] = term_id
+            self._terms.append(shared)
+        return term_id
+
+    def canonical(self, term: str) -> str:
+        return self._terms[self.intern(term)]
+
+    def lookup(self, term: str) -> Optional[int]:
+        return self._ids.get(term)
+
+    def term(self, term_id: int) -> str:
+        return self._terms[term_id]
+
+
+class TermIndex:
+    """Interned terms with a posting set of the members that carry each one.
+
+    Members are only ever indexed under terms they hold, so a filter is a
+    lookup of the smallest posting set plus membership tests against the
+    others; memory grows with the number of (member, term) pairs.
+    """
+
+    __slots__ = ("vocabulary", "_postings")
+
+    def __init__(self) -> None:
+        self.vocabulary = Vocabulary()
+        # term id -> members in insertion order
+        self._postings: Dict[int, Dict[str, None]] = {}
+
+    def canonical(self, term: str) -> str:
+        return self.vocabulary.canonical(term)
+
+    def update(self, member: str, old: Iterable[str], new: Iterable[str]) -> None:
+        """Move ``member`` from the postings of ``old`` terms to those of ``new``."""
+        vocabulary, postings = self.vocabulary, self._postings
+        old_ids = {vocabulary.intern(term) for term in old}
+        new_ids = {vocabulary.intern(term) for term in new}
+        for term_id in old_ids - new_ids:
+            members = postings.get(term_id)
+            if members is not None:
+                members.pop(member, None)
+                if not members:
+                    del postings[term_id]
+        for term_id in new_ids - old_ids:
+            postings.setdefault(term_id, {})[member] = None
+
+    def members(self, term: str) -> Dict[str, None]:
+        """Members indexed under ``term``; empty when the term is unknown."""
+        term_id = self.vocabulary.lookup(term)
+        if term_id is None:
+            return {}
+        return self._postings.get(term_id, {})
+
+
+__all__ = ["TermIndex", "Vocabulary"]
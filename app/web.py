@@ -2,18 +2,78 @@
 from __future__ import annotations
 
 import json
+import math
+import os
+import threading
+import time
 from dataclasses import asdict
 from datetime import datetime
-from typing import Callable, Iterable, Optional
-from wsgiref.simple_server import make_server
+from functools import lru_cache
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .main import bootstrap_demo_service
-from .models import Event, SurfaceSection
+from .models import Event, SurfaceBlueprint, SurfaceSection
 from .models import Event
 from .service import ConnectHubService
+from .tracing import span
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController
+    from .anomaly import AnomalyDetector
+    from .checkin import CheckInDesk
+    from .compression import EncodedBody, PrefixCompressor
+    from .instrumentation import Metrics
+    from .jobs import JobRunner
 
 HTML_CONTENT_TYPE = ("Content-Type", "text/html; charset=utf-8")
 JSON_CONTENT_TYPE = ("Content-Type", "application/json; charset=utf-8")
+TEXT_CONTENT_TYPE = ("Content-Type", "text/plain; charset=utf-8")
+PROMETHEUS_CONTENT_TYPE = ("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+SNAPSHOT_ENV = "CONNECT_HUB_SNAPSHOT"
+JOB_DIR_ENV = "CONNECT_HUB_JOB_DIR"
+EXPORTS_PREFIX = "/api/exports"
+# same value as assets.STATIC_PREFIX; kept here so routing does not import the asset registry
+STATIC_PREFIX = "/static/"
+SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+DASHBOARD_FLAG_LIMIT = 5
+JOBS_PREFIX = "/api/jobs"
+CHECKIN_PREFIX = "/api/checkin"
+REGISTRATIONS_PREFIX = "/api/registrations"
+MATCHES_PREFIX = "/api/matches"
+RECOMMENDATION_LIMIT = 3
+MAX_RECOMMENDATION_LIMIT = 20
+KNOWN_ROUTES = frozenset(
+    {
+        "/live",
+        "/api/events",
+        "/api/events/changes",
+        "/api/dashboard",
+        "/api/surface",
+        "/api/search",
+        "/api/anomalies",
+        "/api/anomalies/dismiss",
+        "/api/registrations",
+        "/api/feedback",
+        "/api/matches",
+        "/api/jobs",
+        "/api/checkin",
+        "/api/checkin/sync",
+        "/api/recommendations",
+        "/api/recommendations/stats",
+        "/api/metrics",
+        "/api/metrics/slowest",
+    }
+)
+STATUS_LINES = {
+    200: "200 OK",
+    201: "201 Created",
+    202: "202 Accepted",
+    400: "400 Bad Request",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    409: "409 Conflict",
+    429: "429 Too Many Requests",
+}
 
 
 def _format_datetime(value: datetime) -> str:
@@ -87,259 +147,100 @@ def _render_feature_cards(section: SurfaceSection) -> str:
     return "<p class=\"empty\">尚未定義功能。</p>"
 
 
-
-def render_dashboard(service: ConnectHubService) -> str:
-    metrics = service.dashboard()
-    upcoming_markup = _render_events(metrics.upcoming_events)
-    all_events_markup = _render_events(service.list_events())
-    blueprint = service.surface_blueprint()
-    frontend_markup = _render_feature_cards(blueprint.frontend)
-    backend_markup = _render_feature_cards(blueprint.backend)
-    return f"""
+DASHBOARD_HEAD_TEMPLATE = """
     <!DOCTYPE html>
     <html lang="zh-Hant">
     <head>
         <meta charset="utf-8" />
         <title>Connect Hub MVP</title>
         <meta name="viewport" content="width=device-width, initial-scale=1" />
-        <style>
-            :root {{
-                color-scheme: light dark;
-                font-family: "Noto Sans TC", system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-                background: #f5f5f5;
-                color: #1f2933;
-                line-height: 1.6;
-            }}
-            body {{
-                margin: 0;
-                padding: 2.5rem 1.5rem 4rem;
-                background: linear-gradient(180deg, #f8fafc 0%, #eef2ff 100%);
-            }}
-            header.page-header {{
-                max-width: 960px;
-                margin: 0 auto 2rem;
-                text-align: center;
-            }}
-            header.page-header h1 {{
-                margin: 0 0 0.5rem;
-                font-size: clamp(2rem, 5vw, 3rem);
-                letter-spacing: 0.04em;
-            }}
-            header.page-header p {{
-                margin: 0;
-                color: #475569;
-            }}
-            section {{
-                max-width: 960px;
-                margin: 0 auto 2.5rem;
-                padding: 1.5rem;
-                background: rgba(255, 255, 255, 0.9);
-                border-radius: 16px;
-                box-shadow: 0 20px 45px rgba(15, 23, 42, 0.08);
-            }}
-            section h2 {{
-                margin-top: 0;
-                font-size: 1.5rem;
-                border-bottom: 1px solid #e2e8f0;
-                padding-bottom: 0.5rem;
-            }}
-            .metrics {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                gap: 1rem;
-                margin: 1.5rem 0 0;
-            }}
-            .metric {{
-                padding: 1rem;
-                border-radius: 12px;
-                background: linear-gradient(160deg, #2563eb 0%, #7c3aed 100%);
-                color: #fff;
-                box-shadow: 0 10px 25px rgba(79, 70, 229, 0.25);
-            }}
-            .metric span {{
-                display: block;
-                font-size: 0.9rem;
-                opacity: 0.85;
-            }}
-            .metric strong {{
-                display: block;
-                font-size: 1.8rem;
-                margin-top: 0.35rem;
-                font-weight: 700;
-            }}
-            .event-card {{
-                border: 1px solid #e2e8f0;
-                border-radius: 12px;
-                padding: 1.25rem;
-                margin: 1rem 0;
-                background: #ffffff;
-                box-shadow: 0 10px 24px rgba(15, 23, 42, 0.08);
-                transition: transform 0.2s ease, box-shadow 0.2s ease;
-            }}
-            .event-card:hover {{
-                transform: translateY(-4px);
-                box-shadow: 0 16px 32px rgba(30, 64, 175, 0.16);
-            }}
-            .event-card header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: baseline;
-                gap: 1rem;
-            }}
-            .event-card h2 {{
-                margin: 0;
-                font-size: 1.35rem;
-            }}
-            .category {{
-                font-size: 0.85rem;
-                padding: 0.35rem 0.6rem;
-                border-radius: 999px;
-                background: #dbeafe;
-                color: #1d4ed8;
-                text-transform: uppercase;
-                font-weight: 600;
-                letter-spacing: 0.05em;
-            }}
-            .surface-section {{
-                display: grid;
-                gap: 1.25rem;
-            }}
-            .surface-section .feature-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-                gap: 1.25rem;
-            }}
-            .surface-section p.summary {{
-                margin: 0;
-                color: #475569;
-            }}
-            .feature-card {{
-                border-radius: 12px;
-                background: #0f172a;
-                color: #f8fafc;
-                padding: 1.25rem;
-                box-shadow: 0 10px 24px rgba(15, 23, 42, 0.35);
-                border: 1px solid rgba(148, 163, 184, 0.2);
-                min-height: 200px;
-                display: flex;
-                flex-direction: column;
-                gap: 0.75rem;
-            }}
-            .feature-card header {{
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                gap: 0.75rem;
-            }}
-            .feature-card h3 {{
-                margin: 0;
-                font-size: 1.1rem;
-            }}
-            .feature-card ul.highlights {{
-                list-style: none;
-                padding: 0;
-                margin: 0;
-                display: grid;
-                gap: 0.4rem;
-            }}
-            .feature-card ul.highlights li::before {{
-                content: "•";
-                margin-right: 0.4rem;
-                color: #38bdf8;
-            }}
-            .badge {{
-                display: inline-flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 0.75rem;
-                padding: 0.15rem 0.55rem;
-                border-radius: 999px;
-                font-weight: 600;
-                text-transform: uppercase;
-                letter-spacing: 0.06em;
-            }}
-            .badge-ai {{
-                background: rgba(59, 130, 246, 0.18);
-                color: #60a5fa;
-                border: 1px solid rgba(96, 165, 250, 0.4);
-            }}
-            dl {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                gap: 0.75rem 1rem;
-                margin: 1rem 0;
-            }}
-            dt {{
-                font-weight: 600;
-                color: #475569;
-                text-transform: uppercase;
-                font-size: 0.75rem;
-                letter-spacing: 0.05em;
-            }}
-            dd {{
-                margin: 0.25rem 0 0;
-                font-size: 0.95rem;
-            }}
-            .tag {{
-                display: inline-flex;
-                align-items: center;
-                padding: 0.3rem 0.75rem;
-                margin: 0 0.3rem 0.3rem 0;
-                border-radius: 999px;
-                background: #f1f5f9;
-                color: #0f172a;
-                font-size: 0.8rem;
-            }}
-            .description {{
-                margin: 0 0 0.5rem;
-                color: #334155;
-            }}
-            .empty {{
-                margin: 1.5rem 0;
-                text-align: center;
-                color: #64748b;
-            }}
-            footer.page-footer {{
-                max-width: 960px;
-                margin: 0 auto;
-                text-align: center;
-                color: #475569;
-                font-size: 0.85rem;
-            }}
-            @media (prefers-color-scheme: dark) {{
-                body {{ background: #0f172a; }}
-                section {{
-                    background: rgba(15, 23, 42, 0.85);
-                    border: 1px solid rgba(148, 163, 184, 0.2);
-                    color: #e2e8f0;
-                }}
-                .event-card {{
-                    background: rgba(15, 23, 42, 0.95);
-                    border: 1px solid rgba(148, 163, 184, 0.18);
-                }}
-                .category {{
-                    background: rgba(59, 130, 246, 0.2);
-                    color: #93c5fd;
-                }}
-                .tag {{
-                    background: rgba(148, 163, 184, 0.16);
-                    color: #e2e8f0;
-                }}
-                .feature-card {{
-                    background: rgba(15, 23, 42, 0.9);
-                    border: 1px solid rgba(148, 163, 184, 0.35);
-                    color: #e2e8f0;
-                }}
-                .surface-section p.summary {{
-                    color: #cbd5f5;
-                }}
-                .description {{ color: #cbd5f5; }}
-                dt {{ color: #cbd5f5; }}
-                footer.page-footer {{ color: #cbd5f5; }}
-            }}
-        </style>
+        <link rel="stylesheet" href="{stylesheet}" />
     </head>
-    <body>
+    <body>"""
+
+
+@lru_cache(maxsize=1)
+def dashboard_head() -> str:
+    from .assets import assets
+
+    return DASHBOARD_HEAD_TEMPLATE.format(stylesheet=assets.url("dashboard.css"))
+
+
+LIVE_DASHBOARD_TEMPLATE = """
+        <main data-live-dashboard data-refresh-ms="{refresh_ms}">
+            <header class="page-header">
+                <h1>Connect Hub MVP 面板</h1>
+                <p>快速檢視活動排程、報名熱度與 AI 媒合待辦</p>
+            </header>
+            <section>
+                <h2>核心指標</h2>
+                <div class="metrics">
+                    <div class="metric"><span>活動數量</span><strong data-metric="total_events">-</strong></div>
+                    <div class="metric"><span>有效報名</span><strong data-metric="total_registrations">-</strong></div>
+                    <div class="metric"><span>平均入席率</span><strong data-metric="average_fill_rate">-</strong></div>
+                    <div class="metric"><span>待審核媒合</span><strong data-metric="matches_waiting_review">-</strong></div>
+                </div>
+            </section>
+            <section>
+                <h2>即將開始</h2>
+                <div data-upcoming></div>
+            </section>
+            <section>
+                <h2>所有活動</h2>
+                <div data-all-events></div>
+            </section>
+            <section class="surface-section" data-surface="frontend">
+                <h2></h2>
+                <p class="summary"></p>
+                <div class="feature-grid"></div>
+            </section>
+            <section class="surface-section" data-surface="backend">
+                <h2></h2>
+                <p class="summary"></p>
+                <div class="feature-grid"></div>
+            </section>
+            <footer class="page-footer">
+                <p>此頁面於瀏覽器端繪製，只向伺服器索取自上次版本後變更的活動。</p>
+            </footer>
+        </main>
+        <script src="{script}" defer></script>
+    </body>
+    </html>
+    """
+LIVE_REFRESH_MS = 5000
+
+
+@lru_cache(maxsize=1)
+def live_dashboard_shell() -> "EncodedBody":
+    """The client-rendered page: identical for every request, so encoded once."""
+    from .assets import assets
+    from .compression import EncodedBody
+
+    body = LIVE_DASHBOARD_TEMPLATE.format(refresh_ms=LIVE_REFRESH_MS, script=assets.url("dashboard.js"))
+    return EncodedBody((dashboard_head() + body).encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def _dashboard_head_gzip() -> "PrefixCompressor":
+    from .compression import PrefixCompressor
+
+    return PrefixCompressor(dashboard_head().encode("utf-8"))
+
+
+def render_dashboard(service: ConnectHubService) -> str:
+    return dashboard_head() + render_dashboard_body(service)
+
+
+def render_dashboard_body(service: ConnectHubService) -> str:
+    metrics = service.dashboard()
+    events = service.list_events()
+    blueprint = service.surface_blueprint()
+    with span("render"):
+        upcoming_markup = _render_events(metrics.upcoming_events)
+        all_events_markup = _render_events(events)
+        frontend_markup = _render_feature_cards(blueprint.frontend)
+        backend_markup = _render_feature_cards(blueprint.backend)
+    return f"""
         <header class="page-header">
             <h1>Connect Hub MVP 面板</h1>
             <p>快速檢視活動排程、報名熱度與 AI 媒合待辦</p>
@@ -387,13 +288,50 @@ def events_payload(service: ConnectHubService) -> list[dict[str, object]]:
     return [asdict(event) for event in service.list_events()]
 
 
-def dashboard_payload(service: ConnectHubService) -> dict[str, object]:
+def dashboard_payload(
+    service: ConnectHubService,
+    anomalies: Optional["AnomalyDetector"] = None,
+    checkin: Optional["CheckInDesk"] = None,
+) -> dict[str, object]:
     metrics = service.dashboard()
     payload = asdict(metrics)
     payload["upcoming_events"] = [asdict(event) for event in metrics.upcoming_events]
+    if anomalies is not None:
+        payload["flagged_activity"] = [flag.to_dict() for flag in anomalies.flags(limit=DASHBOARD_FLAG_LIMIT)]
+    if checkin is not None:
+        payload["attendance"] = checkin.overview()
     return payload
 
 
+def anomalies_payload(anomalies: "AnomalyDetector", limit: Optional[int] = None) -> dict[str, object]:
+    return {"flags": [flag.to_dict() for flag in anomalies.flags(limit=limit)], "stats": anomalies.stats()}
+
+
+def recommendations_payload(service: ConnectHubService, participant_id: str, limit: int) -> dict[str, object]:
+    response = service.recommend_events(participant_id=participant_id, limit=limit)
+    return {
+        "participant_id": response.participant_id,
+        "recommendations": [asdict(item) for item in response.recommendations],
+    }
+
+
+def event_changes_payload(service: ConnectHubService, since: int) -> dict[str, object]:
+    version, changed = service.events_changed_since(since)
+    # a client ahead of us saw a previous process; make it start over
+    reset = since > version
+    if reset:
+        version, changed = service.events_changed_since(0)
+    return {"version": version, "reset": reset, "events": [asdict(event) for event in changed]}
+
+
+def search_payload(service: ConnectHubService, query: str, limit: int) -> dict[str, object]:
+    hits = service.search_events(query, limit=limit)
+    return {
+        "query": query,
+        "results": [{**asdict(hit.event), "score": round(hit.score, 4)} for hit in hits],
+    }
+
+
 def surface_payload(service: ConnectHubService) -> dict[str, object]:
     blueprint = service.surface_blueprint()
 
@@ -417,34 +355,616 @@ def surface_payload(service: ConnectHubService) -> dict[str, object]:
         "backend": serialize_section(blueprint.backend),
     }
 
-def create_app(service: Optional[ConnectHubService] = None) -> Callable:
-    svc = service or bootstrap_demo_service()
+def _read_json(environ: dict) -> dict:
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError as exc:
+        raise ValueError("invalid Content-Length") from exc
+    raw = environ["wsgi.input"].read(length) if length > 0 else b""
+    payload = json.loads(raw.decode("utf-8") or "{}")
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    return payload
 
-    def app(environ: dict, start_response: Callable) -> Iterable[bytes]:
+
+def _query(environ: dict) -> Dict[str, List[str]]:
+    query = environ.get("QUERY_STRING", "")
+    if not query:
+        return {}
+    from urllib.parse import parse_qs
+
+    return parse_qs(query)
+
+
+def _query_int(environ: dict, name: str, *, default: int) -> Optional[int]:
+    """Integer query parameter, ``default`` when absent and ``None`` when malformed."""
+    values = _query(environ).get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        return None
+
+
+def _json_response(
+    start_response: Callable,
+    status: int,
+    payload: object,
+    headers: Iterable[tuple[str, str]] = (),
+) -> list[bytes]:
+    start_response(STATUS_LINES[status], [JSON_CONTENT_TYPE, *headers])
+    return [json.dumps(payload, default=str, ensure_ascii=False).encode("utf-8")]
+
+
+def register_endpoint(
+    svc: ConnectHubService,
+    environ: dict,
+    start_response: Callable,
+    admission: Optional["AdmissionController"] = None,
+    desk: Optional["CheckInDesk"] = None,
+) -> list[bytes]:
+    """``POST /api/registrations``; with a check-in ``desk`` the body also carries the door ``ticket``."""
+    try:
+        payload = _read_json(environ)
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    event_id = payload.get("event_id")
+    participant_id = payload.get("participant_id")
+    if not isinstance(event_id, str) or not isinstance(participant_id, str):
+        return _json_response(start_response, 400, {"error": "event_id and participant_id are required"})
+    try:
+        if admission is None:
+            record = svc.register_participant(event_id=event_id, participant_id=participant_id)
+        else:
+            from .admission import AdmissionRejected
+
+            try:
+                record = admission.call(svc.register_participant, participant_id=participant_id, event_id=event_id)
+            except AdmissionRejected as exc:
+                retry_after = str(max(1, math.ceil(exc.retry_after)))
+                return _json_response(start_response, 429, {"error": exc.reason}, [("Retry-After", retry_after)])
+    except KeyError as exc:
+        return _json_response(start_response, 404, {"error": str(exc.args[0])})
+    except ValueError as exc:
+        return _json_response(start_response, 409, {"error": str(exc)})
+    body = asdict(record)
+    if desk is not None:
+        body["ticket"] = desk.issue(event_id=record.event_id, participant_id=record.participant_id)
+    return _json_response(start_response, 201, body)
+
+
+def cancel_endpoint(svc: ConnectHubService, path: str, environ: dict, start_response: Callable) -> list[bytes]:
+    """``POST /api/registrations/<id>/cancel``; cancelling twice is a no-op."""
+    registration_id, _, action = path[len(REGISTRATIONS_PREFIX) + 1 :].partition("/")
+    if action != "cancel":
+        return _json_response(start_response, 404, {"error": f"unknown registration action {action}"})
+    if environ.get("REQUEST_METHOD", "GET") != "POST":
+        return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+    try:
+        record = svc.cancel_registration(registration_id)
+    except KeyError as exc:
+        return _json_response(start_response, 404, {"error": str(exc.args[0])})
+    return _json_response(start_response, 200, asdict(record))
+
+
+def feedback_endpoint(svc: ConnectHubService, environ: dict, start_response: Callable) -> list[bytes]:
+    if environ.get("REQUEST_METHOD", "GET") != "POST":
+        return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+    try:
+        payload = _read_json(environ)
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    event_id = payload.get("event_id")
+    participant_id = payload.get("participant_id")
+    score = payload.get("score")
+    comment = payload.get("comment")
+    if not isinstance(event_id, str) or not isinstance(participant_id, str) or not isinstance(score, int):
+        return _json_response(start_response, 400, {"error": "event_id, participant_id and score are required"})
+    try:
+        feedback = svc.record_feedback(
+            event_id=event_id,
+            participant_id=participant_id,
+            score=score,
+            comment=comment if isinstance(comment, str) else None,
+        )
+    except KeyError as exc:
+        return _json_response(start_response, 404, {"error": str(exc.args[0])})
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    return _json_response(start_response, 201, asdict(feedback))
+
+
+def matches_endpoint(svc: ConnectHubService, path: str, environ: dict, start_response: Callable) -> list[bytes]:
+    """List or create matches, and move one to a new ``status`` via ``POST /api/matches/<id>/status``."""
+    method = environ.get("REQUEST_METHOD", "GET")
+    if path == MATCHES_PREFIX and method == "GET":
+        status = _query(environ).get("status", [None])[0]
+        matches = [asdict(match) for match in svc.list_matches(status=status)]
+        return _json_response(start_response, 200, {"matches": matches})
+    match_id, _, action = path[len(MATCHES_PREFIX) + 1 :].partition("/")
+    if path != MATCHES_PREFIX and action != "status":
+        return _json_response(start_response, 404, {"error": f"unknown match action {action}"})
+    if method != "POST":
+        allow = "GET, POST" if path == MATCHES_PREFIX else "POST"
+        return _json_response(start_response, 405, {"error": f"use {allow}"}, [("Allow", allow)])
+    try:
+        payload = _read_json(environ)
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    notes = payload.get("notes")
+    notes = notes if isinstance(notes, str) else None
+    try:
+        if path == MATCHES_PREFIX:
+            opportunity_id = payload.get("opportunity_id")
+            talent_id = payload.get("talent_id")
+            score = payload.get("recommended_score")
+            valid = isinstance(opportunity_id, str) and isinstance(talent_id, str) and isinstance(score, (int, float))
+            if not valid:
+                raise ValueError("opportunity_id, talent_id and recommended_score are required")
+            match = svc.create_match(
+                opportunity_id=opportunity_id, talent_id=talent_id, recommended_score=float(score), notes=notes
+            )
+            return _json_response(start_response, 201, asdict(match))
+        status = payload.get("status")
+        if not isinstance(status, str):
+            raise ValueError("status is required")
+        match = svc.update_match_status(match_id, status=status, notes=notes)
+        return _json_response(start_response, 200, asdict(match))
+    except KeyError as exc:
+        return _json_response(start_response, 404, {"error": str(exc.args[0])})
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+
+
+def dismiss_endpoint(anomalies: "AnomalyDetector", environ: dict, start_response: Callable) -> list[bytes]:
+    """``POST /api/anomalies/dismiss``: close a reviewed flag by ``kind`` and ``subject``."""
+    if environ.get("REQUEST_METHOD", "GET") != "POST":
+        return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+    try:
+        payload = _read_json(environ)
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    kind = payload.get("kind")
+    subject = payload.get("subject")
+    if not isinstance(kind, str) or not isinstance(subject, str):
+        return _json_response(start_response, 400, {"error": "kind and subject are required"})
+    if not anomalies.dismiss(kind, subject):
+        return _json_response(start_response, 404, {"error": f"no open {kind} flag for {subject}"})
+    return _json_response(start_response, 200, {"dismissed": True})
+
+
+def jobs_endpoint(runner: "JobRunner", environ: dict, start_response: Callable) -> Iterable[bytes]:
+    """Submit and list jobs, and report, cancel or download a single job."""
+    path = environ.get("PATH_INFO", "")
+    method = environ.get("REQUEST_METHOD", "GET")
+    if path == JOBS_PREFIX:
+        if method == "GET":
+            status = _query(environ).get("status", [None])[0]
+            return _json_response(start_response, 200, {"jobs": [job.to_dict() for job in runner.list(status=status)]})
+        if method != "POST":
+            return _json_response(start_response, 405, {"error": "use GET or POST"}, [("Allow", "GET, POST")])
+        try:
+            payload = _read_json(environ)
+            params = payload.get("params") or {}
+            priority = payload.get("priority", 0)
+            if not isinstance(params, dict) or not isinstance(priority, int):
+                raise ValueError("params must be an object and priority an integer")
+            job = runner.submit(str(payload.get("kind")), params, priority=priority)
+        except ValueError as exc:
+            return _json_response(start_response, 400, {"error": str(exc)})
+        return _json_response(start_response, 202, job.to_dict())
+    job_id, _, action = path[len(JOBS_PREFIX) + 1 :].partition("/")
+    try:
+        job = runner.get(job_id)
+    except KeyError as exc:
+        return _json_response(start_response, 404, {"error": str(exc.args[0])})
+    if action == "":
+        return _json_response(start_response, 200, job.to_dict())
+    if action == "cancel":
+        if method != "POST":
+            return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+        return _json_response(start_response, 200, runner.cancel(job_id).to_dict())
+    if action != "result":
+        return _json_response(start_response, 404, {"error": f"unknown job action {action}"})
+    try:
+        result = runner.result_path(job_id)
+    except ValueError as exc:
+        return _json_response(start_response, 409, {"error": str(exc)})
+    start_response(
+        "200 OK",
+        [
+            ("Content-Type", runner.media_type(job_id)),
+            ("Content-Length", str(result.stat().st_size)),
+            ("Content-Disposition", f'attachment; filename="{job.kind}-{result.name}"'),
+        ],
+    )
+    handle = open(result, "rb")
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    if file_wrapper is not None:
+        return file_wrapper(handle, 64 * 1024)
+    return _read_chunks(handle)
+
+
+def checkin_endpoint(desk: "CheckInDesk", environ: dict, start_response: Callable) -> list[bytes]:
+    """Scan a ticket, upload an offline batch, or read one event's attendance.
+
+    ``POST /api/checkin`` answers 200 for first and repeated check-ins alike
+    (the body's ``status`` tells them apart) and 409 for rejected tickets.
+    """
+    path = environ.get("PATH_INFO", "")
+    method = environ.get("REQUEST_METHOD", "GET")
+    if path not in {CHECKIN_PREFIX, CHECKIN_PREFIX + "/sync"}:
+        if method != "GET":
+            return _json_response(start_response, 405, {"error": "use GET"}, [("Allow", "GET")])
+        try:
+            attendance = desk.attendance(path[len(CHECKIN_PREFIX) + 1 :])
+        except KeyError as exc:
+            return _json_response(start_response, 404, {"error": str(exc.args[0])})
+        return _json_response(start_response, 200, attendance.to_dict())
+    if method != "POST":
+        return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+    try:
+        payload = _read_json(environ)
+    except ValueError as exc:
+        return _json_response(start_response, 400, {"error": str(exc)})
+    if path == CHECKIN_PREFIX + "/sync":
+        device_id = payload.get("device_id")
+        scans = payload.get("scans")
+        if not isinstance(device_id, str) or not isinstance(scans, list) or not all(isinstance(s, dict) for s in scans):
+            return _json_response(start_response, 400, {"error": "device_id and a list of scans are required"})
+        try:
+            report = desk.sync(device_id, scans)
+        except ValueError as exc:
+            return _json_response(start_response, 400, {"error": str(exc)})
+        return _json_response(start_response, 200, report.to_dict())
+    event_id = payload.get("event_id")
+    token = payload.get("token")
+    if not isinstance(token, str) or (event_id is not None and not isinstance(event_id, str)):
+        return _json_response(start_response, 400, {"error": "token is required"})
+    result = desk.check_in(token, event_id=event_id)
+    return _json_response(start_response, 409 if result.status == "rejected" else 200, result.to_dict())
+
+
+def export_stream_endpoint(svc: ConnectHubService, path: str, start_response: Callable) -> Iterable[bytes]:
+    """``GET /api/exports/<kind>.<format>``: stream a live export chunk by chunk."""
+    from .export import FORMATS, SCHEMAS, iter_export
+
+    kind, _, fmt = path[len(EXPORTS_PREFIX) + 1 :].partition(".")
+    if kind not in SCHEMAS or fmt not in FORMATS:
+        return _json_response(start_response, 404, {"error": f"unknown export {kind}.{fmt}"})
+    start_response(
+        "200 OK",
+        [("Content-Type", FORMATS[fmt]), ("Content-Disposition", f'attachment; filename="{kind}.{fmt}"')],
+    )
+    return iter_export(svc, kind, fmt)
+
+
+def _send(
+    start_response: Callable,
+    content_type: tuple[str, str],
+    body: bytes,
+    encoding: Optional[str] = None,
+    *,
+    status: str = "200 OK",
+) -> list[bytes]:
+    headers = [content_type, ("Content-Length", str(len(body))), ("Vary", "Accept-Encoding")]
+    if encoding is not None:
+        headers.append(("Content-Encoding", encoding))
+    start_response(status, headers)
+    return [body]
+
+
+def _send_dynamic(environ: dict, start_response: Callable, content_type: tuple[str, str], body: bytes) -> list[bytes]:
+    from .compression import MIN_COMPRESS_SIZE, compress, negotiate
+
+    encoding = negotiate(environ.get("HTTP_ACCEPT_ENCODING")) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding is not None:
+        body = compress(body, encoding)
+    return _send(start_response, content_type, body, encoding)
+
+
+def _send_dashboard(environ: dict, start_response: Callable, svc: ConnectHubService) -> list[bytes]:
+    from .compression import compress, negotiate
+
+    remainder = render_dashboard_body(svc).encode("utf-8")
+    encoding = negotiate(environ.get("HTTP_ACCEPT_ENCODING"))
+    if encoding == "gzip":
+        body = _dashboard_head_gzip().compress(remainder)
+    elif encoding is not None:
+        body = compress(dashboard_head().encode("utf-8") + remainder, encoding)
+    else:
+        body = dashboard_head().encode("utf-8") + remainder
+    return _send(start_response, HTML_CONTENT_TYPE, body, encoding)
+
+
+def static_endpoint(environ: dict, start_response: Callable) -> Iterable[bytes]:
+    from .assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, assets
+    from .compression import negotiate
+
+    asset, immutable = assets.resolve(environ.get("PATH_INFO", ""))
+    if asset is None:
+        start_response("404 Not Found", [TEXT_CONTENT_TYPE])
+        return [b"not found"]
+    cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    headers = [("Cache-Control", cache_control), ("ETag", asset.etag), ("Vary", "Accept-Encoding")]
+    if environ.get("HTTP_IF_NONE_MATCH") == asset.etag:
+        start_response("304 Not Modified", headers)
+        return []
+    headers.append(("Content-Type", asset.content_type))
+    if asset.encoded is not None:
+        body, encoding = asset.encoded.select(negotiate(environ.get("HTTP_ACCEPT_ENCODING")))
+        headers.append(("Content-Length", str(len(body))))
+        if encoding is not None:
+            headers.append(("Content-Encoding", encoding))
+        start_response("200 OK", headers)
+        return [body]
+    # too large to keep in memory: let the server sendfile() it when it can
+    headers.append(("Content-Length", str(asset.size)))
+    start_response("200 OK", headers)
+    handle = asset.path.open("rb")
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    if file_wrapper is not None:
+        return file_wrapper(handle, 64 * 1024)
+    return _read_chunks(handle)
+
+
+def _read_chunks(handle: BinaryIO, size: int = 64 * 1024) -> Iterator[bytes]:
+    with handle:
+        while chunk := handle.read(size):
+            yield chunk
+
+
+def _route_label(path: str) -> str:
+    if path in {"", "/"}:
+        return "/"
+    if path in KNOWN_ROUTES:
+        return path
+    if path.startswith(STATIC_PREFIX):
+        return "/static"
+    if path.startswith(EXPORTS_PREFIX):
+        return "/api/exports"
+    if path.startswith(JOBS_PREFIX + "/"):
+        return "/api/jobs"
+    if path.startswith(CHECKIN_PREFIX + "/"):
+        return "/api/checkin/:event"
+    if path.startswith(REGISTRATIONS_PREFIX + "/"):
+        return "/api/registrations/:id/cancel"
+    if path.startswith(MATCHES_PREFIX + "/"):
+        return "/api/matches/:id/status"
+    return "unmatched"
+
+
+def _default_service(snapshot: Optional[str]) -> ConnectHubService:
+    path = snapshot or os.environ.get(SNAPSHOT_ENV)
+    if path:
+        from .snapshot import load
+
+        return load(path)
+    from .main import bootstrap_demo_service
+
+    return bootstrap_demo_service()
+
+
+def create_app(
+    service: Optional[ConnectHubService] = None,
+    *,
+    snapshot: Optional[str] = None,
+    metrics: Optional["Metrics"] = None,
+    trace: bool = False,
+    admission: Optional["AdmissionController"] = None,
+    anomalies: Optional["AnomalyDetector"] = None,
+    job_dir: Optional[str] = None,
+    checkin: Optional["CheckInDesk"] = None,
+) -> Callable:
+    """Build the WSGI callable.
+
+    Without an explicit ``service`` the default one is built on the first
+    request, from ``snapshot`` (or ``$CONNECT_HUB_SNAPSHOT``) when given and
+    from the demo seed otherwise, so importing and constructing the app stays
+    cheap for short-lived workers. Anomaly
+    detection is opt-in: registration attempts are only watched when an
+    attached ``anomalies`` detector is given, and ``/api/anomalies`` answers
+    404 otherwise. Background jobs, including bulk exports, are likewise
+    only served when ``job_dir`` (or ``$CONNECT_HUB_JOB_DIR``) names a
+    directory; their records and results live there, so it must survive
+    restarts for finished jobs to stay downloadable. Check-in is opt-in
+    too: with a ``checkin`` desk, new registrations come back with their
+    signed ``ticket`` and ``/api/checkin`` accepts door scans; without one
+    those routes answer 404.
+    """
+    instrumented = metrics is not None and metrics.enabled
+    resolved: List[ConnectHubService] = []
+    resolve_lock = threading.Lock()
+    surface_cache: List[Tuple[SurfaceBlueprint, "EncodedBody"]] = []
+    job_runners: List["JobRunner"] = []
+    detectors: List["AnomalyDetector"] = [anomalies] if anomalies is not None else []
+    desks: List["CheckInDesk"] = [checkin] if checkin is not None else []
+
+    def prepare(svc: ConnectHubService) -> ConnectHubService:
+        if instrumented:
+            from .instrumentation import instrument_service
+
+            instrument_service(svc, metrics)
+        if trace:
+            from .tracing import trace_service
+
+            trace_service(svc)
+        resolved.append(svc)
+        return svc
+
+    def surface_body(svc: ConnectHubService) -> "EncodedBody":
+        blueprint = svc.surface_blueprint()
+        cached = surface_cache[0] if surface_cache else None
+        if cached is not None and cached[0] is blueprint:
+            return cached[1]
+        from .compression import EncodedBody
+
+        encoded = EncodedBody(json.dumps(surface_payload(svc), ensure_ascii=False).encode("utf-8"))
+        surface_cache[:] = [(blueprint, encoded)]
+        return encoded
+
+    def get_service() -> ConnectHubService:
+        if resolved:
+            return resolved[0]
+        with resolve_lock:
+            if resolved:
+                return resolved[0]
+            return prepare(_default_service(snapshot))
+
+    job_directory = job_dir or os.environ.get(JOB_DIR_ENV)
+
+    def get_job_runner(svc: ConnectHubService) -> "JobRunner":
+        with resolve_lock:
+            if not job_runners:
+                from .jobs import JobRunner
+
+                job_runners.append(JobRunner(svc, job_directory))  # type: ignore[arg-type]
+            return job_runners[0]
+
+    if service is not None:
+        prepare(service)
+        # a long-lived app built around its service precompresses up front; the
+        # deferred default service leaves that to the first request that needs it
+        _dashboard_head_gzip()
+        surface_body(service)
+
+    def dispatch(environ: dict, start_response: Callable) -> Iterable[bytes]:
         path = environ.get("PATH_INFO", "")
+        if path in {"/api/metrics", "/api/metrics/slowest"}:
+            return metrics_endpoint(path, start_response)
+        if path.startswith(STATIC_PREFIX):
+            return static_endpoint(environ, start_response)
+        svc = get_service()
         if path in {"", "/"}:
-            body = render_dashboard(svc)
-            start_response("200 OK", [HTML_CONTENT_TYPE])
-            return [body.encode("utf-8")]
+            return _send_dashboard(environ, start_response, svc)
+        if path == "/live":
+            from .compression import negotiate
+
+            body, encoding = live_dashboard_shell().select(negotiate(environ.get("HTTP_ACCEPT_ENCODING")))
+            return _send(start_response, HTML_CONTENT_TYPE, body, encoding)
         if path == "/api/events":
             body = json.dumps(events_payload(svc), default=str)
-            start_response("200 OK", [JSON_CONTENT_TYPE])
-            return [body.encode("utf-8")]
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
+        if path == "/api/events/changes":
+            since = _query_int(environ, "since", default=0)
+            if since is None or since < 0:
+                return _json_response(start_response, 400, {"error": "since must be a non-negative integer"})
+            body = json.dumps(event_changes_payload(svc, since), default=str)
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
         if path == "/api/dashboard":
-            body = json.dumps(dashboard_payload(svc), default=str)
-            start_response("200 OK", [JSON_CONTENT_TYPE])
-            return [body.encode("utf-8")]
+            payload = dashboard_payload(svc, detectors[0] if detectors else None, desks[0] if desks else None)
+            body = json.dumps(payload, default=str)
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
         if path == "/api/surface":
-            body = json.dumps(surface_payload(svc), ensure_ascii=False)
-            start_response("200 OK", [JSON_CONTENT_TYPE])
-            return [body.encode("utf-8")]
+            from .compression import negotiate
+
+            encoded, encoding = surface_body(svc).select(negotiate(environ.get("HTTP_ACCEPT_ENCODING")))
+            return _send(start_response, JSON_CONTENT_TYPE, encoded, encoding)
+        if path.startswith(EXPORTS_PREFIX + "/"):
+            return export_stream_endpoint(svc, path, start_response)
+        if path == "/api/search":
+            query = _query(environ).get("q", [""])[0].strip()
+            limit = _query_int(environ, "limit", default=SEARCH_LIMIT)
+            if not query or limit is None or not 1 <= limit <= MAX_SEARCH_LIMIT:
+                error = f"q is required and limit must be between 1 and {MAX_SEARCH_LIMIT}"
+                return _json_response(start_response, 400, {"error": error})
+            body = json.dumps(search_payload(svc, query, limit), default=str, ensure_ascii=False)
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
+        if path.startswith("/api/anomalies") and not detectors:
+            return _json_response(start_response, 404, {"error": "anomaly detection is not enabled"})
+        if path == "/api/anomalies":
+            limit = _query_int(environ, "limit", default=MAX_SEARCH_LIMIT)
+            if limit is None or limit < 1:
+                return _json_response(start_response, 400, {"error": "limit must be a positive integer"})
+            body = json.dumps(anomalies_payload(detectors[0], limit), default=str)
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
+        if path == "/api/anomalies/dismiss":
+            return dismiss_endpoint(detectors[0], environ, start_response)
+        if path == "/api/recommendations":
+            participant_id = _query(environ).get("participant_id", [""])[0].strip()
+            limit = _query_int(environ, "limit", default=RECOMMENDATION_LIMIT)
+            if not participant_id or limit is None or not 1 <= limit <= MAX_RECOMMENDATION_LIMIT:
+                error = f"participant_id is required and limit must be between 1 and {MAX_RECOMMENDATION_LIMIT}"
+                return _json_response(start_response, 400, {"error": error})
+            body = json.dumps(recommendations_payload(svc, participant_id, limit), ensure_ascii=False)
+            return _send_dynamic(environ, start_response, JSON_CONTENT_TYPE, body.encode("utf-8"))
+        if path == "/api/recommendations/stats":
+            cache = svc.recommendation_cache
+            return _json_response(start_response, 200, cache.stats() if cache is not None else {"enabled": False})
+        if path == CHECKIN_PREFIX or path.startswith(CHECKIN_PREFIX + "/"):
+            if not desks:
+                return _json_response(start_response, 404, {"error": "check-in is not enabled"})
+            return checkin_endpoint(desks[0], environ, start_response)
+        if path == JOBS_PREFIX or path.startswith(JOBS_PREFIX + "/"):
+            if not job_directory:
+                return _json_response(start_response, 404, {"error": "background jobs are not enabled"})
+            return jobs_endpoint(get_job_runner(svc), environ, start_response)
+        if path == "/api/registrations":
+            if environ.get("REQUEST_METHOD", "GET") != "POST":
+                return _json_response(start_response, 405, {"error": "use POST"}, [("Allow", "POST")])
+            return register_endpoint(svc, environ, start_response, admission, desks[0] if desks else None)
+        if path.startswith(REGISTRATIONS_PREFIX + "/"):
+            return cancel_endpoint(svc, path, environ, start_response)
+        if path == "/api/feedback":
+            return feedback_endpoint(svc, environ, start_response)
+        if path == MATCHES_PREFIX or path.startswith(MATCHES_PREFIX + "/"):
+            return matches_endpoint(svc, path, environ, start_response)
         start_response("404 Not Found", [HTML_CONTENT_TYPE])
         return [b"<h1>404 Not Found</h1>"]
 
+    def metrics_endpoint(path: str, start_response: Callable) -> Iterable[bytes]:
+        if path == "/api/metrics":
+            body = metrics.render_prometheus() if metrics is not None else ""
+            start_response("200 OK", [PROMETHEUS_CONTENT_TYPE])
+            return [body.encode("utf-8")]
+        profiler = metrics.profiler if metrics is not None else None
+        body = profiler.dump() if profiler is not None else ""
+        start_response("200 OK", [TEXT_CONTENT_TYPE])
+        return [body.encode("utf-8")]
+
+    from .tracing import log_trace, tracing
+
+    def traced(environ: dict, start_response: Callable) -> Iterable[bytes]:
+        with tracing(_route_label(environ.get("PATH_INFO", ""))) as current:
+
+            def start_traced_response(status: str, headers: list, exc_info: object = None) -> Callable:
+                headers = list(headers) + [("Server-Timing", current.server_timing())]
+                if exc_info is None:
+                    return start_response(status, headers)
+                return start_response(status, headers, exc_info)
+
+            result = dispatch(environ, start_traced_response)
+        log_trace(current)
+        return result
+
+    handler = traced if trace else dispatch
+    if not instrumented:
+        return handler
+
+    def app(environ: dict, start_response: Callable) -> Iterable[bytes]:
+        label = _route_label(environ.get("PATH_INFO", ""))
+        profiler = metrics.profiler
+        if profiler is not None:
+            profiler.begin(label)
+        started = time.perf_counter()
+        failed = False
+        try:
+            return handler(environ, start_response)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            metrics.observe("http", label, time.perf_counter() - started, error=failed)
+            if profiler is not None:
+                profiler.end()
+
     return app
 
 
 def run(host: str = "0.0.0.0", port: int = 8000) -> None:  # pragma: no cover - convenience wrapper
+    from wsgiref.simple_server import make_server
+
     with make_server(host, port, create_app()) as server:
         print(f"Serving Connect Hub MVP on http://{host}:{port}")
         server.serve_forever()
@@ -0,0 +1,86 @@
+"""Activity-report latency from sketches versus scanning every registration.
+
+Feeds ``registrations`` records spread over half a year straight into the
+rollups, then times 30-day and 180-day reports against the exact scan a
+report would otherwise need. Run with
+``python -m benchmarks.bench_analytics [registrations]``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.analytics import ActivityAnalytics
+from app.models import Registration
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 200
+DAYS = 180
+
+
+def scan(records: list, start: datetime, end: datetime) -> int:
+    return len({record.participant_id for record in records if start <= record.registered_at < end})
+
+
+def main(count: int = 500_000) -> None:
+    svc = ConnectHubService()
+    first_day = datetime(2030, 1, 1, tzinfo=UTC)
+    svc.create_events(
+        {
+            "event_id": f"evt-{index}",
+            "name": f"Session {index}",
+            "category": f"cat-{index % 8}",
+            "mode": "online",
+            "start_at": first_day,
+            "end_at": first_day + timedelta(hours=2),
+            "capacity": 100,
+        }
+        for index in range(EVENTS)
+    )
+    rng = random.Random(3)
+    records = [
+        Registration(
+            id=str(index),
+            event_id=f"evt-{rng.randrange(EVENTS)}",
+            participant_id=f"p-{rng.randrange(count // 3)}",
+            status="confirmed",
+            registered_at=first_day + timedelta(seconds=rng.randrange(DAYS * 86_400)),
+        )
+        for index in range(count)
+    ]
+    analytics = ActivityAnalytics(svc)
+    began = time.perf_counter()
+    for record in records:
+        analytics.on_change("registration.created", record)
+    elapsed = time.perf_counter() - began
+    print(f"ingested {count:,} registrations in {elapsed:.1f}s ({elapsed / count * 1e6:.1f} us each)")
+    tracemalloc.start()
+    sized = ActivityAnalytics(svc)
+    for record in records:
+        sized.on_change("registration.created", record)
+    print(f"rollups hold {tracemalloc.get_traced_memory()[0] / 2**20:.1f} MiB in {len(sized):,} cells")
+    tracemalloc.stop()
+    del sized
+
+    for days in (30, 180):
+        start = first_day + timedelta(days=17)
+        end = start + timedelta(days=days)
+        began = time.perf_counter()
+        report = analytics.activity(start=start.date(), end=end.date())
+        sketch_ms = (time.perf_counter() - began) * 1000
+        began = time.perf_counter()
+        exact = scan(records, start, end)
+        scan_ms = (time.perf_counter() - began) * 1000
+        error = abs(report.unique_participants - exact) / exact * 100
+        print(
+            f"{days:3}-day window: sketch {sketch_ms:7.2f} ms ({report.buckets} cells)  "
+            f"scan {scan_ms:8.1f} ms  distinct {report.unique_participants:,} vs {exact:,} ({error:.2f}% off)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
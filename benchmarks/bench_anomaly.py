@@ -0,0 +1,76 @@
+"""Registration latency with and without the anomaly detector, plus drain throughput.
+
+Run with ``python -m benchmarks.bench_anomaly [attempts]``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.anomaly import AnomalyDetector
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 500
+
+
+def build() -> ConnectHubService:
+    svc = ConnectHubService(schedule_policy="off", venue_policy="off")
+    start = datetime.now(UTC) + timedelta(days=1)
+    svc.create_events(
+        {
+            "event_id": f"evt-{index}",
+            "name": f"Session {index}",
+            "category": "talk",
+            "mode": "online",
+            "start_at": start,
+            "end_at": start + timedelta(hours=2),
+            "capacity": 2_000,
+        }
+        for index in range(EVENTS)
+    )
+    return svc
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(attempts: int, detect: bool) -> None:
+    svc = build()
+    detector = AnomalyDetector.attach(svc) if detect else None
+    rng = random.Random(5)
+    samples = []
+    failures = 0
+    for _ in range(attempts):
+        # a skewed mix: a few hot events fill up and some participants retry
+        event_id = f"evt-{min(int(rng.paretovariate(0.8)) - 1, EVENTS - 1)}"
+        participant_id = f"p-{rng.randrange(attempts // 4)}"
+        began = time.perf_counter()
+        try:
+            svc.register_participant(event_id=event_id, participant_id=participant_id)
+        except ValueError:
+            failures += 1
+        samples.append((time.perf_counter() - began) * 1_000_000)
+    label = "detector" if detect else "no detector"
+    print(
+        f"{label:12} {attempts:,} attempts ({failures:,} failed)  "
+        f"p50 {percentile(samples, 0.5):6.1f} us  p99 {percentile(samples, 0.99):6.1f} us"
+    )
+    if detector is not None:
+        began = time.perf_counter()
+        processed = detector.drain()
+        elapsed = time.perf_counter() - began
+        print(f"{'':12} drained {processed:,} attempts at {processed / elapsed:,.0f}/s, {len(detector.flags())} flags")
+
+
+def main(attempts: int = 100_000) -> None:
+    for detect in (False, True, False, True):
+        run(attempts, detect)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
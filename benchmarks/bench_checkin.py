@@ -0,0 +1,93 @@
+"""Door check-in throughput: live scans, repeated scans and offline batch sync.
+
+Registers ``attendees`` participants across a handful of events, then times
+signed-ticket check-ins against the scan a naive lookup through
+``list_registrations`` would need. Run with
+``python -m benchmarks.bench_checkin [attendees]``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.checkin import CheckInDesk
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 8
+BATCH = 500
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(attendees: int = 100_000) -> None:
+    svc = ConnectHubService(schedule_policy="off", venue_policy="off")
+    start = datetime.now(UTC) + timedelta(hours=1)
+    events = svc.create_events(
+        {
+            "name": f"Hall {index}",
+            "category": "talk",
+            "mode": "online",
+            "start_at": start,
+            "end_at": start + timedelta(hours=3),
+            "capacity": attendees,
+        }
+        for index in range(EVENTS)
+    )
+    event_ids = [event.id for event in events]  # type: ignore[union-attr]
+    svc.register_participants((event_ids[index % EVENTS], f"p-{index}") for index in range(attendees))
+    desk = CheckInDesk(svc, secret=b"bench")
+    tickets = [
+        (event_ids[index % EVENTS], desk.issue(event_id=event_ids[index % EVENTS], participant_id=f"p-{index}"))
+        for index in range(attendees)
+    ]
+    print(f"{attendees:,} tickets, {sum(len(token) for _, token in tickets) / attendees:.0f} characters each")
+    rng = random.Random(9)
+    order = list(range(attendees))
+    rng.shuffle(order)
+    live, offline = order[: attendees // 2], order[attendees // 2 :]
+
+    for label in ("first scans", "repeat scans"):
+        samples = []
+        began = time.perf_counter()
+        for index in live:
+            event_id, token = tickets[index]
+            scanned = time.perf_counter()
+            desk.check_in(token, event_id=event_id)
+            samples.append((time.perf_counter() - scanned) * 1_000_000)
+        elapsed = time.perf_counter() - began
+        print(
+            f"{label:13} {len(live) / elapsed * 60:12,.0f} scans/min  "
+            f"p50 {percentile(samples, 0.5):5.1f} us  p99 {percentile(samples, 0.99):5.1f} us"
+        )
+
+    now = datetime.now(UTC)
+    scans = [
+        {"token": tickets[index][1], "scanned_at": (now - timedelta(seconds=rng.randrange(600))).isoformat()}
+        for index in offline
+    ]
+    batches = [scans[offset : offset + BATCH] for offset in range(0, len(scans), BATCH)]
+    began = time.perf_counter()
+    for number, batch in enumerate(batches):
+        desk.sync(f"gate-{number % 4}", batch)
+    elapsed = time.perf_counter() - began
+    print(f"{'offline sync':13} {len(offline) / elapsed * 60:12,.0f} scans/min  in batches of {BATCH}")
+    overview = desk.overview()
+    print(f"{'':13} {overview['checked_in']:,} checked in from {overview['scans']:,} scans")
+
+    sample = live[:200]
+    began = time.perf_counter()
+    for index in sample:
+        event_id, _ = tickets[index]
+        svc.list_registrations(event_id=event_id, participant_id=f"p-{index}", status="confirmed")
+    elapsed = time.perf_counter() - began
+    print(f"{'scan lookup':13} {len(sample) / elapsed * 60:12,.0f} lookups/min  (list_registrations per ticket)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,77 @@
+"""Registration latency with schedule-conflict checks off versus on.
+
+Each participant registers for ``per_participant`` events spread over a year
+of half-day slots at a handful of venues, so the warn run pays for a real
+interval-tree lookup on every call. Run with
+``python -m benchmarks.bench_conflicts [participants] [per_participant]``.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 2_000
+VENUES = 40
+
+
+def build(policy: str) -> ConnectHubService:
+    svc = ConnectHubService(schedule_policy=policy, venue_policy=policy)
+    start = datetime.now(UTC) + timedelta(days=1)
+    svc.create_events(
+        {
+            "event_id": f"evt-{index}",
+            "name": f"Session {index}",
+            "category": "talk",
+            "mode": "onsite",
+            "start_at": start + timedelta(hours=12 * (index // VENUES)),
+            "end_at": start + timedelta(hours=12 * (index // VENUES) + 3),
+            "capacity": 100_000,
+            "location": f"Room {index % VENUES}",
+        }
+        for index in range(EVENTS)
+    )
+    return svc
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(policy: str, participants: int, per_participant: int) -> None:
+    svc = build(policy)
+    rng = random.Random(11)
+    pairs = [
+        (f"evt-{event}", f"p-{participant}")
+        for participant in range(participants)
+        for event in rng.sample(range(EVENTS), per_participant)
+    ]
+    rng.shuffle(pairs)
+    samples = []
+    for event_id, participant_id in pairs:
+        began = time.perf_counter()
+        svc.register_participant(event_id=event_id, participant_id=participant_id)
+        samples.append((time.perf_counter() - began) * 1_000_000)
+    print(
+        f"{policy:4}  {len(pairs):,} registrations  "
+        f"mean {sum(samples) / len(samples):6.1f} us  p50 {percentile(samples, 0.5):6.1f} us  "
+        f"p99 {percentile(samples, 0.99):6.1f} us"
+    )
+
+
+def main(participants: int = 2_000, per_participant: int = 20) -> None:
+    # warn mode logs every clash; keep the handler cost out of the measurement
+    logging.getLogger("app.conflicts").disabled = True
+    for policy in ("off", "warn", "off", "warn"):
+        run(policy, participants, per_participant)
+
+
+if __name__ == "__main__":
+    args = [int(value) for value in sys.argv[1:3]]
+    main(*args)
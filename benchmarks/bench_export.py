@@ -0,0 +1,78 @@
+"""Export throughput and peak memory for millions of registrations.
+
+Run with ``python -m benchmarks.bench_export [rows]``.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.export import write_export
+from app.models import Registration
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+REGISTRATIONS_PER_EVENT = 500
+
+
+def build_service(rows: int) -> ConnectHubService:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event_ids = [
+        svc.create_event(
+            name=f"Event {idx}",
+            category="workshop",
+            mode="online",
+            start_at=start,
+            end_at=start + timedelta(hours=1),
+            capacity=REGISTRATIONS_PER_EVENT,
+        ).id
+        for idx in range(max(rows // REGISTRATIONS_PER_EVENT, 1))
+    ]
+    store = svc._registrations
+    for idx in range(rows):
+        registration_id = f"reg-{idx:08d}"
+        store[registration_id] = Registration(
+            id=registration_id,
+            event_id=event_ids[idx % len(event_ids)],
+            participant_id=f"participant-{idx // 3:08d}",
+            status="confirmed",
+            registered_at=start + timedelta(microseconds=idx),
+        )
+    return svc
+
+
+def measure(svc: ConnectHubService, fmt: str, path: str) -> tuple[float, int, int]:
+    gc.collect()
+    started = time.perf_counter()
+    write_export(svc, "registrations", fmt, path)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path)
+    # second pass under tracemalloc: its overhead would skew the timing
+    gc.collect()
+    tracemalloc.start()
+    write_export(svc, "registrations", fmt, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main(rows: int = 1_000_000) -> None:
+    print(f"building {rows:,} registrations...")
+    svc = build_service(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in ("csv", "chcol"):
+            elapsed, size, peak = measure(svc, fmt, os.path.join(directory, f"registrations.{fmt}"))
+            print(
+                f"{fmt:5}: {rows / elapsed:12,.0f} rows/s  {size / 2**20:8.1f} MiB on disk  "
+                f"peak {peak / 2**20:6.1f} MiB allocated"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
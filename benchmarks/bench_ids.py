@@ -0,0 +1,89 @@
+"""Identifier generation cost and listing with and without the timestamp sort.
+
+Compares random UUID4 strings with time-ordered ULIDs for mint time and the
+memory of an id -> row index, then times ``list_registrations`` and
+``list_matches`` on the insertion-ordered path against the sort they used to
+need. Run with ``python -m benchmarks.bench_ids [records]``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.ids import TimeOrderedIds, random_ids
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 50
+ROUNDS = 5
+
+
+def mint(count: int) -> None:
+    for label, generate in (("uuid4", random_ids), ("ulid", TimeOrderedIds())):
+        began = time.perf_counter()
+        ids = [generate() for _ in range(count)]
+        elapsed = time.perf_counter() - began
+        tracemalloc.start()
+        index = {value: row for row, value in enumerate(ids)}
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        strings = sum(sys.getsizeof(value) for value in ids)
+        began = time.perf_counter()
+        for value in ids:
+            index[value]
+        lookup = time.perf_counter() - began
+        print(
+            f"{label:6} mint {elapsed / count * 1e6:5.2f} us  {len(ids[0])} chars  "
+            f"{(strings + size) / count:5.1f} B/id with index  lookup {lookup / count * 1e9:4.0f} ns"
+        )
+
+
+def best(call: object) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        began = time.perf_counter()
+        call()  # type: ignore[operator]
+        timings.append(time.perf_counter() - began)
+    return min(timings) * 1000
+
+
+def listings(count: int) -> None:
+    svc = ConnectHubService(schedule_policy="off", venue_policy="off")
+    start = datetime.now(UTC) + timedelta(days=1)
+    events = svc.create_events(
+        {
+            "name": f"Room {index}",
+            "category": "talk",
+            "mode": "online",
+            "start_at": start,
+            "end_at": start + timedelta(hours=2),
+            "capacity": count,
+        }
+        for index in range(EVENTS)
+    )
+    event_ids = [event.id for event in events]  # type: ignore[union-attr]
+    svc.register_participants((event_ids[index % EVENTS], f"p-{index}") for index in range(count))
+    for index in range(count // 10):
+        svc.create_match(opportunity_id=f"o-{index}", talent_id=f"t-{index}", recommended_score=0.5)
+    cases = {
+        "list_registrations": lambda: svc.list_registrations(),
+        "  one event": lambda: svc.list_registrations(event_id=event_ids[0]),
+        "list_matches": lambda: svc.list_matches(),
+    }
+    ordered = {label: best(call) for label, call in cases.items()}
+    svc._registrations.time_ordered = False
+    svc._matches_in_order = False
+    for label, call in cases.items():
+        sorted_ms = best(call)
+        print(f"{label:20} in order {ordered[label]:8.2f} ms  sorted {sorted_ms:8.2f} ms")
+
+
+def main(count: int = 200_000) -> None:
+    mint(count)
+    listings(count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,73 @@
+"""Bulk import throughput and transient memory, showing the pipeline stays flat.
+
+Run with ``python -m benchmarks.bench_import [rows] [workers]``.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.importer import import_file
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+REGISTRATIONS_PER_EVENT = 1_000
+
+
+def write_rows(path: str, rows: int, event_ids: list) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for idx in range(rows):
+            row = {"event_id": event_ids[idx % len(event_ids)], "participant_id": f"participant-{idx:08d}"}
+            handle.write(json.dumps(row) + "\n")
+
+
+def run(rows: int, workers: int, directory: str) -> tuple[float, float, float]:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    events = [
+        {
+            "name": f"Event {idx}",
+            "category": "workshop",
+            "mode": "online",
+            "start_at": start,
+            "end_at": start + timedelta(hours=1),
+            "capacity": REGISTRATIONS_PER_EVENT,
+        }
+        for idx in range(max(rows // REGISTRATIONS_PER_EVENT, 1))
+    ]
+    event_ids = [event.id for event in svc.create_events(events)]  # type: ignore[union-attr]
+    path = os.path.join(directory, f"registrations-{rows}.ndjson")
+    write_rows(path, rows, event_ids)
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    report = import_file(svc, path, kind="registrations", workers=workers)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert report.imported == rows, report.errors[:3]
+    # peak minus what the service keeps is what the pipeline itself needed
+    return rows / elapsed, retained / 2**20, (peak - retained) / 2**20
+
+
+def main(rows: int = 1_000_000, workers: int = 0) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (rows // 10, rows):
+            throughput, retained, transient = run(count, workers, directory)
+            print(
+                f"{count:>10,} rows: {throughput:10,.0f} rows/s (under tracemalloc)  "
+                f"service {retained:7.1f} MiB  pipeline peak {transient:5.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 0,
+    )
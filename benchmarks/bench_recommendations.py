@@ -0,0 +1,95 @@
+"""Personal-page latency with the recommendation cache on and off.
+
+Serves ``visits`` requests for ``/api/recommendations`` through the WSGI app
+over a catalog of ``EVENTS`` events, from a skewed population of returning
+participants, with a share of the visits followed by a registration so
+invalidation is exercised. Run with
+``python -m benchmarks.bench_recommendations [visits]``.
+"""
+from __future__ import annotations
+
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.service import ConnectHubService
+from app.web import create_app
+
+UTC = timezone.utc
+EVENTS = 5_000
+PARTICIPANTS = 2_000
+WRITE_SHARES = (0.0, 0.01, 0.1)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def build(cache_size: int) -> ConnectHubService:
+    svc = ConnectHubService(schedule_policy="off", venue_policy="off", recommendation_cache_size=cache_size)
+    start = datetime.now(UTC) + timedelta(days=1)
+    rng = random.Random(2)
+    svc.create_events(
+        {
+            "name": f"Session {index}",
+            "category": "talk",
+            "mode": "online",
+            "start_at": start + timedelta(hours=rng.randrange(24 * 60)),
+            "end_at": start + timedelta(days=61),
+            "capacity": 50,
+        }
+        for index in range(EVENTS)
+    )
+    return svc
+
+
+def run(visits: int, cache_size: int, write_share: float) -> None:
+    svc = build(cache_size)
+    app = create_app(svc)
+    event_ids = [event.id for event in svc.list_events()]
+    rng = random.Random(8)
+    samples = []
+
+    def start_response(status: str, headers: list, exc_info: object = None) -> None:
+        return None
+
+    for _ in range(visits):
+        participant = f"p-{min(int(rng.paretovariate(1.2)), PARTICIPANTS)}"
+        environ = {
+            "PATH_INFO": "/api/recommendations",
+            "QUERY_STRING": f"participant_id={participant}&limit=5",
+            "REQUEST_METHOD": "GET",
+            "wsgi.input": io.BytesIO(),
+        }
+        began = time.perf_counter()
+        b"".join(app(environ, start_response))
+        samples.append((time.perf_counter() - began) * 1_000_000)
+        if rng.random() < write_share:
+            try:
+                svc.register_participant(event_id=rng.choice(event_ids), participant_id=participant)
+            except ValueError:
+                pass
+    label = "cache on" if cache_size else "cache off"
+    line = (
+        f"{label:9} writes {write_share:4.0%}  p50 {percentile(samples, 0.5):8.1f} us  "
+        f"p99 {percentile(samples, 0.99):8.1f} us"
+    )
+    cache = svc.recommendation_cache
+    if cache is not None:
+        stats = cache.stats()
+        line += f"  hit rate {stats['hit_rate']:.1%}  evictions {stats['evictions']}"
+        line += f"  invalidations {stats['invalidations']}"
+    print(line)
+
+
+def main(visits: int = 5_000) -> None:
+    for write_share in WRITE_SHARES:
+        for cache_size in (0, 1_024):
+            run(visits, cache_size, write_share)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,80 @@
+"""Compare memory per million registrations: dict of dataclasses vs. columnar store.
+
+Run with ``python -m benchmarks.bench_registration_storage [count]``.
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Tuple
+from uuid import uuid4
+
+from app.models import Registration
+from app.storage import RegistrationStore
+
+UTC = timezone.utc
+PARTICIPANTS_PER_REGISTRATION = 4
+
+
+def _fill_dicts(count: int, event_ids: list, participant_ids: list) -> object:
+    registrations: Dict[str, Registration] = {}
+    index: Dict[Tuple[str, str], str] = {}
+    start = datetime.now(UTC)
+    for idx in range(count):
+        registration_id = str(uuid4())
+        event_id = event_ids[idx % len(event_ids)]
+        # participant ids arrive as fresh strings from request payloads
+        participant_id = "".join(participant_ids[idx % len(participant_ids)])
+        registrations[registration_id] = Registration(
+            id=registration_id,
+            event_id=event_id,
+            participant_id=participant_id,
+            status="confirmed",
+            registered_at=start + timedelta(microseconds=idx),
+        )
+        index[(event_id, participant_id)] = registration_id
+    return registrations, index
+
+
+def _fill_store(count: int, event_ids: list, participant_ids: list) -> object:
+    store = RegistrationStore()
+    start = datetime.now(UTC)
+    for idx in range(count):
+        registration_id = str(uuid4())
+        store[registration_id] = Registration(
+            id=registration_id,
+            event_id=event_ids[idx % len(event_ids)],
+            participant_id="".join(participant_ids[idx % len(participant_ids)]),
+            status="confirmed",
+            registered_at=start + timedelta(microseconds=idx),
+        )
+    return store
+
+
+def measure(fill: Callable[[int, list, list], object], count: int) -> float:
+    event_ids = [str(uuid4()) for _ in range(max(count // 500, 1))]
+    participant_ids = [tuple(str(uuid4())) for _ in range(max(count // PARTICIPANTS_PER_REGISTRATION, 1))]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = fill(count, event_ids, participant_ids)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def main(count: int = 200_000) -> None:
+    baseline = measure(_fill_dicts, count)
+    compact = measure(_fill_store, count)
+    print(f"registrations measured: {count:,}")
+    print(f"dict + dataclass : {baseline:8.1f} B/record  {baseline * 1e6 / 2**20:8.1f} MiB per million")
+    print(f"RegistrationStore: {compact:8.1f} B/record  {compact * 1e6 / 2**20:8.1f} MiB per million")
+    print(f"reduction        : {1 - compact / baseline:8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
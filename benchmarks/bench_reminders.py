@@ -0,0 +1,83 @@
+"""Scheduling, cancelling and dispatching millions of pending reminders.
+
+Run with ``python -m benchmarks.bench_reminders [registrations]``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.models import Registration
+from app.scheduler import Notification, ReminderScheduler
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+EVENTS = 1_000
+
+
+class CountingSender:
+    def __init__(self) -> None:
+        self.batches = 0
+
+    def send(self, notifications: List[Notification]) -> None:
+        self.batches += 1
+
+
+def main(registrations: int = 1_000_000) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    svc = ConnectHubService()
+    events = svc.create_events(
+        {
+            "name": f"Event {idx}",
+            "category": "workshop",
+            "mode": "online",
+            "start_at": now + timedelta(days=2, minutes=idx),
+            "end_at": now + timedelta(days=2, minutes=idx, hours=1),
+            "capacity": registrations,
+        }
+        for idx in range(EVENTS)
+    )
+    sender = CountingSender()
+    scheduler = ReminderScheduler(svc, sender, clock=lambda: now)
+    records = [
+        Registration(
+            id=f"reg-{idx}",
+            event_id=events[idx % EVENTS].id,  # type: ignore[union-attr]
+            participant_id=f"p-{idx}",
+            status="confirmed",
+            registered_at=now,
+        )
+        for idx in range(registrations)
+    ]
+
+    started = time.perf_counter()
+    for record in records:
+        scheduler.on_change("registration.created", record)
+    elapsed = time.perf_counter() - started
+    print(f"scheduled {len(scheduler):,} reminders in {elapsed:.2f}s ({len(scheduler) / elapsed:,.0f}/s)")
+
+    cancelled = records[: registrations // 10]
+    started = time.perf_counter()
+    for record in cancelled:
+        record.status = "cancelled"
+        scheduler.on_change("registration.updated", record)
+    elapsed = time.perf_counter() - started
+    print(f"cancelled {len(cancelled):,} registrations in {elapsed:.2f}s ({elapsed / len(cancelled) * 1e6:.1f} µs each)")
+
+    # one minute of wall clock per run, across a day with nothing due
+    started = time.perf_counter()
+    for minute in range(1, 24 * 60):
+        scheduler.run_due(now + timedelta(minutes=minute))
+    elapsed = time.perf_counter() - started
+    print(f"1,439 idle minute ticks with {len(scheduler):,} pending: {elapsed * 1000:.1f} ms total")
+
+    started = time.perf_counter()
+    sent = scheduler.run_due(now + timedelta(days=3))
+    elapsed = time.perf_counter() - started
+    print(f"dispatched {sent:,} reminders in {sender.batches:,} batches in {elapsed:.2f}s ({sent / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,60 @@
+"""Full-text search latency over 100k events with mixed Chinese/English text.
+
+Run with ``python -m benchmarks.bench_search [events]``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+CHINESE = ["人工智慧", "媒合", "工作坊", "黑客松", "讀書會", "創業", "開源", "社群", "雲端", "資料科學", "設計思考", "產品"]
+ENGLISH = ["ai", "matching", "workshop", "hackathon", "startup", "open", "source", "cloud", "data", "design", "python"]
+QUERIES = ["人工智慧", "黑客松 python", "資料科學工作坊", "open source", "雲端 startup", "設計", "matching ai"]
+
+
+def build(count: int, rng: random.Random) -> ConnectHubService:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    payloads = (
+        {
+            "name": "".join(rng.sample(CHINESE, 2)) + " " + " ".join(rng.sample(ENGLISH, 2)),
+            "category": "workshop",
+            "mode": "online",
+            "start_at": start,
+            "end_at": start + timedelta(hours=2),
+            "capacity": 50,
+            "tags": rng.sample(ENGLISH, 2),
+            "description": "，".join(rng.sample(CHINESE, 4)) + ". " + " ".join(rng.sample(ENGLISH, 4)),
+        }
+        for _ in range(count)
+    )
+    svc.create_events(payloads)
+    return svc
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(count: int = 100_000, rounds: int = 50) -> None:
+    rng = random.Random(7)
+    started = time.perf_counter()
+    svc = build(count, rng)
+    print(f"indexed {count:,} events in {time.perf_counter() - started:.1f}s (create_event + index)")
+    for query in QUERIES:
+        samples = []
+        for _ in range(rounds):
+            began = time.perf_counter()
+            svc.search_events(query, limit=10)
+            samples.append((time.perf_counter() - began) * 1000)
+        print(f"{query:12}  p50 {percentile(samples, 0.5):7.2f} ms  p99 {percentile(samples, 0.99):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,71 @@
+"""Throughput of a registration-heavy mix against 1..N process shards.
+
+Scaling needs at least as many free cores as shards.
+
+Run with ``python -m benchmarks.bench_sharding [events] [ops]``.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.service import ConnectHubService
+from app.sharding import ShardedConnectHubService
+
+UTC = timezone.utc
+CLIENTS = 8
+DASHBOARD_EVERY = 10
+
+
+def _seed(svc: object, events: int) -> List[str]:
+    start = datetime.now(UTC) + timedelta(days=1)
+    return [
+        svc.create_event(  # type: ignore[attr-defined]
+            name=f"Event {idx}",
+            category=f"cat-{idx % 7}",
+            mode="onsite",
+            start_at=start + timedelta(minutes=idx),
+            end_at=start + timedelta(minutes=idx, hours=1),
+            capacity=1_000_000,
+        ).id
+        for idx in range(events)
+    ]
+
+
+def _drive(svc: object, event_ids: List[str], ops: int) -> float:
+    per_client = ops // CLIENTS
+
+    def client(worker: int) -> None:
+        for idx in range(per_client):
+            if idx % DASHBOARD_EVERY == 0:
+                svc.dashboard()  # type: ignore[attr-defined]
+            else:
+                svc.register_participant(  # type: ignore[attr-defined]
+                    event_id=event_ids[(worker * per_client + idx) % len(event_ids)],
+                    participant_id=f"user-{worker}-{idx}",
+                )
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(CLIENTS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_client * CLIENTS / (time.perf_counter() - started)
+
+
+def main(events: int = 20_000, ops: int = 8_000) -> None:
+    print(f"events={events:,} ops={ops:,} clients={CLIENTS} (1 dashboard per {DASHBOARD_EVERY} ops)")
+    baseline = ConnectHubService()
+    print(f"single service      : {_drive(baseline, _seed(baseline, events), ops):10,.0f} ops/s")
+    for shards in (1, 2, 4, 8):
+        with ShardedConnectHubService(shards=shards, processes=True) as sharded:
+            rate = _drive(sharded, _seed(sharded, events), ops)
+        print(f"processes, {shards} shard{'s' if shards > 1 else ' '}: {rate:10,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,60 @@
+"""Cold-start time of a fresh interpreter serving its first request.
+
+Run with ``python -m benchmarks.bench_startup [budget_ms]``; exits non-zero
+when the median of the snapshot-backed start exceeds the budget.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+DEFAULT_BUDGET_MS = 250.0
+RUNS = 7
+
+_FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+from app.web import create_app
+app = create_app()
+app({"PATH_INFO": "/api/events"}, lambda status, headers: None)
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def _median_ms(env: Dict[str, str]) -> float:
+    samples: List[float] = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", _FIRST_REQUEST], capture_output=True, text=True, check=True, env=env
+        )
+        samples.append(float(result.stdout.strip()))
+    return statistics.median(samples)
+
+
+def main(budget_ms: Optional[float] = None) -> int:
+    budget = DEFAULT_BUDGET_MS if budget_ms is None else budget_ms
+    from app.main import bootstrap_demo_service
+    from app.snapshot import save
+
+    base_env = {key: value for key, value in os.environ.items() if key != "CONNECT_HUB_SNAPSHOT"}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.json")
+        save(bootstrap_demo_service(), path)
+        seeded = _median_ms(base_env)
+        from_snapshot = _median_ms({**base_env, "CONNECT_HUB_SNAPSHOT": path})
+
+    print(f"import + first request, demo seed : {seeded:7.2f} ms")
+    print(f"import + first request, snapshot  : {from_snapshot:7.2f} ms")
+    print(f"budget                            : {budget:7.2f} ms")
+    if from_snapshot > budget:
+        print("FAIL: cold start is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else None))
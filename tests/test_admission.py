@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.admission import AdmissionController, AdmissionRejected, BucketTable, ConcurrencyLimiter
+from app.main import bootstrap_demo_service
+from app.web import create_app
+from tests.test_web import _call_app
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_refills_at_rate_and_reports_wait() -> None:
+    table = BucketTable(rate=2.0, burst=2)
+    assert table.take("a", 0.0) == 0
+    assert table.take("a", 0.0) == 0
+    assert table.take("a", 0.0) == pytest.approx(0.5)
+    assert table.take("a", 0.5) == 0
+
+
+def test_bucket_table_evicts_least_recent_keys() -> None:
+    table = BucketTable(rate=1.0, burst=1, max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        table.take(key, 0.0)
+    assert len(table) == 2
+    assert table.evictions == 1
+    assert table.take("b", 0.0) == 0  # forgotten, so refilled
+
+
+def test_controller_limits_participants_events_and_concurrency() -> None:
+    clock = FakeClock()
+    controller = AdmissionController(
+        participant_rate=1, participant_burst=1, event_rate=1, event_burst=2, max_in_flight=1, clock=clock
+    )
+    assert controller.check(participant_id="p1", event_id="e").allowed
+    decision = controller.check(participant_id="p1", event_id="e")
+    assert (decision.allowed, decision.reason) == (False, "participant_rate")
+
+    assert controller.check(participant_id="p2", event_id="e").reason == "overloaded"
+    controller.concurrency.release()
+    # the shed attempt spent neither p2's nor the event's token
+    assert controller.check(participant_id="p2", event_id="e").allowed
+    controller.concurrency.release()
+    assert controller.check(participant_id="p3", event_id="e").reason == "event_rate"
+    clock.now = 1.0
+    assert controller.check(participant_id="p3", event_id="e").allowed
+    assert controller.rejected == {"participant_rate": 1, "event_rate": 1, "overloaded": 1}
+
+
+def test_concurrency_limiter_sheds_instead_of_queueing() -> None:
+    limiter = ConcurrencyLimiter(1)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_registration_endpoint_returns_429_with_retry_after() -> None:
+    controller = AdmissionController(participant_rate=0.5, participant_burst=1, clock=FakeClock())
+    svc = bootstrap_demo_service()
+    app = create_app(svc, admission=controller)
+    event_ids = [event.id for event in svc.list_events()]
+
+    status, _, _ = _call_app(
+        app, "/api/registrations", method="POST", payload={"event_id": event_ids[0], "participant_id": "bot"}
+    )
+    assert status == 201
+    status, headers, body = _call_app(
+        app, "/api/registrations", method="POST", payload={"event_id": event_ids[1], "participant_id": "bot"}
+    )
+    assert status == 429
+    assert headers["Retry-After"] == "2"
+    assert json.loads(body)["error"] == "participant_rate"
+    assert svc.get_event(event_ids[1]).seats_taken == 0
+    assert controller.concurrency.in_flight == 0
+
+
+def test_rejected_call_never_reaches_the_service() -> None:
+    controller = AdmissionController(max_in_flight=1)
+    controller.concurrency.try_acquire()
+    with pytest.raises(AdmissionRejected):
+        controller.call(lambda **_: pytest.fail("service called"), participant_id="p", event_id="e")
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.analytics import ActivityAnalytics, HyperLogLog
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+
+
+def test_hyperloglog_estimates_and_merges_within_error() -> None:
+    small = HyperLogLog(12)
+    for index in range(100):
+        small.add(f"p-{index}")
+        small.add(f"p-{index}")
+    assert abs(small.count() - 100) <= 2
+
+    left, right = HyperLogLog(12), HyperLogLog(12)
+    for index in range(60_000):
+        (left if index % 2 else right).add(f"user-{index}")
+    for index in range(20_000):
+        left.add(f"user-{index}")
+    left.merge(right)
+    assert abs(left.count() - 60_000) / 60_000 < 0.05
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_small_sketches_stay_sparse_until_dense_is_smaller() -> None:
+    sketch = HyperLogLog(12)
+    for index in range(300):
+        sketch.add(f"p-{index}")
+    assert sketch._dense is None and sketch._sparse.itemsize * len(sketch._sparse) < 4096
+    copy = sketch.copy()
+    for index in range(300, 3_000):
+        sketch.add(f"p-{index}")
+    assert sketch._sparse is None and abs(sketch.count() - 3_000) / 3_000 < 0.05
+    copy.merge(sketch)
+    assert copy.count() == sketch.count()
+
+
+def _service_with_activity() -> tuple[ConnectHubService, str, str]:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=30)
+    talk = svc.create_event(
+        name="Talk", category="talk", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=500
+    )
+    lab = svc.create_event(
+        name="Lab", category="lab", mode="online", start_at=start + timedelta(hours=2),
+        end_at=start + timedelta(hours=3), capacity=500,
+    )
+    for index in range(40):
+        svc.register_participant(event_id=talk.id, participant_id=f"p-{index}")
+    for index in range(30, 50):
+        svc.register_participant(event_id=lab.id, participant_id=f"p-{index}")
+    svc.record_feedback(event_id=talk.id, participant_id="p-1", score=4)
+    svc.record_feedback(event_id=talk.id, participant_id="p-99", score=2)
+    return svc, talk.id, lab.id
+
+
+def test_rollups_follow_writes_and_backfill_matches_live_feed() -> None:
+    svc, talk, lab = _service_with_activity()
+    live = ActivityAnalytics.attach(ConnectHubService())
+    assert len(live) == 0
+    backfilled = ActivityAnalytics.attach(svc)
+    exact = ActivityAnalytics.attach(svc, exact=True)
+
+    today = datetime.now(UTC).date()
+    window = {"start": today - timedelta(days=1), "end": today + timedelta(days=1)}
+    report = backfilled.activity(**window)
+    assert (report.registrations, report.feedback, report.average_score) == (60, 2, 3.0)
+    assert abs(report.unique_participants - 51) <= 2
+    assert exact.activity(**window).unique_participants == 51
+    assert exact.activity(category="talk", **window).unique_participants == 41
+    assert exact.activity(event_id=lab, **window).unique_participants == 20
+
+    registration = svc.list_registrations(event_id=talk, participant_id="p-0")[0]
+    svc.cancel_registration(registration.id)
+    svc.register_participant(event_id=talk, participant_id="p-0")
+    after = exact.activity(event_id=talk, **window)
+    assert (after.registrations, after.cancellations, after.exact) == (41, 1, True)
+    assert backfilled.activity(start=today + timedelta(days=1), end=today + timedelta(days=40)).registrations == 0
+
+
+def test_window_keys_use_month_cells_for_whole_months() -> None:
+    keys = list(ActivityAnalytics._window_keys("all", date(2030, 1, 30), date(2030, 4, 2)))
+    kinds = [kind for _, kind, _ in keys]
+    assert kinds == ["d", "d", "m", "m", "d"]
+    assert keys[2][2] == 2030 * 12 + 1
+    with pytest.raises(ValueError):
+        ActivityAnalytics(ConnectHubService()).activity(start=date(2030, 1, 2), end=date(2030, 1, 1))
+
+
+def test_match_approvals_count_once_on_the_approval_day() -> None:
+    svc = ConnectHubService()
+    analytics = ActivityAnalytics.attach(svc)
+    match = svc.create_match(opportunity_id="opp-1", talent_id="tal-1", recommended_score=0.5)
+    svc.update_match_status(match.id, status="approved")
+    svc.update_match_status(match.id, status="approved", notes="confirmed")
+    today = datetime.now(UTC).date()
+    window = {"start": today - timedelta(days=1), "end": today + timedelta(days=1)}
+    assert analytics.activity(**window).matches_approved == 1
+
+    earlier = datetime(2030, 3, 4, 12, tzinfo=UTC)
+    svc._store_match(replace(svc._matches[match.id], approved_at=earlier))
+    backfilled = ActivityAnalytics.attach(svc)
+    assert backfilled.activity(start=date(2030, 3, 4), end=date(2030, 3, 5)).matches_approved == 1
+    assert backfilled.activity(**window).matches_approved == 0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.anomaly import AnomalyDetector, CountMinSketch, RateBaselines, SlidingWindowCounter
+from app.models import RegistrationAttempt
+from app.service import ConnectHubService, RegistrationRejected
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+T0 = datetime(2030, 1, 1, tzinfo=UTC)
+
+
+def _attempt(
+    seconds: float, *, event: str = "evt-1", participant: str = "p-1", outcome: str = "confirmed"
+) -> RegistrationAttempt:
+    at = T0 + timedelta(seconds=seconds)
+    return RegistrationAttempt(event_id=event, participant_id=participant, outcome=outcome, at=at)
+
+
+def test_counters_are_windowed_and_never_undercount() -> None:
+    counter = SlidingWindowCounter(60, 6)
+    for second in range(0, 60, 5):
+        counter.add(second)
+    assert counter.total(59) == 12
+    assert counter.total(90) == 4
+    assert counter.total(1_000) == 0
+
+    sketch = CountMinSketch(width=64, depth=4)
+    for index in range(500):
+        sketch.add(f"k{index % 50}")
+    assert all(sketch.estimate(f"k{index}") >= 10 for index in range(50))
+    assert sketch.add("hot", 40) >= 40
+
+    rates = RateBaselines(bucket_width=10, half_life=20, factor=3, minimum=5)
+    for bucket in range(20):
+        for _ in range(4):
+            assert rates.observe("evt", bucket * 10) is None
+    assert 3 < rates.baseline("evt") < 4.5
+    spikes = [rates.observe("evt", 200) for _ in range(15)]
+    assert [spike for spike in spikes if spike is not None][0][0] == 12
+
+
+def test_detector_flags_spikes_heavy_hitters_and_repeated_failures() -> None:
+    detector = AnomalyDetector(spike_minimum=10, heavy_hitter_minimum=8, heavy_hitter_share=0.3)
+    for index in range(30):
+        detector.observe(_attempt(index * 0.1, participant=f"p-{index}"))
+    for index in range(4):
+        detector.observe(_attempt(4 + index, participant="bot", outcome="duplicate"))
+    for index in range(10):
+        detector.observe(_attempt(8 + index * 0.1, event="evt-2", participant="bot"))
+    flags = {(flag.kind, flag.subject): flag for flag in detector.flags()}
+    assert ("event_spike", "evt-1") in flags
+    assert flags[("duplicate_attempts", "bot")].count >= 3
+    assert ("participant_burst", "bot") in flags and ("heavy_hitter", "bot") in flags
+    assert detector.stats(T0 + timedelta(seconds=10))["window_failures"]["duplicate"] == 4
+
+    assert detector.dismiss("event_spike", "evt-1")
+    assert not detector.dismiss("event_spike", "evt-1")
+    assert detector.flags(limit=1)[0].subject == "bot"
+
+
+def test_failed_registrations_feed_the_detector_and_surface_over_http() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Tiny", category="talk", mode="onsite", start_at=start, end_at=start + timedelta(hours=1), capacity=5
+    )
+    assert _call_app(create_app(svc), "/api/anomalies")[0] == 404
+    assert svc._attempt_listeners == []
+
+    app = create_app(svc, anomalies=AnomalyDetector.attach(svc))
+    svc.register_participant(event_id=event.id, participant_id="p-1")
+    for _ in range(3):
+        with pytest.raises(RegistrationRejected):
+            svc.register_participant(event_id=event.id, participant_id="p-1")
+
+    metrics = json.loads(_call_app(app, "/api/dashboard")[2])
+    assert [flag["kind"] for flag in metrics["flagged_activity"]] == ["duplicate_attempts"]
+    status, _, payload = _call_app(app, "/api/anomalies")
+    body = json.loads(payload)
+    assert status == 200 and body["stats"]["processed"] == 4
+    assert body["stats"]["window_failures"]["duplicate"] == 3
+
+    dismiss = {"kind": "duplicate_attempts", "subject": "p-1"}
+    assert _call_app(app, "/api/anomalies/dismiss", method="POST", payload=dismiss)[0] == 200
+    assert _call_app(app, "/api/anomalies/dismiss", method="POST", payload=dismiss)[0] == 404
+    assert json.loads(_call_app(app, "/api/anomalies")[2])["flags"] == []
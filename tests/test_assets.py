@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import gzip
+import re
+
+from app import assets as assets_module
+from app.assets import IMMUTABLE_CACHE_CONTROL, AssetRegistry
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+
+def test_dashboard_links_hashed_stylesheet() -> None:
+    app = create_app()
+    _, _, page = _call_app(app, "/")
+    html = page.decode("utf-8")
+    assert "<style>" not in html
+    href = re.search(r'href="(/static/dashboard\.[0-9a-f]+\.css)"', html).group(1)
+
+    status, headers, css = _call_app(app, href, headers={"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert headers["Content-Type"].startswith("text/css")
+    assert b".event-card" in gzip.decompress(css)
+
+    status, _, body = _call_app(app, href, headers={"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+    status, headers, _ = _call_app(app, "/static/dashboard.css")
+    assert status == 200 and headers["Cache-Control"] == "no-cache"
+    assert _call_app(app, "/static/dashboard.0000.css")[1]["Cache-Control"] == "no-cache"
+    assert _call_app(app, "/static/../web.py")[0] == 404
+
+
+def test_large_assets_are_streamed_through_file_wrapper(tmp_path, monkeypatch) -> None:
+    (tmp_path / "bundle.js").write_bytes(b"x" * 4096)
+    monkeypatch.setattr(assets_module, "MAX_CACHED_SIZE", 1024)
+    registry = AssetRegistry(tmp_path)
+    monkeypatch.setattr(assets_module, "assets", registry)
+    asset = registry.get("bundle.js")
+    assert asset.encoded is None
+
+    status, headers, body = _call_app(create_app(), asset.url)
+    assert status == 200
+    assert headers["Content-Length"] == "4096"
+    assert body == b"x" * 4096
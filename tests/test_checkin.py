@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.checkin import TICKET_SECRET_ENV, CheckInDesk, TicketSigner
+from app.service import ConnectHubService
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+
+
+def _setup() -> tuple[ConnectHubService, CheckInDesk, str]:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(hours=1)
+    event = svc.create_event(
+        name="Door", category="talk", mode="onsite", start_at=start, end_at=start + timedelta(hours=2), capacity=10
+    )
+    for index in range(4):
+        svc.register_participant(event_id=event.id, participant_id=f"p-{index}")
+    return svc, CheckInDesk(svc, secret=b"test-secret"), event.id
+
+
+def test_desk_requires_a_configured_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(TICKET_SECRET_ENV, raising=False)
+    with pytest.raises(ValueError):
+        CheckInDesk(ConnectHubService())
+    monkeypatch.setenv(TICKET_SECRET_ENV, "shared")
+    first, second = CheckInDesk(ConnectHubService()), CheckInDesk(ConnectHubService())
+    assert first._signer.sign("evt-1", "p-1") == second._signer.sign("evt-1", "p-1")
+
+
+def test_tokens_are_compact_and_tamper_evident() -> None:
+    signer = TicketSigner(b"k")
+    event_id = "0b6b9a1c-6a0e-4d7c-9d8e-2f1a3b4c5d6e"
+    token = signer.sign(event_id, "p-42")
+    assert len(token) < 44 and signer.verify(token) == (event_id, "p-42")
+    assert TicketSigner(b"other").verify(token) is None
+    assert signer.verify(token[:-2] + ("AA" if token[-2:] != "AA" else "BB")) is None
+    assert signer.verify("not a token!") is None
+    assert signer.verify(signer.sign("evt-1", "p-1")) == ("evt-1", "p-1")
+
+
+def test_check_in_is_idempotent_and_validated() -> None:
+    svc, desk, event_id = _setup()
+    token = desk.issue(event_id=event_id, participant_id="p-0")
+    first = desk.check_in(token, event_id=event_id)
+    again = desk.check_in(token)
+    assert first.status == "checked_in" and again.status == "duplicate"
+    assert again.checked_in_at == first.checked_in_at
+    assert desk.is_checked_in(event_id=event_id, participant_id="p-0")
+    assert desk.check_in(token, event_id="elsewhere").reason == "ticket is for another event"
+
+    cancelled = desk.issue(event_id=event_id, participant_id="p-1")
+    svc.cancel_registration(svc._registration_index[(event_id, "p-1")])
+    assert desk.check_in(cancelled).reason == "registration was cancelled"
+    with pytest.raises(KeyError):
+        desk.issue(event_id=event_id, participant_id="stranger")
+    attendance = desk.attendance(event_id)
+    assert (attendance.checked_in, attendance.registered, attendance.rate) == (1, 3, 0.3333)
+
+
+def test_offline_sync_keeps_earliest_scan() -> None:
+    svc, desk, event_id = _setup()
+    tokens = [desk.issue(event_id=event_id, participant_id=f"p-{index}") for index in range(3)]
+    online = desk.check_in(tokens[0])
+    earlier = (online.checked_in_at - timedelta(minutes=5)).isoformat()
+    report = desk.sync(
+        "gate-2",
+        [
+            {"token": tokens[1], "scanned_at": (datetime.now(UTC) - timedelta(minutes=1)).isoformat()},
+            {"token": tokens[1], "scanned_at": (datetime.now(UTC) - timedelta(minutes=3)).isoformat()},
+            {"token": tokens[0], "scanned_at": earlier},
+            {"token": "forged"},
+            {"token": tokens[2], "scanned_at": "yesterday"},
+        ],
+    )
+    statuses = [result.status for result in report.results]
+    assert statuses == ["duplicate", "checked_in", "duplicate", "rejected", "rejected"]
+    assert report.results[2].checked_in_at == datetime.fromisoformat(earlier)
+    assert desk.sync("gate-2", [{"token": tokens[1]}]).duplicates == 1
+    assert desk.overview()["checked_in"] == 2 and desk.overview()["devices"] == 1
+
+
+def test_check_in_api_and_dashboard() -> None:
+    svc, desk, event_id = _setup()
+    assert _call_app(create_app(svc), "/api/checkin", method="POST", payload={"token": "x"})[0] == 404
+    app = create_app(svc, checkin=desk)
+    status, _, body = _call_app(
+        app, "/api/registrations", method="POST", payload={"event_id": event_id, "participant_id": "p-9"}
+    )
+    token = json.loads(body)["ticket"]
+    assert status == 201
+    minted = {"event_id": event_id, "participant_id": "p-3"}
+    assert _call_app(app, "/api/checkin/tickets", method="POST", payload=minted)[0] == 405
+    scanned = json.loads(_call_app(app, "/api/checkin", method="POST", payload={"token": token})[2])
+    assert scanned["status"] == "checked_in"
+    assert _call_app(app, "/api/checkin", method="POST", payload={"token": "x" * 30})[0] == 409
+    sync = {"device_id": "gate-1", "scans": [{"token": token}]}
+    assert json.loads(_call_app(app, "/api/checkin/sync", method="POST", payload=sync)[2])["duplicates"] == 1
+    assert json.loads(_call_app(app, f"/api/checkin/{event_id}")[2])["checked_in"] == 1
+    assert _call_app(app, "/api/checkin/missing")[0] == 404
+    dashboard = json.loads(_call_app(app, "/api/dashboard")[2])
+    assert dashboard["attendance"]["events"][0]["event_id"] == event_id
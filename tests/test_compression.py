@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import replace
+
+from app.compression import EncodedBody, PrefixCompressor, negotiate
+from app.main import bootstrap_demo_service
+from app.web import create_app, dashboard_head
+
+from tests.test_web import _call_app
+
+
+def test_negotiate_honours_quality_values() -> None:
+    assert negotiate(None) is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*;q=0.5") == "gzip"
+
+
+def test_prefix_compressor_round_trips() -> None:
+    compressor = PrefixCompressor(b"static head " * 50)
+    for tail in (b"", b"first", b"second body"):
+        assert gzip.decompress(compressor.compress(tail)) == b"static head " * 50 + tail
+
+
+def test_dashboard_is_gzipped_on_request() -> None:
+    app = create_app()
+    _, plain_headers, plain = _call_app(app, "/")
+    status, headers, payload = _call_app(app, "/", headers={"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert int(headers["Content-Length"]) == len(payload) < len(plain)
+    assert "Content-Encoding" not in plain_headers
+    html = gzip.decompress(payload).decode("utf-8")
+    assert html.startswith(dashboard_head())
+    assert html == plain.decode("utf-8")
+
+
+def test_surface_variants_are_reused_until_blueprint_changes() -> None:
+    svc = bootstrap_demo_service()
+    app = create_app(svc)
+    _, headers, first = _call_app(app, "/api/surface", headers={"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(first))["frontend"]["title"] != "Updated"
+
+    blueprint = svc.surface_blueprint()
+    svc.configure_surface_blueprint(frontend=replace(blueprint.frontend, title="Updated"), backend=blueprint.backend)
+    _, _, second = _call_app(app, "/api/surface", headers={"Accept-Encoding": "gzip"})
+    assert json.loads(gzip.decompress(second))["frontend"]["title"] == "Updated"
+
+    body = EncodedBody(b"{}")
+    assert body.select(None) == (b"{}", None)
+    assert body.select("gzip")[1] == "gzip"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+
+from app.export import format_tags, iter_csv, iter_records, parse_tags, read_columnar, write_export
+from app.service import ConnectHubService
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+
+
+def _service(registrations: int = 25) -> ConnectHubService:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Export, \"quoted\"",
+        category="workshop",
+        mode="online",
+        start_at=start,
+        end_at=start + timedelta(hours=1),
+        capacity=100,
+        tags=["ai", "匯出"],
+    )
+    for idx in range(registrations):
+        svc.register_participant(event_id=event.id, participant_id=f"user-{idx}")
+    svc.cancel_registration(svc.list_registrations()[0].id)
+    return svc
+
+
+def test_csv_export_streams_in_chunks() -> None:
+    svc = _service()
+    chunks = list(iter_csv(svc, "registrations", chunk_size=10))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(rows) == 25
+    assert sum(row["status"] == "cancelled" for row in rows) == 1
+    assert all(row["cancelled_at"] == "" for row in rows if row["status"] == "confirmed")
+
+    (event_row,) = csv.DictReader(io.StringIO(b"".join(iter_csv(svc, "events")).decode("utf-8")))
+    assert event_row["name"] == 'Export, "quoted"'
+    assert parse_tags(event_row["tags"]) == ["ai", "匯出"]
+
+
+def test_columnar_export_round_trips() -> None:
+    svc = _service()
+    buffer = io.BytesIO()
+    write_export(svc, "registrations", "chcol", buffer, chunk_size=7)
+    buffer.seek(0)
+    rows = list(read_columnar(buffer))
+    expected = {record.id: record for record in svc.list_registrations()}
+    assert len(rows) == len(expected)
+    for row in rows:
+        record = expected[row["id"]]
+        assert (row["participant_id"], row["status"]) == (record.participant_id, record.status)
+        assert row["registered_at"] == record.registered_at
+        assert row["cancelled_at"] == record.cancelled_at
+
+    buffer = io.BytesIO()
+    write_export(svc, "events", "chcol", buffer)
+    buffer.seek(0)
+    (event,) = read_columnar(buffer)
+    assert event["tags"] == ["ai", "匯出"] and event["location"] is None
+
+
+def test_export_stream_endpoint() -> None:
+    app = create_app(_service())
+    status, headers, body = _call_app(app, "/api/exports/events.csv")
+    assert status == 200 and headers["Content-Type"].startswith("text/csv")
+    assert body.startswith(b"id,name,")
+    assert _call_app(app, "/api/exports/nope.csv")[0] == 404
+
+
+def test_registration_export_is_a_point_in_time_copy() -> None:
+    svc = _service(registrations=60)
+    expected = [record.id for chunk in svc._registrations.iter_chunks(1_000) for record in chunk]
+    chunks = iter_records(svc, "registrations", chunk_size=10)
+    exported = [record.id for record in next(chunks)]
+
+    event_id = svc.list_events()[0].id
+    for record in svc.list_registrations(status="confirmed")[:40]:
+        svc.cancel_registration(record.id)
+        svc.register_participant(event_id=event_id, participant_id=record.participant_id)
+    svc._registrations.compact()
+
+    exported += [record.id for chunk in chunks for record in chunk]
+    assert exported == expected
+
+
+def test_csv_tags_survive_separators_and_quotes() -> None:
+    tags = ["a|b", 'say "hi"', "逗,號", ""]
+    assert parse_tags(format_tags(tags)) == tags
+    assert parse_tags("ai|devrel") == ["ai", "devrel"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+
+from app.checkin import CheckInDesk
+from app.ids import TimeOrderedIds, decode_ulid, encode_ulid, random_ids, ulid_node, ulid_time
+from app.service import ConnectHubService
+from app.snapshot import capture, restore
+from app.tracing import tracing
+
+UTC = timezone.utc
+
+
+def test_ulids_round_trip_and_stay_monotonic() -> None:
+    assert encode_ulid(0) == "0" * 26 and encode_ulid(2**128 - 1) == "7" + "Z" * 25
+    ticks = iter([5_000_000, 5_000_000, 4_000_000, 9_000_000])
+    ids = TimeOrderedIds(clock=lambda: next(ticks))
+    minted = [ids() for _ in range(4)]
+    assert minted == sorted(minted) and len(set(minted)) == 4
+    assert decode_ulid(minted[1]) == decode_ulid(minted[0]) + 1
+    # the clock stepped back: still strictly increasing, still stamped with the newest millisecond seen
+    assert decode_ulid(minted[2]) == decode_ulid(minted[1]) + 1
+    assert ulid_time(minted[3]) == datetime(1970, 1, 1, tzinfo=UTC) + timedelta(milliseconds=9)
+    assert decode_ulid(minted[3].lower()) == decode_ulid(minted[3])
+    for bad in ("8" + "0" * 25, "0" * 25 + "U", "short"):
+        with pytest.raises(ValueError):
+            decode_ulid(bad)
+
+
+def test_listings_come_back_in_time_order_without_sorting() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Ordered", category="talk", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=9
+    )
+    assert len(event.id) == 26
+    first = svc.register_participant(event_id=event.id, participant_id="p-1")
+    svc.register_participant(event_id=event.id, participant_id="p-2")
+    svc.cancel_registration(first.id)
+    svc.register_participant(event_id=event.id, participant_id="p-1")
+    matches = [svc.create_match(opportunity_id=f"o-{n}", talent_id="t", recommended_score=0.5) for n in range(3)]
+    with tracing("unit") as trace:
+        registrations = svc.list_registrations(event_id=event.id)
+        listed = svc.list_matches()
+    assert [record.participant_id for record in registrations] == ["p-2", "p-1"]
+    assert [match.id for match in listed] == [match.id for match in reversed(matches)]
+    assert [entry.sorted for entry in trace.entries] == [0, 0]
+
+    data = capture(svc)
+    data["matches"].reverse()  # type: ignore[union-attr]
+    restored = restore(data)
+    assert [match.id for match in restored.list_matches()] == [match.id for match in listed]
+    stale = replace(registrations[0], id="old", participant_id="p-0", registered_at=start - timedelta(days=9))
+    restored._store_registration(stale)
+    assert [record.id for record in restored.list_registrations()][0] == "old"
+
+
+def test_generator_is_pluggable_and_tickets_stay_compact() -> None:
+    legacy = ConnectHubService(id_generator=random_ids)
+    start = datetime.now(UTC) + timedelta(days=1)
+    window = {"category": "talk", "mode": "online", "start_at": start, "end_at": start + timedelta(hours=1)}
+    old = legacy.create_event(name="Legacy", capacity=5, **window)
+    assert UUID(old.id)
+
+    svc = ConnectHubService()
+    event = svc.create_event(name="New", capacity=5, **window)
+    svc.register_participant(event_id=event.id, participant_id="p-1")
+    desk = CheckInDesk(svc, secret=b"k")
+    token = desk.issue(event_id=event.id, participant_id="p-1")
+    assert len(token) <= 40
+    assert desk.check_in(token, event_id=event.id).status == "checked_in"
+
+
+def test_node_is_stamped_into_every_id() -> None:
+    ticks = iter(range(0, 10**9, 1_000))
+    ids = TimeOrderedIds(clock=lambda: next(ticks), node=513)
+    minted = [ids() for _ in range(50)]
+    assert minted == sorted(minted)
+    assert {ulid_node(value) for value in minted} == {513}
+    with pytest.raises(ValueError):
+        TimeOrderedIds(node=1 << 16)
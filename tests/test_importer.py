@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.importer import import_file, import_text
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+START = datetime.now(UTC) + timedelta(days=3)
+
+
+def _event_rows() -> list[dict]:
+    return [
+        {
+            "id": "evt-1",
+            "name": "Partner Meetup",
+            "category": "meetup",
+            "mode": "onsite",
+            "start_at": START.isoformat(),
+            "end_at": (START + timedelta(hours=2)).isoformat(),
+            "capacity": 2,
+            "tags": ["crm", "partner"],
+        },
+        {"id": "evt-2", "name": "Naive", "category": "x", "mode": "online",
+         "start_at": "2030-01-01T10:00:00", "end_at": "2030-01-01T11:00:00", "capacity": 5},
+        {"id": "evt-3", "name": "Backwards", "category": "x", "mode": "online",
+         "start_at": (START + timedelta(hours=1)).isoformat(), "end_at": START.isoformat(), "capacity": 5},
+    ]
+
+
+def test_ndjson_import_reports_errors_per_row() -> None:
+    svc = ConnectHubService()
+    lines = [json.dumps(row) for row in _event_rows()] + ["{not json", json.dumps(_event_rows()[0])]
+    report = import_text(svc, "\n".join(lines), kind="events", fmt="ndjson", batch_size=2)
+    assert (report.rows, report.imported, report.failed) == (5, 1, 4)
+    assert [error.line for error in report.errors] == [2, 3, 4, 5]
+    assert "timezone-aware" in report.errors[0].message
+    assert "already exists" in report.errors[3].message
+    assert svc.get_event("evt-1").tags == ["crm", "partner"]
+
+
+def test_csv_registrations_import_with_process_pool(tmp_path) -> None:
+    svc = ConnectHubService()
+    svc.create_events([{"event_id": "evt-1", "name": "E", "category": "c", "mode": "online",
+                        "start_at": START, "end_at": START + timedelta(hours=1), "capacity": 2}])
+    path = tmp_path / "registrations.csv"
+    path.write_text(
+        "event_id,participant_id\nevt-1,alice\nevt-1,bob\nevt-1,carol\nmissing,dave\nevt-1,\n",
+        encoding="utf-8",
+    )
+    report = import_file(svc, path, kind="registrations", batch_size=2, workers=2)
+    assert (report.rows, report.imported, report.failed) == (5, 2, 3)
+    assert {error.line: error.message for error in report.errors} == {
+        4: "event is already at full capacity",
+        5: "event missing not found",
+        6: "participant_id is required",
+    }
+    assert svc.get_event("evt-1").seats_taken == 2
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.instrumentation import Histogram, Metrics, SlowRequestProfiler, instrument_service
+from app.main import bootstrap_demo_service
+from app.service import ConnectHubService
+from app.web import create_app
+from tests.test_web import _call_app
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram((0.01, 0.1))
+    histogram.observe(0.005)
+    histogram.observe(0.05)
+    histogram.observe(3.0, error=True)
+    assert histogram.cumulative() == [("0.01", 1), ("0.1", 2), ("+Inf", 3)]
+    assert histogram.errors == 1
+
+
+def test_disabled_metrics_leave_service_untouched() -> None:
+    svc = ConnectHubService()
+    instrument_service(svc, Metrics(enabled=False))
+    assert "list_events" not in vars(svc)
+
+
+def test_service_calls_and_errors_are_counted() -> None:
+    metrics = Metrics()
+    svc = instrument_service(ConnectHubService(), metrics)
+    svc.list_events()
+    with pytest.raises(KeyError):
+        svc.get_event("missing")
+
+    series = metrics.snapshot()
+    assert series[("service", "list_events")].count == 1
+    assert series[("service", "get_event")].errors == 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text() -> None:
+    metrics = Metrics()
+    app = create_app(bootstrap_demo_service(), metrics=metrics)
+    _call_app(app, "/api/events")
+    _call_app(app, "/does-not-exist")
+
+    status, headers, payload = _call_app(app, "/api/metrics")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain")
+    text = payload.decode("utf-8")
+    assert 'connect_hub_http_calls_total{route="/api/events"} 1' in text
+    assert 'connect_hub_http_calls_total{route="unmatched"} 1' in text
+    assert 'connect_hub_service_latency_seconds_count{method="list_events"} 1' in text
+
+
+def test_profiler_keeps_slowest_requests_with_stacks() -> None:
+    profiler = SlowRequestProfiler(interval=60, keep=2)
+    for label, delay in (("/fast", 0.0), ("/slow", 0.02), ("/slower", 0.04)):
+        profiler.begin(label)
+        time.sleep(delay)
+        profiler.sample()
+        profiler.end()
+    profiler.stop()
+
+    slowest = profiler.slowest()
+    assert [record.label for record in slowest] == ["/slower", "/slow"]
+    assert slowest[0].samples
+    assert "/slower" in profiler.dump()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.intervals import IntervalTree
+from app.service import ConnectHubService, ScheduleConflict
+from app.snapshot import capture, restore
+
+UTC = timezone.utc
+
+
+def test_overlapping_matches_brute_force() -> None:
+    rng = random.Random(7)
+    tree: IntervalTree[int] = IntervalTree()
+    windows = {}
+    for _ in range(3_000):
+        item = rng.randrange(200)
+        if rng.random() < 0.3 and item in windows:
+            assert tree.remove(item)
+            del windows[item]
+        else:
+            start = rng.randrange(1_000)
+            windows[item] = (start, start + rng.randrange(1, 60))
+            tree.add(item, *windows[item])
+        start = rng.randrange(1_000)
+        end = start + rng.randrange(1, 80)
+        expected = {key for key, (low, high) in windows.items() if low < end and high > start}
+        assert set(tree.overlapping(start, end)) == expected
+    assert len(tree) == len(windows)
+    assert not tree.remove(-1)
+    with pytest.raises(ValueError):
+        tree.add(1, 5, 5)
+
+
+def _event(svc: ConnectHubService, start: datetime, *, hours: int = 2, location: str = "Hall A") -> str:
+    return svc.create_event(
+        name="Session",
+        category="talk",
+        mode="onsite",
+        start_at=start,
+        end_at=start + timedelta(hours=hours),
+        capacity=10,
+        location=location,
+    ).id
+
+
+def test_registration_clashes_warn_or_reject(caplog: pytest.LogCaptureFixture) -> None:
+    start = datetime.now(UTC) + timedelta(days=3)
+    strict = ConnectHubService(schedule_policy="reject", venue_policy="off")
+    first = _event(strict, start)
+    second = _event(strict, start + timedelta(hours=1))
+    later = _event(strict, start + timedelta(hours=2))
+    strict.register_participant(event_id=first, participant_id="p-1")
+    strict.register_participant(event_id=later, participant_id="p-1")
+    with pytest.raises(ScheduleConflict) as info:
+        strict.register_participant(event_id=second, participant_id="p-1")
+    assert [event.id for event in info.value.conflicts] == [first, later]
+    assert [event.id for event in strict.schedule_conflicts(participant_id="p-1", event_id=second)] == [first, later]
+
+    registration = strict.list_registrations(event_id=first)[0]
+    strict.cancel_registration(registration.id)
+    strict.update_event(later, start_at=start + timedelta(days=1), end_at=start + timedelta(days=1, hours=1))
+    assert strict.register_participant(event_id=second, participant_id="p-1").status == "confirmed"
+    assert strict.get_event(second).seats_taken == 1
+
+    lenient = ConnectHubService()
+    first = _event(lenient, start)
+    second = _event(lenient, start, location="Hall B")
+    lenient.register_participant(event_id=first, participant_id="p-1")
+    with caplog.at_level(logging.WARNING, logger="app.conflicts"):
+        lenient.register_participant(event_id=second, participant_id="p-1")
+    assert "p-1" in caplog.text
+
+
+def test_venue_double_booking_is_detected_on_create_update_and_restore() -> None:
+    start = datetime.now(UTC) + timedelta(days=3)
+    svc = ConnectHubService(venue_policy="reject")
+    booked = _event(svc, start)
+    with pytest.raises(ScheduleConflict):
+        _event(svc, start + timedelta(hours=1), location="  hall a ")
+    moved = _event(svc, start + timedelta(hours=2))
+    with pytest.raises(ScheduleConflict):
+        svc.update_event(moved, start_at=start + timedelta(hours=1))
+    svc.update_event(booked, location="Hall B")
+    svc.update_event(moved, start_at=start + timedelta(hours=1))
+    online = svc.create_event(
+        name="Stream", category="talk", mode="online", start_at=start, end_at=start + timedelta(hours=4),
+        capacity=5, location="Hall A",
+    )
+    assert online.mode == "online"
+
+    copy = restore(capture(svc), service=ConnectHubService(venue_policy="reject"))
+    assert [event.id for event in copy.venue_conflicts(location="HALL A", start_at=start, end_at=start + timedelta(hours=2))] == [moved]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.jobs import JobContext, JobRunner
+from app.service import ConnectHubService
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+
+
+def square_task(ctx: JobContext) -> dict:
+    value = int(ctx.params["value"])  # type: ignore[arg-type]
+    ctx.output_path.write_text(str(value * value), encoding="utf-8")
+    return {"value": value * value}
+
+
+def _service() -> ConnectHubService:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) - timedelta(days=2)
+    for index in range(3):
+        svc.create_event(
+            name=f"Past {index}", category="talk", mode="online", start_at=start, end_at=start + timedelta(hours=1),
+            capacity=5,
+        )
+    return svc
+
+
+def test_jobs_run_by_priority_and_can_be_cancelled(tmp_path: Path) -> None:
+    runner = JobRunner(ConnectHubService(), tmp_path, threads=1, processes=0)
+    gate = threading.Event()
+    order = []
+
+    def blocker(ctx: JobContext) -> None:
+        while not gate.wait(0.01):
+            ctx.check()
+
+    def record(ctx: JobContext) -> None:
+        order.append(ctx.params["name"])
+
+    runner.register("block", blocker)
+    runner.register("record", record)
+    slow = runner.submit("block")
+    while runner.get(slow.id).status != "running":
+        time.sleep(0.01)
+    low = runner.submit("record", {"name": "low"}, priority=-1)
+    high = runner.submit("record", {"name": "high"}, priority=5)
+    dropped = runner.submit("record", {"name": "dropped"})
+    assert runner.cancel(dropped.id).status == "cancelled"
+
+    runner.cancel(slow.id)
+    assert runner.wait(slow.id, timeout=5).status == "cancelled"
+    assert runner.wait(low.id, timeout=5).status == runner.wait(high.id, timeout=5).status == "done"
+    assert order == ["high", "low"]
+    assert {job.id for job in runner.list(status="cancelled")} == {slow.id, dropped.id}
+    runner.shutdown()
+
+
+def test_export_and_archive_results_persist_across_restarts(tmp_path: Path) -> None:
+    svc = _service()
+    runner = JobRunner(svc, tmp_path, threads=2, processes=1)
+    export = runner.submit("export", {"kind": "events", "format": "csv"})
+    archive = runner.submit("archive")
+    runner.register("square", square_task, executor="process", suffix=".txt")
+    squared = runner.submit("square", {"value": 7})
+    assert runner.wait(export.id, timeout=10).status == "done"
+    assert runner.wait(archive.id, timeout=10).result["events"] == 3  # type: ignore[index]
+    assert runner.wait(squared.id, timeout=30).result == {"value": 49}
+    assert runner.result_path(squared.id).read_text(encoding="utf-8") == "49"
+    runner.shutdown()
+
+    reopened = JobRunner(svc, tmp_path)
+    assert reopened.get(export.id).status == "done"
+    lines = reopened.result_path(archive.id).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3 and json.loads(lines[0])["event"]["name"].startswith("Past")
+    assert reopened.result_path(export.id).read_bytes().startswith(b"id,")
+    reopened.shutdown()
+
+
+def test_jobs_api_submits_polls_and_downloads(tmp_path: Path) -> None:
+    app = create_app(_service(), job_dir=str(tmp_path))
+    status, _, payload = _call_app(app, "/api/jobs", method="POST", payload={"kind": "archive", "priority": 3})
+    job = json.loads(payload)
+    assert status == 202 and job["status"] in {"queued", "running", "done"}
+    for _ in range(500):
+        job = json.loads(_call_app(app, f"/api/jobs/{job['id']}")[2])
+        if job["status"] == "done":
+            break
+        time.sleep(0.01)
+    assert job["progress"] == 1.0 and job["has_result"]
+    status, headers, body = _call_app(app, f"/api/jobs/{job['id']}/result")
+    assert status == 200 and len(body.splitlines()) == 3
+    assert [item["id"] for item in json.loads(_call_app(app, "/api/jobs")[2])["jobs"]] == [job["id"]]
+    assert _call_app(app, "/api/jobs", method="POST", payload={"kind": "nope"})[0] == 400
+    assert _call_app(app, "/api/jobs/missing")[0] == 404
+
+    params = {"kind": "events", "format": "csv"}
+    job = json.loads(_call_app(app, "/api/jobs", method="POST", payload={"kind": "export", "params": params})[2])
+    for _ in range(500):
+        if json.loads(_call_app(app, f"/api/jobs/{job['id']}")[2])["status"] == "done":
+            break
+        time.sleep(0.01)
+    status, headers, body = _call_app(app, f"/api/jobs/{job['id']}/result")
+    assert status == 200 and headers["Content-Type"].startswith("text/csv") and body.startswith(b"id,name,")
+    assert _call_app(create_app(_service()), "/api/jobs")[0] == 404
+
+
+def test_archive_groups_registrations_in_one_pass(tmp_path: Path) -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    events = [
+        svc.create_event(
+            name=f"Soon {index}", category="talk", mode="online", start_at=start, end_at=start + timedelta(hours=1),
+            capacity=5,
+        )
+        for index in range(3)
+    ]
+    for index in range(6):
+        svc.register_participant(event_id=events[index % 2].id, participant_id=f"p-{index}")
+    runner = JobRunner(svc, tmp_path, threads=1, processes=0)
+    before = (start + timedelta(days=1)).isoformat()
+    job = runner.wait(runner.submit("archive", {"before": before}).id, timeout=10)
+    assert job.result == {"before": before, "events": 3, "registrations": 6}
+    lines = [json.loads(line) for line in runner.result_path(job.id).read_text(encoding="utf-8").splitlines()]
+    counts = {line["event"]["id"]: len(line["registrations"]) for line in lines}
+    assert counts == {events[0].id: 3, events[1].id: 3, events[2].id: 0}
+    assert runner.media_type(job.id) == "application/x-ndjson"
+    runner.shutdown()
+
+
+def test_import_text_is_spooled_not_kept_in_params(tmp_path: Path) -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    row = {"id": "evt-1", "name": "Imported", "category": "talk", "mode": "online", "capacity": 5,
+           "start_at": start.isoformat(), "end_at": (start + timedelta(hours=1)).isoformat()}
+    text = json.dumps(row) + "\n{broken"
+    runner = JobRunner(svc, tmp_path, threads=1, processes=0)
+    job = runner.wait(runner.submit("import", {"kind": "events", "format": "ndjson", "text": text}).id, timeout=10)
+    assert job.result == {"rows": 2, "imported": 1, "failed": 1}
+    assert job.params == {"kind": "events", "format": "ndjson", "text_bytes": len(text.encode("utf-8"))}
+    record = json.loads((tmp_path / f"{job.id}.job.json").read_text(encoding="utf-8"))
+    assert "text" not in record["params"] and "text" not in job.to_dict()["params"]
+    assert not list(tmp_path.glob("*.input"))
+    assert svc.get_event("evt-1").name == "Imported"
+    runner.shutdown()
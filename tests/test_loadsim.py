@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+
+from app.loadsim import HttpTarget, LoadRequest, WsgiTarget, generate, load_log, run, seed_service, serve, write_log
+from app.web import create_app
+
+
+def test_generated_traffic_follows_the_mix_and_round_trips_through_jsonl(tmp_path: Path) -> None:
+    mix = {"read": 0.5, "register": 0.3, "cancel": 0.1, "feedback": 0.05, "match_update": 0.05}
+    requests = list(generate(rate=500, duration=4, mix=mix, seed=3))
+    assert requests == list(generate(rate=500, duration=4, mix=mix, seed=3))
+    assert 1_700 < len(requests) < 2_300
+    assert all(earlier.at <= later.at for earlier, later in zip(requests, requests[1:]))
+    shares = Counter(request.kind for request in requests)
+    assert abs(shares["register"] / len(requests) - 0.3) < 0.05
+
+    log = tmp_path / "traffic.jsonl"
+    with open(log, "w", encoding="utf-8") as handle:
+        assert write_log(requests, handle) == len(requests)
+    assert list(load_log(log)) == requests
+    derived = LoadRequest.from_dict({"at": 1, "method": "post", "path": "/api/registrations/{registration}/cancel"})
+    assert derived.kind == "cancel" and derived.method == "POST"
+
+
+def test_replay_reports_rejections_and_resolves_placeholders() -> None:
+    lines = [
+        {"at": 0.01 * n, "method": "POST", "path": "/api/registrations",
+         "body": {"event_id": "{event:0}", "participant_id": f"p-{n}"}}
+        for n in range(5)
+    ]
+    lines += [
+        {"at": 0.1, "method": "POST", "path": "/api/registrations/{registration}/cancel"},
+        {"at": 0.1, "method": "POST", "path": "/api/matches/{match}/status", "body": {"status": "approved"}},
+        {"at": 0.1, "method": "POST", "path": "/api/feedback",
+         "body": {"event_id": "{event}", "participant_id": "p-1", "score": 5}},
+        {"at": 0.1, "method": "GET", "path": "/api/dashboard"},
+    ]
+    requests = [LoadRequest.from_dict(line) for line in lines]
+    service = seed_service(events=3, capacity=3)
+    report = run(requests, WsgiTarget(create_app(service)), clients=1, interval=0.05)
+
+    kinds = {stats.label: stats for stats in report.kinds}
+    assert report.sent == 9 and report.skipped == 0 and report.total.error_rate == 0
+    assert kinds["register"].requests == 5 and kinds["register"].rejection_rate == 0.4
+    assert kinds["cancel"].rejection_rate == kinds["match_update"].rejection_rate == 0
+    assert len(service.list_registrations(status="cancelled")) == 1
+    assert len(service.list_matches(status="approved")) == 1
+    assert sum(window.requests for window in report.windows) == 9
+    assert "register" in report.format()
+
+
+def test_local_server_target_drives_concurrent_clients() -> None:
+    server, url = serve(create_app(seed_service(events=5, capacity=50)))
+    try:
+        requests = list(generate(rate=400, duration=0.5, seed=1))
+        report = run(requests, HttpTarget(url), clients=8)
+    finally:
+        server.shutdown()
+    assert report.total.requests + report.skipped == len(requests)
+    assert report.total.error_rate == 0 and report.total.p99_ms > 0
+
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.mvcc import CopyOnWriteDict, PersistentVector
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+
+
+def test_published_views_never_change_after_later_writes() -> None:
+    data: CopyOnWriteDict[str, int] = CopyOnWriteDict()
+    data["a"] = 1
+    first = data.values()
+    assert first == (1,)
+
+    data["b"] = 2
+    data["a"] = 3
+    assert tuple(first) == (1,)
+    assert data.values() == (3, 2)
+    assert data.items() == (("a", 3), ("b", 2))
+    assert list(data) == ["a", "b"]
+    del data["a"]
+    assert data.values() == (2,) and list(reversed(data.values())) == [2] and len(data.values()) == 1
+
+
+def test_persistent_vector_shares_untouched_nodes() -> None:
+    vector = PersistentVector.of(iter(range(5_000)))
+    updated = vector.set(4_321, -1).append(5_000)
+
+    assert list(vector) == list(range(5_000))
+    assert updated[4_321] == -1 and updated[-1] == 5_000 and len(updated) == 5_001
+    assert list(reversed(updated))[:2] == [5_000, 4_999]
+    # only the path to the changed leaf was copied
+    assert vector._root[0] is updated._root[0]
+
+
+def test_service_snapshot_is_reused_and_consistent() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Snap", category="lab", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=3
+    )
+    before = svc.snapshot()
+    assert svc.snapshot() is before
+
+    svc.register_participant(event_id=event.id, participant_id="user-1")
+    after = svc.snapshot()
+    assert after is not before
+    assert before.events[0].seats_taken == 0
+    assert after.events[0].seats_taken == 1
+    assert after.confirmed_registrations == 1
+
+
+def test_readers_iterate_while_writers_publish() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    errors: list[BaseException] = []
+
+    def write() -> None:
+        for idx in range(300):
+            svc.create_event(
+                name=f"E{idx}",
+                category="lab",
+                mode="online",
+                start_at=start,
+                end_at=start + timedelta(hours=1),
+                capacity=1,
+                tags=["ai"],
+            )
+
+    def read() -> None:
+        try:
+            for _ in range(300):
+                svc.list_events(tag="ai")
+                svc.dashboard()
+        except BaseException as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(svc.list_events(tag="ai")) == 300
+
+
+def test_reads_do_not_wait_for_the_write_lock() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Hot", category="lab", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=5
+    )
+    for idx in range(1_500):
+        svc.update_event(event.id, name=f"Hot {idx}")
+    version, changed = svc.events_changed_since(10)
+    assert [evt.name for evt in changed] == ["Hot 1499"]
+
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock() -> None:
+        with svc._write_lock:
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait(5)
+    try:
+        assert svc.events_changed_since(version) == (version, [])
+        assert svc.snapshot().events[0].name == "Hot 1499"
+        assert svc.dashboard().total_events == 1
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_registration_scans_survive_concurrent_compaction() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Churn", category="lab", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=800
+    )
+    ids = [svc.register_participant(event_id=event.id, participant_id=f"user-{idx}").id for idx in range(800)]
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    def churn() -> None:
+        try:
+            for _ in range(4):
+                for registration_id in ids:
+                    svc.cancel_registration(registration_id)
+                for idx in range(800):
+                    svc.register_participant(event_id=event.id, participant_id=f"user-{idx}")
+        finally:
+            done.set()
+
+    def scan() -> None:
+        try:
+            while not done.is_set():
+                for record in svc.list_registrations(event_id=event.id):
+                    assert record.event_id == event.id and record.participant_id.startswith("user-")
+        except BaseException as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    threads = [threading.Thread(target=churn), threading.Thread(target=scan)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert svc._registrations._compactions > 0
+    assert len(svc.list_registrations(event_id=event.id, status="confirmed")) == 800
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.models import Event, RecommendationResponse
+from app.recommendations import RecommendationCache
+from app.service import ConnectHubService, recommendation_rank
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+START = datetime.now(UTC) + timedelta(days=1)
+
+
+def _event(event_id: str, seats_taken: int = 0) -> Event:
+    return Event(
+        id=event_id, name=event_id, category="talk", mode="online", start_at=START, end_at=START + timedelta(hours=1),
+        capacity=10, location=None, seats_taken=seats_taken,
+    )
+
+
+def _store(cache: RecommendationCache, participant_id: str, events: list, limit: int = 2) -> RecommendationResponse:
+    response = RecommendationResponse(participant_id=participant_id, recommendations=[])
+    ranks = [recommendation_rank(event) for event in events]
+    assert cache.put(participant_id, limit, response, events, ranks, cache.generation)
+    return response
+
+
+def test_cache_is_bounded_expires_and_invalidates_precisely() -> None:
+    now = [0.0]
+    cache = RecommendationCache(max_entries=2, ttl=60, clock=lambda: now[0])
+    first = _store(cache, "p-1", [_event("a"), _event("b", 5)])
+    _store(cache, "p-2", [_event("a"), _event("c", 2)])
+    assert cache.get("p-1", 2, START) is first
+    _store(cache, "p-3", [_event("d")], limit=3)
+    assert cache.get("p-2", 2, START) is None and cache.stats()["evictions"] == 1
+
+    cache.event_changed("z", recommendation_rank(_event("z", 9)))  # ranks behind every cached pick
+    assert len(cache) == 1  # only the short p-3 entry can take a new event, so it went
+    cache.event_changed("z", None)
+    assert cache.get("p-1", 2, START) is first
+    cache.event_changed("z", recommendation_rank(_event("z", 4)))  # would displace "b"
+    assert cache.get("p-1", 2, START) is None
+
+    generation = cache.generation
+    cache.participant_changed("p-9")
+    response = RecommendationResponse(participant_id="p-1", recommendations=[])
+    assert not cache.put("p-1", 2, response, [_event("a")], [recommendation_rank(_event("a"))], generation)
+    _store(cache, "p-1", [_event("a"), _event("b")])
+    now[0] = 61
+    assert cache.get("p-1", 2, START) is None
+    assert cache.get("p-1", 2, START + timedelta(days=3)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["expirations"]) == (2, 1) and 0 < stats["hit_rate"] < 1
+
+
+def test_cached_results_always_match_uncached_ones() -> None:
+    rng = random.Random(4)
+    cached = ConnectHubService(schedule_policy="off")
+    plain = ConnectHubService(schedule_policy="off", recommendation_cache_size=0)
+    names = {}
+    for index in range(12):
+        payload = {
+            "name": f"e{index}", "category": "talk", "mode": "online", "capacity": rng.randint(2, 6),
+            "start_at": START + timedelta(hours=index % 5), "end_at": START + timedelta(hours=6),
+        }
+        names[index] = (cached.create_event(**payload).id, plain.create_event(**payload).id)
+
+    def picks(svc: ConnectHubService, participant: str, limit: int) -> list:
+        response = svc.recommend_events(participant_id=participant, limit=limit)
+        return [(svc.get_event(item.event_id).name, item.reason) for item in response.recommendations]
+
+    for _ in range(600):
+        participant, event = f"p-{rng.randrange(15)}", rng.randrange(12)
+        action, moved = rng.random(), START + timedelta(minutes=rng.randrange(300))
+        for svc, event_id in ((cached, names[event][0]), (plain, names[event][1])):
+            if action < 0.25:
+                try:
+                    svc.register_participant(event_id=event_id, participant_id=participant)
+                except ValueError:
+                    pass
+            elif action < 0.35:
+                registration_id = svc._registration_index.get((event_id, participant))
+                if registration_id is not None:
+                    svc.cancel_registration(registration_id)
+            elif action < 0.4:
+                svc.update_event(event_id, start_at=moved)
+        limit = rng.randint(1, 4)
+        assert picks(cached, participant, limit) == picks(plain, participant, limit)
+    stats = cached.recommendation_cache.stats()  # type: ignore[union-attr]
+    assert stats["hits"] > 0 and stats["invalidations"] > 0
+
+
+def test_personal_page_endpoint_serves_from_cache() -> None:
+    svc = ConnectHubService()
+    for index in range(3):
+        svc.create_event(
+            name=f"Talk {index}", category="talk", mode="online", start_at=START + timedelta(hours=index),
+            end_at=START + timedelta(hours=index + 1), capacity=5,
+        )
+    app = create_app(svc)
+    for _ in range(3):
+        status, _, body = _call_app(app, "/api/recommendations?participant_id=p-1&limit=2")
+        assert status == 200 and len(json.loads(body)["recommendations"]) == 2
+    stats = json.loads(_call_app(app, "/api/recommendations/stats")[2])
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert _call_app(app, "/api/recommendations?limit=2")[0] == 400
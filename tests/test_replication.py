@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.changes import ChangeStream, ChangeStreamGap
+from app.main import bootstrap_demo_service
+from app.replication import ReplicaService
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+
+
+def test_stream_records_every_mutation_in_order() -> None:
+    svc = bootstrap_demo_service()
+    stream = ChangeStream.attach(svc)
+    event = svc.list_events()[0]
+    registration = svc.register_participant(event_id=event.id, participant_id="user-1")
+    svc.cancel_registration(registration.id)
+    svc.record_feedback(event_id=event.id, participant_id="user-1", score=5)
+    match = svc.create_match(opportunity_id="opp", talent_id="tal", recommended_score=0.9)
+    svc.update_match_status(match.id, status="approved")
+    svc.update_match_status(match.id, status="approved", notes="signed")
+
+    operations = [change.operation for change in stream.read(0)]
+    assert operations == [
+        "registration.created",
+        "event.updated",
+        "registration.updated",
+        "event.updated",
+        "feedback.created",
+        "match.created",
+        "match.approved",
+        "match.updated",
+    ]
+    assert [change.sequence for change in stream.read(5)] == [6, 7, 8]
+
+    stream.detach()
+    svc.update_event(event.id, name="Renamed")
+    assert stream.last_sequence == 8
+
+
+def test_trimmed_history_raises_gap() -> None:
+    stream = ChangeStream(retention=2)
+    for idx in range(4):
+        stream.publish("match.created", idx)
+    assert [change.record for change in stream.read(2)] == [2, 3]
+    with pytest.raises(ChangeStreamGap):
+        stream.read(0)
+
+
+def test_replica_converges_and_rejects_writes() -> None:
+    primary = bootstrap_demo_service()
+    stream = ChangeStream.attach(primary)
+    replica = ReplicaService.from_primary(primary, stream, max_staleness=0)
+
+    event = primary.list_events()[0]
+    primary.register_participant(event_id=event.id, participant_id="user-1")
+    primary.update_event(event.id, tags=["ai"])
+
+    assert replica.get_event(event.id).seats_taken == 1
+    assert [evt.id for evt in replica.list_events(tag="ai")] == [
+        evt.id for evt in primary.list_events(tag="ai")
+    ]
+    assert replica.dashboard() == primary.dashboard()
+    assert replica.lag == 0
+    with pytest.raises(RuntimeError):
+        replica.register_participant(event_id=event.id, participant_id="user-2")
+
+    hold = primary.reserve_seat(event_id=event.id, participant_id="user-3")
+    assert replica.get_reservation(hold.id).status == "held"
+    for write in (replica.confirm_reservation, replica.release_reservation):
+        with pytest.raises(RuntimeError):
+            write(hold.id)
+    with pytest.raises(RuntimeError):
+        replica.reserve_seat(event_id=event.id, participant_id="user-4")
+    with pytest.raises(RuntimeError):
+        replica.expire_reservations()
+    assert replica.get_event(event.id).seats_taken == primary.get_event(event.id).seats_taken
+
+
+def test_replica_staleness_bound_and_follower_thread() -> None:
+    primary = ConnectHubService()
+    stream = ChangeStream.attach(primary)
+    replica = ReplicaService(stream, max_staleness=60)
+    replica.catch_up()
+
+    start = datetime.now(UTC) + timedelta(days=1)
+    primary.create_event(name="Late", category="lab", mode="online", start_at=start, end_at=start + timedelta(hours=1), capacity=5)
+    assert replica.list_events() == []  # within the staleness bound
+
+    replica.start(poll_interval=0.01)
+    deadline = time.monotonic() + 2
+    while replica.lag and time.monotonic() < deadline:
+        time.sleep(0.01)
+    replica.stop()
+    assert [evt.name for evt in replica.list_events()] == ["Late"]
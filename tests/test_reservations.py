@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.reservations import SETTLED_RETENTION
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+
+
+def _service(capacity: int = 2) -> tuple[ConnectHubService, str]:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=1)
+    event = svc.create_event(
+        name="Launch", category="workshop", mode="onsite", start_at=start, end_at=start + timedelta(hours=2), capacity=capacity
+    )
+    return svc, event.id
+
+
+def test_hold_takes_a_seat_and_confirms_into_registration() -> None:
+    svc, event_id = _service()
+    hold = svc.reserve_seat(event_id=event_id, participant_id="user-1")
+    assert hold.status == "held"
+    assert svc.get_event(event_id).seats_taken == 1
+
+    registration = svc.confirm_reservation(hold.id)
+    assert registration.status == "confirmed"
+    assert svc.get_event(event_id).seats_taken == 1
+    assert svc.get_reservation(hold.id).registration_id == registration.id
+    with pytest.raises(ValueError):
+        svc.confirm_reservation(hold.id)
+
+
+def test_holds_block_capacity_until_released() -> None:
+    svc, event_id = _service(capacity=1)
+    hold = svc.reserve_seat(event_id=event_id, participant_id="user-1")
+    with pytest.raises(ValueError):
+        svc.register_participant(event_id=event_id, participant_id="user-2")
+    with pytest.raises(ValueError):
+        svc.reserve_seat(event_id=event_id, participant_id="user-2")
+
+    assert svc.release_reservation(hold.id).status == "released"
+    assert svc.get_event(event_id).seats_taken == 0
+    svc.register_participant(event_id=event_id, participant_id="user-2")
+
+
+def test_expired_holds_return_their_seats() -> None:
+    svc, event_id = _service(capacity=2)
+    short = svc.reserve_seat(event_id=event_id, participant_id="user-1", ttl=timedelta(minutes=1))
+    long = svc.reserve_seat(event_id=event_id, participant_id="user-2", ttl=timedelta(hours=1))
+    svc.release_reservation(long.id)
+
+    expired = svc.expire_reservations(datetime.now(UTC) + timedelta(minutes=5))
+    assert [reservation.id for reservation in expired] == [short.id]
+    assert svc.get_reservation(short.id).status == "expired"
+    assert svc.get_event(event_id).seats_taken == 0
+    with pytest.raises(ValueError):
+        svc.confirm_reservation(short.id)
+
+
+def test_direct_registration_consumes_an_active_hold() -> None:
+    svc, event_id = _service(capacity=1)
+    hold = svc.reserve_seat(event_id=event_id, participant_id="user-1")
+    registration = svc.register_participant(event_id=event_id, participant_id="user-1")
+
+    assert svc.get_event(event_id).seats_taken == 1
+    assert svc.get_reservation(hold.id).registration_id == registration.id
+    with pytest.raises(ValueError):
+        svc.reserve_seat(event_id=event_id, participant_id="user-1")
+
+
+def test_reads_release_lapsed_holds_without_a_later_write() -> None:
+    svc, event_id = _service(capacity=1)
+    svc.reserve_seat(event_id=event_id, participant_id="user-1", ttl=timedelta(milliseconds=5))
+    time.sleep(0.02)
+
+    assert svc.get_event(event_id).seats_taken == 0
+    assert svc.dashboard().upcoming_events[0].seats_taken == 0
+    assert [evt.seats_taken for evt in svc.list_events()] == [0]
+
+
+def test_settled_holds_are_pruned_after_retention() -> None:
+    svc, event_id = _service(capacity=3)
+    confirmed = svc.reserve_seat(event_id=event_id, participant_id="user-1")
+    svc.confirm_reservation(confirmed.id)
+    lapsed = svc.reserve_seat(event_id=event_id, participant_id="user-2", ttl=timedelta(minutes=1))
+    held = svc.reserve_seat(event_id=event_id, participant_id="user-3", ttl=timedelta(days=1))
+
+    later = datetime.now(UTC) + SETTLED_RETENTION + timedelta(minutes=5)
+    assert [reservation.id for reservation in svc.expire_reservations(later)] == [lapsed.id]
+    svc.expire_reservations(later + SETTLED_RETENTION + timedelta(minutes=1))
+
+    assert svc.get_reservation(held.id).status == "held"
+    for reservation_id in (confirmed.id, lapsed.id):
+        with pytest.raises(KeyError):
+            svc.get_reservation(reservation_id)
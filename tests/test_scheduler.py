@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.scheduler import JsonLinesSender, ReminderScheduler, TimerWheel
+from app.service import ConnectHubService
+
+UTC = timezone.utc
+
+
+def test_timer_wheel_matches_brute_force() -> None:
+    rng = random.Random(5)
+    wheel = TimerWheel(rng.randrange(2**33))
+    pending: dict = {}
+    for step in range(2_000):
+        roll = rng.random()
+        if roll < 0.6:
+            delta = rng.choice([rng.randrange(300), rng.randrange(70_000), rng.randrange(2**26), rng.randrange(2**34)])
+            pending[step] = wheel.add(wheel.current + delta, step)
+        elif roll < 0.75 and pending:
+            assert wheel.cancel(pending.pop(rng.choice(list(pending))))
+        else:
+            target = wheel.current + rng.choice([1, 200, 5_000, 2**20, 2**33])
+            expected = sorted((t for t in pending.values() if t.tick <= target), key=lambda t: (t.tick, t.id))
+            assert wheel.advance(target) == expected
+            for timer in expected:
+                del pending[timer.payload]
+            assert len(wheel) == len(pending)
+
+
+def test_reminders_follow_registrations_and_event_moves() -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    clock = [now]
+    svc = ConnectHubService()
+    start = now + timedelta(days=2)
+    event = svc.create_event(
+        name="Reminder Night", category="meetup", mode="onsite",
+        start_at=start, end_at=start + timedelta(hours=2), capacity=10,
+    )
+    output = io.StringIO()
+    scheduler = ReminderScheduler.attach(svc, JsonLinesSender(output), batch_size=1, clock=lambda: clock[0])
+    alice = svc.register_participant(event_id=event.id, participant_id="alice")
+    bob = svc.register_participant(event_id=event.id, participant_id="bob")
+    assert len(scheduler) == 4
+    svc.cancel_registration(bob.id)
+    assert len(scheduler) == 2
+
+    assert scheduler.run_due(start - timedelta(hours=25)) == 0
+    assert scheduler.run_due(start - timedelta(hours=24)) == 1
+    (sent,) = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert (sent["kind"], sent["registration_id"]) == ("T-24h", alice.id)
+
+    later = start + timedelta(days=1)
+    svc.update_event(event.id, start_at=later, end_at=later + timedelta(hours=2))
+    assert len(scheduler) == 2
+    assert scheduler.run_due(later - timedelta(hours=1)) == 2
+    kinds = [json.loads(line)["kind"] for line in output.getvalue().splitlines()]
+    assert kinds == ["T-24h", "T-24h", "T-1h"]
+    assert len(scheduler) == 0
+    scheduler.detach()
+
+
+def test_postponing_an_event_requeues_lapsed_reminders() -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    svc = ConnectHubService()
+    start = now + timedelta(minutes=30)
+    event = svc.create_event(
+        name="Soon", category="meetup", mode="online",
+        start_at=start, end_at=start + timedelta(hours=1), capacity=5,
+    )
+    scheduler = ReminderScheduler.attach(svc, JsonLinesSender(io.StringIO()), clock=lambda: now)
+    svc.register_participant(event_id=event.id, participant_id="alice")
+    assert len(scheduler) == 0
+
+    later = start + timedelta(days=7)
+    svc.update_event(event.id, start_at=later, end_at=later + timedelta(hours=1))
+    assert len(scheduler) == 2
+    assert scheduler.run_due(later - timedelta(hours=1)) == 2
+    scheduler.detach()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.search import SearchIndex, tokenize
+from app.service import ConnectHubService
+from app.web import create_app
+
+from tests.test_web import _call_app
+
+UTC = timezone.utc
+
+
+def test_tokenize_mixes_cjk_bigrams_and_latin_words() -> None:
+    assert tokenize("AI媒合工作坊, Connect-Hub 2024!") == ["ai", "媒合", "合工", "工作", "作坊", "connect", "hub", "2024"]
+    assert tokenize("會") == ["會"]
+    assert tokenize(None) == []
+    assert tokenize("讀書會", unigrams=True) == ["讀書", "書會", "讀", "書", "會"]
+
+
+def test_single_cjk_character_queries_match() -> None:
+    index = SearchIndex()
+    index.add("a", name="讀書會")
+    index.add("b", name="黑客松", description="週末程式馬拉松")
+    assert [doc for doc, _ in index.search("會")] == ["a"]
+    assert [doc for doc, _ in index.search("書")] == ["a"]
+    assert [doc for doc, _ in index.search("松")] == ["b"]
+    assert [doc for doc, _ in index.search("讀書")] == ["a"]
+
+
+def test_index_ranks_by_bm25_and_reindexes_on_update() -> None:
+    index = SearchIndex()
+    index.add("a", name="黑客松 Hackathon", description="週末程式馬拉松")
+    index.add("b", name="讀書會", description="一起讀黑客松的故事")
+    index.add("c", name="Design review", tags=["hackathon"])
+    assert [doc for doc, _ in index.search("黑客松")] == ["a", "b"]
+    assert {doc for doc, _ in index.search("hackathon")} == {"a", "c"}
+    assert len(index.search("hackathon", limit=1)) == 1
+
+    index.add("a", name="Meetup")
+    assert [doc for doc, _ in index.search("黑客松")] == ["b"]
+    index.remove("b")
+    assert index.search("黑客松") == [] and len(index) == 2
+
+
+def test_service_search_is_incremental_and_served_over_http() -> None:
+    svc = ConnectHubService()
+    start = datetime.now(UTC) + timedelta(days=2)
+    event = svc.create_event(
+        name="人工智慧媒合工作坊",
+        category="workshop",
+        mode="online",
+        start_at=start,
+        end_at=start + timedelta(hours=2),
+        capacity=10,
+        tags=["ai"],
+    )
+    assert [hit.event.id for hit in svc.search_events("媒合")] == [event.id]
+    svc.update_event(event.id, name="Community Night")
+    assert svc.search_events("媒合") == []
+
+    app = create_app(svc)
+    status, _, payload = _call_app(app, "/api/search?q=community&limit=5")
+    results = json.loads(payload)["results"]
+    assert status == 200 and results[0]["id"] == event.id and results[0]["score"] > 0
+    assert _call_app(app, "/api/search")[0] == 400
+    assert _call_app(app, "/api/search?q=x&limit=0")[0] == 400
@@ -78,6 +78,21 @@ def test_register_and_dashboard_metrics() -> None:
     assert metrics.total_events >= 2
 
 
+def test_events_changed_since_returns_only_modified_events() -> None:
+    svc = service_module.service
+    version, events = svc.events_changed_since(0)
+    assert len(events) == 2
+
+    first, second = svc.list_events()
+    svc.register_participant(event_id=second.id, participant_id="user-delta")
+    svc.update_event(first.id, description="Updated")
+    latest, changed = svc.events_changed_since(version)
+    assert latest > version
+    assert [event.id for event in changed] == [second.id, first.id]
+    assert changed[0].seats_taken == 1
+    assert svc.events_changed_since(latest) == (latest, [])
+
+
 def test_update_event_capacity_guard() -> None:
     svc = service_module.service
     event = svc.list_events()[0]
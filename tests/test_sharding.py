@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.ids import TimeOrderedIds, ulid_node
+from app.service import ConnectHubService
+from app.sharding import ShardedConnectHubService
+
+UTC = timezone.utc
+
+
+NOW = datetime.now(UTC)
+
+
+def _seed(svc: object, count: int, now: datetime = NOW) -> list:
+    return [
+        svc.create_event(  # type: ignore[attr-defined]
+            name=f"Event {idx}",
+            category="workshop" if idx % 3 else "lab",
+            mode="onsite",
+            start_at=now + timedelta(days=count - idx),
+            end_at=now + timedelta(days=count - idx, hours=2),
+            capacity=2 + idx,
+            tags=["ai"] if idx % 2 else ["devrel"],
+            event_id=f"evt-{idx}",
+        )
+        for idx in range(count)
+    ]
+
+
+def _payload() -> dict:
+    return {
+        "name": "Unnamed",
+        "category": "lab",
+        "mode": "online",
+        "start_at": NOW + timedelta(days=1),
+        "end_at": NOW + timedelta(days=1, hours=1),
+        "capacity": 5,
+    }
+
+
+def test_events_are_routed_to_their_hash_shard() -> None:
+    sharded = ShardedConnectHubService(shards=3)
+    events = _seed(sharded, 12)
+    for event in events:
+        owner = sharded.shards[sharded.shard_index(event.id)]
+        assert event.id in owner.service._events  # type: ignore[attr-defined]
+    assert sum(len(shard.service._events) for shard in sharded.shards) == 12  # type: ignore[attr-defined]
+
+
+def test_scatter_gather_matches_single_service() -> None:
+    single = ConnectHubService()
+    sharded = ShardedConnectHubService(shards=4)
+    for svc in (single, sharded):
+        events = _seed(svc, 10)
+        for idx, event in enumerate(events[:6]):
+            registration = svc.register_participant(event_id=event.id, participant_id=f"user-{idx}")
+            if idx == 0:
+                svc.cancel_registration(registration.id)
+        svc.create_match(opportunity_id="opp-1", talent_id="tal-1", recommended_score=0.4)
+
+    assert [evt.id for evt in sharded.list_events(tag="ai")] == [evt.id for evt in single.list_events(tag="ai")]
+    assert sharded.dashboard() == single.dashboard()
+    assert sharded.recommend_events(participant_id="p", limit=4) == single.recommend_events(
+        participant_id="p", limit=4
+    )
+    assert len(sharded.list_registrations(status="cancelled")) == 1
+    assert len(sharded.list_matches(status="pending")) == 1
+
+
+def test_record_ids_name_their_shard_without_a_routing_table() -> None:
+    sharded = ShardedConnectHubService(shards=3)
+    events = _seed(sharded, 6)
+    for idx, event in enumerate(events):
+        registration = sharded.register_participant(event_id=event.id, participant_id=f"user-{idx}")
+        assert ulid_node(registration.id) == sharded.shard_index(event.id)
+        assert sharded.cancel_registration(registration.id).status == "cancelled"
+    match = sharded.create_match(opportunity_id="opp-1", talent_id="tal-1", recommended_score=0.4)
+    assert sharded.update_match_status(match.id, status="approved").status == "approved"
+    assert len(sharded.create_event(**_payload()).id) == 26
+
+    with pytest.raises(KeyError):
+        sharded.cancel_registration("missing")
+    with pytest.raises(KeyError):
+        sharded.cancel_registration(TimeOrderedIds(node=7)())
+
+
+def test_process_shards_round_trip() -> None:
+    with ShardedConnectHubService(shards=2, processes=True) as sharded:
+        events = _seed(sharded, 4)
+        sharded.register_participant(event_id=events[0].id, participant_id="user-1")
+        assert sharded.dashboard().total_registrations == 1
+        with pytest.raises(ValueError):
+            sharded.register_participant(event_id=events[0].id, participant_id="user-1")
+        assert sharded.get_event(events[0].id).seats_taken == 1
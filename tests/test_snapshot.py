@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+from app.main import bootstrap_demo_service
+from app.snapshot import capture, load, restore, save
+from app.web import create_app
+from tests.test_web import _call_app
+
+
+def test_snapshot_round_trip_preserves_state(tmp_path) -> None:
+    svc = bootstrap_demo_service()
+    event = svc.list_events()[0]
+    registration = svc.register_participant(event_id=event.id, participant_id="user-1")
+    svc.cancel_registration(registration.id)
+    svc.record_feedback(event_id=event.id, participant_id="user-1", score=4)
+    svc.create_match(opportunity_id="opp", talent_id="tal", recommended_score=0.5)
+
+    path = tmp_path / "state.json"
+    save(svc, path)
+    restored = load(path)
+
+    assert capture(restored) == capture(svc)
+    assert restored.list_events(tag="devrel")[0].id == event.id
+    assert restored.list_registrations(status="cancelled")[0].id == registration.id
+    assert restored.surface_blueprint() == svc.surface_blueprint()
+
+
+def test_restore_rejects_unknown_version() -> None:
+    try:
+        restore({"version": 99})
+    except ValueError as exc:
+        assert "version" in str(exc)
+    else:  # pragma: no cover - defensive
+        raise AssertionError("expected ValueError")
+
+
+def test_create_app_loads_snapshot_lazily(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    save(bootstrap_demo_service(), path)
+    app = create_app(snapshot=str(path))
+
+    status, _, payload = _call_app(app, "/api/events")
+    assert status == 200
+    assert len(json.loads(payload)) == 2
+
+
+def test_importing_web_defers_demo_seed_module() -> None:
+    code = "import sys, app.web; app.web.create_app(); print('app.main' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
+
+
+def test_first_request_leaves_optional_subsystems_unimported() -> None:
+    optional = ["app.admission", "app.assets", "app.instrumentation", "app.search", "app.anomaly", "app.checkin"]
+    code = (
+        "import sys, app.web; app.web.create_app()({'PATH_INFO': '/api/events'}, lambda *args: None); "
+        f"print([name for name in {optional!r} if name in sys.modules])"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Registration
+from app.storage import RegistrationStore, from_micros, to_micros
+
+UTC = timezone.utc
+
+
+def _record(idx: int, *, event_id: str = "evt-1", status: str = "confirmed") -> Registration:
+    return Registration(
+        id=f"reg-{idx}",
+        event_id=event_id,
+        participant_id=f"user-{idx}",
+        status=status,
+        registered_at=datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=idx),
+    )
+
+
+def test_timestamps_round_trip_with_microseconds() -> None:
+    value = datetime(2025, 3, 4, 5, 6, 7, 891011, tzinfo=UTC)
+    assert from_micros(to_micros(value)) == value
+
+
+def test_store_materializes_equal_records() -> None:
+    store = RegistrationStore()
+    record = _record(1)
+    store[record.id] = record
+
+    assert store[record.id] == record
+    assert len(store) == 1
+    assert store.index[("evt-1", "user-1")] == record.id
+    assert ("evt-1", "user-2") not in store.index
+
+
+def test_updates_rewrite_rows_and_status_counts() -> None:
+    store = RegistrationStore()
+    record = _record(1)
+    store[record.id] = record
+    cancelled_at = record.registered_at + timedelta(hours=1)
+    store[record.id] = Registration(
+        id=record.id,
+        event_id=record.event_id,
+        participant_id=record.participant_id,
+        status="cancelled",
+        registered_at=record.registered_at,
+        cancelled_at=cancelled_at,
+    )
+
+    assert store[record.id].cancelled_at == cancelled_at
+    assert store.count_status("confirmed") == 0
+    assert store.count_status("cancelled") == 1
+    assert len(store) == 1
+
+
+def test_select_filters_on_columns() -> None:
+    store = RegistrationStore()
+    for idx in range(6):
+        record = _record(idx, event_id=f"evt-{idx % 2}", status="cancelled" if idx == 4 else "confirmed")
+        store[record.id] = record
+
+    assert [r.id for r in store.select(event_id="evt-0")] == ["reg-0", "reg-2", "reg-4"]
+    assert [r.id for r in store.select(event_id="evt-0", status="confirmed")] == ["reg-0", "reg-2"]
+    assert store.select(participant_id="nobody") == []
+    assert [r.id for r in store.values()] == [f"reg-{idx}" for idx in range(6)]
+
+
+def test_delete_leaves_tombstone_and_rejects_mismatched_ids() -> None:
+    store = RegistrationStore()
+    store["reg-1"] = _record(1)
+    store["reg-2"] = _record(2)
+    del store["reg-1"]
+
+    assert list(store) == ["reg-2"]
+    assert [chunk[0].id for chunk in store.iter_chunks(1)] == ["reg-2"]
+    with pytest.raises(ValueError):
+        store["reg-3"] = _record(4)
+
+
+def test_churn_compacts_retired_rows() -> None:
+    store = RegistrationStore()
+    for idx in range(2_000):
+        store[f"reg-{idx}"] = _record(idx)
+    for round_ in range(1, 4):
+        for idx in range(2_000):
+            record = store[f"reg-{idx}"]
+            moved = record.registered_at + timedelta(days=round_)
+            store[record.id] = Registration(record.id, record.event_id, record.participant_id, "confirmed", moved)
+
+    assert len(store) == 2_000
+    assert len(store._ids) < 4_000
+    assert store[f"reg-{1_999}"].registered_at == _record(1_999).registered_at + timedelta(days=6)
+    assert store.index[("evt-1", "user-7")] == "reg-7"
+    assert "reg-2000" not in store
+    del store["reg-7"]
+    assert "reg-7" not in store and ("evt-1", "user-7") not in store.index
+    assert [r.id for r in store.select(event_id="evt-1")][:2] == ["reg-0", "reg-1"]
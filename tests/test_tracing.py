@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import logging
+
+from app.main import bootstrap_demo_service
+from app.service import ConnectHubService
+from app.tracing import record_scan, span, trace_service, tracing
+from app.web import create_app
+from tests.test_web import _call_app
+
+
+def test_record_scan_is_noop_without_trace() -> None:
+    record_scan("list_events", scanned=10, returned=1)
+
+
+def test_traced_service_records_calls_and_scans() -> None:
+    svc = trace_service(bootstrap_demo_service())
+    with tracing("unit") as trace:
+        svc.list_events(mode="online")
+        svc.dashboard()
+        with span("render"):
+            pass
+
+    operations = [entry.operation for entry in trace.entries]
+    assert operations == ["list_events", "dashboard", "snapshot", "render"]
+    list_entry = trace.entries[0]
+    assert list_entry.scanned == 1  # the "online" posting set, not every event
+    assert list_entry.returned == 1
+    assert trace.total_scanned >= 1
+
+
+def test_scans_are_recorded_without_wrapping() -> None:
+    svc = ConnectHubService()
+    with tracing("unit") as trace:
+        svc.list_matches()
+    assert [(entry.operation, entry.scanned, entry.duration_ms) for entry in trace.entries] == [
+        ("list_matches", 0, 0.0)
+    ]
+
+
+def test_dashboard_emits_server_timing_and_log_line(caplog) -> None:
+    app = create_app(bootstrap_demo_service(), trace=True)
+    with caplog.at_level(logging.INFO, logger="app.trace"):
+        status, headers, _ = _call_app(app, "/")
+
+    assert status == 200
+    timing = headers["Server-Timing"]
+    assert timing.startswith("dashboard;dur=")
+    assert "list_events;" in timing and "render;" in timing
+    logged = json.loads(caplog.records[-1].getMessage())
+    assert logged["label"] == "/"
+    assert [call["operation"] for call in logged["calls"]][:3] == ["dashboard", "snapshot", "list_events"]
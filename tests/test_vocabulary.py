@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.service import ConnectHubService
+from app.vocabulary import TermIndex, Vocabulary
+
+UTC = timezone.utc
+
+
+def test_vocabulary_assigns_dense_ids() -> None:
+    vocab = Vocabulary()
+    assert [vocab.intern(term) for term in ["ai", "devrel", "ai"]] == [0, 1, 0]
+    assert len(vocab) == 2
+    assert vocab.lookup("devrel") == 1
+    assert vocab.term(0) == "ai"
+    assert vocab.lookup("unknown") is None
+    assert "unknown" not in vocab
+
+
+def test_term_index_keeps_postings_per_term() -> None:
+    index = TermIndex()
+    index.update("evt-1", (), ["ai", "devrel"])
+    index.update("evt-2", (), ["ai"])
+    index.update("evt-1", ["ai", "devrel"], ["community"])
+
+    assert list(index.members("ai")) == ["evt-2"]
+    assert list(index.members("community")) == ["evt-1"]
+    assert index.members("devrel") == {} and index.members("unknown") == {}
+    assert index._postings.keys() == {index.vocabulary.lookup("ai"), index.vocabulary.lookup("community")}
+
+
+def _create(svc: ConnectHubService, name: str, *, category: str, mode: str, tags: list[str]) -> None:
+    start = datetime.now(UTC) + timedelta(days=1)
+    svc.create_event(
+        name=name,
+        category=category,
+        mode=mode,
+        start_at=start,
+        end_at=start + timedelta(hours=1),
+        capacity=10,
+        tags=tags,
+    )
+
+
+def test_events_share_interned_strings_and_keep_tag_lists() -> None:
+    svc = ConnectHubService()
+    _create(svc, "A", category="".join(["work", "shop"]), mode="onsite", tags=["".join(["a", "i"])])
+    _create(svc, "B", category="".join(["work", "shop"]), mode="online", tags=["ai", "community"])
+    first, second = svc.list_events()
+
+    assert first.category is second.category
+    assert first.tags[0] is second.tags[0]
+    assert second.tags == ["ai", "community"]
+
+
+def test_list_events_filters_by_interned_ids() -> None:
+    svc = ConnectHubService()
+    _create(svc, "A", category="workshop", mode="onsite", tags=["ai"])
+    _create(svc, "B", category="workshop", mode="online", tags=["ai", "community"])
+    _create(svc, "C", category="lab", mode="online", tags=["community"])
+
+    assert [evt.name for evt in svc.list_events(tag="ai")] == ["A", "B"]
+    assert [evt.name for evt in svc.list_events(category="workshop", mode="online")] == ["B"]
+    assert svc.list_events(tag="missing") == []
+
+    event_id = svc.list_events(category="lab")[0].id
+    svc.update_event(event_id, tags=["ai"])
+    assert [evt.name for evt in svc.list_events(tag="ai")] == ["A", "B", "C"]
+    assert [evt.name for evt in svc.list_events(tag="community")] == ["B"]
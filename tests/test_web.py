@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import io
 import json
+import re
 from typing import Tuple
 
 from wsgiref.util import setup_testing_defaults
@@ -9,11 +10,20 @@ from wsgiref.util import setup_testing_defaults
 from app.web import create_app
 
 
-def _call_app(app, path: str) -> Tuple[int, dict[str, str], bytes]:
+def _call_app(
+    app, path: str, *, method: str = "GET", payload: object = None, headers: dict[str, str] | None = None
+) -> Tuple[int, dict[str, str], bytes]:
     body = io.BytesIO()
     environ = {}
     setup_testing_defaults(environ)
-    environ["PATH_INFO"] = path
+    environ["PATH_INFO"], _, environ["QUERY_STRING"] = path.partition("?")
+    environ["REQUEST_METHOD"] = method
+    if payload is not None:
+        raw = json.dumps(payload).encode("utf-8")
+        environ["wsgi.input"] = io.BytesIO(raw)
+        environ["CONTENT_LENGTH"] = str(len(raw))
+    for name, value in (headers or {}).items():
+        environ["HTTP_" + name.upper().replace("-", "_")] = value
 
     status_headers: list[Tuple[str, str]] = []
 
@@ -72,4 +82,73 @@ def test_surface_api_returns_blueprint() -> None:
     blueprint = json.loads(payload.decode("utf-8"))
     assert "frontend" in blueprint and "backend" in blueprint
     assert blueprint["frontend"]["features"]
-    assert any(feature["ai_enabled"] for feature in blueprint["backend"]["features"])
\ No newline at end of file
+    assert any(feature["ai_enabled"] for feature in blueprint["backend"]["features"])
+
+
+def test_registration_api_creates_and_rejects_duplicates() -> None:
+    app = create_app()
+    _, _, payload = _call_app(app, "/api/events")
+    event_id = json.loads(payload)[0]["id"]
+
+    request = {"event_id": event_id, "participant_id": "user-1"}
+    status, _, body = _call_app(app, "/api/registrations", method="POST", payload=request)
+    assert status == 201
+    assert json.loads(body)["status"] == "confirmed"
+
+    status, _, _ = _call_app(app, "/api/registrations", method="POST", payload=request)
+    assert status == 409
+    status, _, _ = _call_app(app, "/api/registrations", method="POST", payload={"event_id": "missing", "participant_id": "u"})
+    assert status == 404
+    status, headers, _ = _call_app(app, "/api/registrations")
+    assert status == 405
+    assert headers["Allow"] == "POST"
+
+
+def test_event_changes_api_returns_deltas_and_live_shell() -> None:
+    app = create_app()
+    status, _, payload = _call_app(app, "/api/events/changes")
+    full = json.loads(payload)
+    assert status == 200 and full["events"] and not full["reset"]
+
+    _, _, payload = _call_app(app, "/api/events/changes?since=" + str(full["version"]))
+    assert json.loads(payload)["events"] == []
+    event_id = full["events"][0]["id"]
+    _call_app(app, "/api/registrations", method="POST", payload={"event_id": event_id, "participant_id": "live"})
+    _, _, payload = _call_app(app, "/api/events/changes?since=" + str(full["version"]))
+    delta = json.loads(payload)
+    assert [event["id"] for event in delta["events"]] == [event_id]
+    assert delta["events"][0]["seats_taken"] == 1
+
+    assert json.loads(_call_app(app, "/api/events/changes?since=999999")[2])["reset"] is True
+    assert _call_app(app, "/api/events/changes?since=abc")[0] == 400
+
+    status, headers, shell = _call_app(app, "/live")
+    assert status == 200 and headers["Content-Type"].startswith("text/html")
+    assert b"data-live-dashboard" in shell and b"event-card" not in shell
+    assert re.search(rb'src="/static/dashboard\.[0-9a-f]+\.js"', shell)
+
+
+def test_cancel_feedback_and_match_apis() -> None:
+    app = create_app()
+    event_id = json.loads(_call_app(app, "/api/events")[2])[0]["id"]
+    request = {"event_id": event_id, "participant_id": "user-2"}
+    registration = json.loads(_call_app(app, "/api/registrations", method="POST", payload=request)[2])
+
+    status, _, body = _call_app(app, f"/api/registrations/{registration['id']}/cancel", method="POST")
+    assert status == 200 and json.loads(body)["status"] == "cancelled"
+    assert _call_app(app, "/api/registrations/missing/cancel", method="POST")[0] == 404
+    assert _call_app(app, f"/api/registrations/{registration['id']}/cancel")[0] == 405
+
+    feedback = {"event_id": event_id, "participant_id": "user-2", "score": 4}
+    assert _call_app(app, "/api/feedback", method="POST", payload=feedback)[0] == 201
+    assert _call_app(app, "/api/feedback", method="POST", payload={**feedback, "score": 9})[0] == 400
+
+    match = {"opportunity_id": "opp", "talent_id": "talent", "recommended_score": 0.8}
+    status, _, body = _call_app(app, "/api/matches", method="POST", payload=match)
+    match_id = json.loads(body)["id"]
+    assert status == 201
+    status, _, body = _call_app(app, f"/api/matches/{match_id}/status", method="POST", payload={"status": "approved"})
+    assert status == 200 and json.loads(body)["status"] == "approved"
+    assert _call_app(app, f"/api/matches/{match_id}/status", method="POST", payload={"status": "bogus"})[0] == 400
+    approved = json.loads(_call_app(app, "/api/matches?status=approved")[2])["matches"]
+    assert [item["id"] for item in approved] == [match_id]